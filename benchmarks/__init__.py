@@ -0,0 +1,8 @@
+"""Paquete de benchmarks del sistema de inventario. ⏱️
+
+Genera catálogos sintéticos de distintos tamaños y mide el tiempo de las
+funciones de database.py y del renderizado de tablas de ui.py, dejando los
+resultados en JSON para comparar entre versiones.
+
+Se ejecuta desde la raíz del proyecto con: python -m benchmarks --help
+"""
@@ -0,0 +1,201 @@
+"""Punto de entrada de los benchmarks: python -m benchmarks [opciones].
+
+Por cada tamaño pedido genera (o reutiliza) un catálogo sintético, mide
+todas las operaciones y escribe un único archivo JSON con los resultados
+y los datos del entorno, además de un resumen en la consola.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import database as db
+from benchmarks.catalogo import generar_catalogo
+from benchmarks.medicion import ejecutar_suite
+from benchmarks.concurrencia import medir_lecturas_concurrentes
+from benchmarks.carga_http import medir_servidor_http
+from benchmarks.memoria import medir_memoria_listado
+from benchmarks.stock_concurrente import medir_descuentos_concurrentes
+from benchmarks.arranque import medir_arranque
+from benchmarks.reportes_concurrentes import medir_escrituras_con_reportes
+
+TAMANOS_POR_DEFECTO = [1_000, 10_000, 100_000]
+
+def _parsear_argumentos(argv):
+    """Define y procesa las opciones de la línea de comandos."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Mide la capa de datos y la interfaz con catálogos sintéticos.")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=TAMANOS_POR_DEFECTO,
+                        help="Cantidades de productos a generar (ej: 1000 100000 10000000).")
+    parser.add_argument("--repeticiones", type=int, default=20,
+                        help="Ejecuciones por operación.")
+    parser.add_argument("--limite-completo", type=int, default=1_000_000,
+                        help="Tamaño máximo para medir los listados completos (fetchall).")
+    parser.add_argument("--directorio", default=os.path.join(tempfile.gettempdir(), "inventario_benchmarks"),
+                        help="Dónde guardar los catálogos generados.")
+    parser.add_argument("--regenerar", action="store_true",
+                        help="Vuelve a generar los catálogos aunque ya existan.")
+    parser.add_argument("--salida", default="bench_output.json",
+                        help="Archivo JSON de resultados ('-' para la salida estándar).")
+    parser.add_argument("--concurrencia", type=int, nargs="*", metavar="LECTORES",
+                        help="Mide además el throughput de lecturas concurrentes con database_async "
+                             "(por defecto con 1 2 4 8 lectores).")
+    parser.add_argument("--http", type=int, nargs="?", const=8, metavar="CLIENTES",
+                        help="Hace además una prueba de carga del servidor HTTP (por defecto con 8 clientes).")
+    parser.add_argument("--memoria", action="store_true",
+                        help="Mide además la memoria del listado completo como tuplas, Producto y LoteProductos.")
+    parser.add_argument("--stock", type=int, nargs="*", metavar="PROCESOS",
+                        help="Mide además pedidos concurrentes desde varios procesos y verifica que no "
+                             "se pierdan ventas (por defecto con 1 2 4 procesos).")
+    parser.add_argument("--reportes", type=int, nargs="?", const=2, metavar="LECTORES",
+                        help="Mide además la latencia de escritura mientras varios procesos generan "
+                             "reportes, leyendo la base en uso o una instantánea (por defecto 2 lectores).")
+    parser.add_argument("--arranque", action="store_true",
+                        help="Mide además el tiempo de arranque de main.py y lo compara con su presupuesto; "
+                             "termina con código 1 si algún escenario lo excede.")
+    return parser.parse_args(argv)
+
+def _imprimir_resumen(resultados):
+    """Muestra una tabla de texto plano con la mediana de cada operación."""
+    print(f"{'Productos':>10}  {'Operación':<45}{'Mediana (ms)':>14}{'Filas':>10}", file=sys.stderr)
+    for resultado in resultados:
+        filas = "" if resultado["filas"] is None else resultado["filas"]
+        print(f"{resultado['productos']:>10}  {resultado['operacion']:<45}"
+              f"{resultado['mediana_s'] * 1000:>14.3f}{filas:>10}", file=sys.stderr)
+
+def _imprimir_concurrencia(resultados):
+    """Muestra las consultas por segundo de cada modo de lectura."""
+    print(f"\n{'Productos':>10}  {'Modo':<12}{'Lectores':>9}{'Consultas/s':>14}{'Aceleración':>13}", file=sys.stderr)
+    for resultado in resultados:
+        print(f"{resultado['productos']:>10}  {resultado['modo']:<12}{resultado['lectores']:>9}"
+              f"{resultado['consultas_por_segundo']:>14.0f}{resultado['aceleracion']:>12.2f}x", file=sys.stderr)
+
+def _imprimir_memoria(resultados):
+    """Muestra la memoria del listado completo según su representación."""
+    print(f"\n{'Productos':>10}  {'Representación':<16}{'MiB':>10}{'Bytes/fila':>12}{'Pico MiB':>10}{'Segundos':>10}",
+          file=sys.stderr)
+    for resultado in resultados:
+        print(f"{resultado['productos']:>10}  {resultado['representacion']:<16}{resultado['bytes'] / 2**20:>10.1f}"
+              f"{resultado['bytes_por_fila']:>12.0f}{resultado['pico_bytes'] / 2**20:>10.1f}"
+              f"{resultado['segundos']:>10.2f}", file=sys.stderr)
+
+def _imprimir_http(resultados):
+    """Muestra las peticiones por segundo y las latencias del servidor HTTP."""
+    print(f"\n{'Productos':>10}  {'Escenario':<12}{'Clientes':>9}{'Pet/s':>10}{'Mediana ms':>12}{'p95 ms':>10}  Estados",
+          file=sys.stderr)
+    for resultado in resultados:
+        print(f"{resultado['productos']:>10}  {resultado['escenario']:<12}{resultado['clientes']:>9}"
+              f"{resultado['peticiones_por_segundo']:>10.0f}{resultado['mediana_ms']:>12.3f}"
+              f"{resultado['p95_ms']:>10.3f}  {resultado['estados']}", file=sys.stderr)
+
+def _imprimir_stock(resultados):
+    """Muestra los pedidos por segundo, las ventas perdidas y el desfase del libro de cada modo de descuento."""
+    print(f"\n{'Productos':>10}  {'Modo':<19}{'Procesos':>9}{'Pedidos/s':>11}{'Confirmados':>13}"
+          f"{'Perdidas':>10}{'Libro desf.':>13}  Consistente", file=sys.stderr)
+    for resultado in resultados:
+        print(f"{resultado['productos']:>10}  {resultado['modo']:<19}{resultado['procesos']:>9}"
+              f"{resultado['pedidos_por_segundo']:>11.0f}{resultado['confirmados']:>13}"
+              f"{resultado['unidades_perdidas']:>10}{resultado['libro_desfasado']:>13}"
+              f"  {'sí' if resultado['consistente'] else 'NO'}", file=sys.stderr)
+
+def _imprimir_reportes(resultados):
+    """Muestra la latencia de escritura según cómo leen los procesos de reportes."""
+    print(f"\n{'Productos':>10}  {'Modo':<14}{'Lectores':>9}{'Mediana ms':>12}{'p99 ms':>10}{'Máx ms':>10}"
+          f"{'Reportes':>10}{'WAL KiB':>10}", file=sys.stderr)
+    for resultado in resultados:
+        print(f"{resultado['productos']:>10}  {resultado['modo']:<14}{resultado['lectores']:>9}"
+              f"{resultado['mediana_ms']:>12.3f}{resultado['p99_ms']:>10.3f}{resultado['maximo_ms']:>10.3f}"
+              f"{resultado['reportes']:>10}{resultado['wal_bytes'] / 1024:>10.0f}", file=sys.stderr)
+
+def _imprimir_arranque(resultados):
+    """Muestra el tiempo de arranque propio de cada escenario frente a su presupuesto."""
+    print(f"\n{'Escenario':<12}{'Mediana ms':>12}{'Propio ms':>11}{'Presupuesto':>13}  Resultado", file=sys.stderr)
+    for resultado in resultados:
+        estado = "ok" if resultado["dentro_del_presupuesto"] else "EXCEDIDO"
+        if resultado.get("modulos_diferidos_cargados"):
+            estado += f" (importa {', '.join(resultado['modulos_diferidos_cargados'])})"
+        print(f"{resultado['escenario']:<12}{resultado['mediana_ms']:>12.1f}{resultado['propio_ms']:>11.1f}"
+              f"{resultado['presupuesto_ms']:>13}  {estado}", file=sys.stderr)
+
+def main(argv=None):
+    """Ejecuta los benchmarks para cada tamaño y guarda el JSON de resultados."""
+    argumentos = _parsear_argumentos(argv)
+    os.makedirs(argumentos.directorio, exist_ok=True)
+
+    catalogos = []
+    resultados = []
+    concurrencia = []
+    carga_http = []
+    memoria = []
+    stock = []
+    reportes = []
+    for tamano in argumentos.tamanos:
+        ruta = os.path.join(argumentos.directorio, f"catalogo_{tamano}.db")
+        segundos_carga = generar_catalogo(ruta, tamano, reutilizar=not argumentos.regenerar)
+        catalogos.append({"productos": tamano, "ruta": ruta, "carga_s": segundos_carga})
+        resultados.extend(ejecutar_suite(tamano, argumentos.repeticiones, argumentos.limite_completo))
+        if argumentos.concurrencia is not None:
+            concurrencia.extend(medir_lecturas_concurrentes(tamano, lectores=argumentos.concurrencia or (1, 2, 4, 8)))
+        if argumentos.memoria:
+            memoria.extend(medir_memoria_listado(tamano))
+        if argumentos.http:
+            carga_http.extend(medir_servidor_http(tamano, clientes=argumentos.http))
+        if argumentos.stock is not None:
+            stock.extend(medir_descuentos_concurrentes(tamano, procesos=argumentos.stock or (1, 2, 4)))
+        if argumentos.reportes:
+            reportes.extend(medir_escrituras_con_reportes(tamano, lectores=argumentos.reportes))
+        db.cerrar_conexiones()
+
+    arranque = medir_arranque() if argumentos.arranque else []
+
+    informe = {
+        "fecha": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "entorno": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "catalogos": catalogos,
+        "resultados": resultados,
+    }
+    if concurrencia:
+        informe["concurrencia"] = concurrencia
+    if carga_http:
+        informe["http"] = carga_http
+    if memoria:
+        informe["memoria"] = memoria
+    if stock:
+        informe["stock"] = stock
+    if reportes:
+        informe["reportes"] = reportes
+    if arranque:
+        informe["arranque"] = arranque
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if argumentos.salida == "-":
+        print(texto)
+    else:
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    _imprimir_resumen(resultados)
+    if concurrencia:
+        _imprimir_concurrencia(concurrencia)
+    if carga_http:
+        _imprimir_http(carga_http)
+    if memoria:
+        _imprimir_memoria(memoria)
+    if stock:
+        _imprimir_stock(stock)
+    if reportes:
+        _imprimir_reportes(reportes)
+    if arranque:
+        _imprimir_arranque(arranque)
+        if not all(resultado["dentro_del_presupuesto"] for resultado in arranque):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
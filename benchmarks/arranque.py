@@ -0,0 +1,76 @@
+"""Tiempo de arranque de main.py frente a un presupuesto.
+
+Lanza la aplicación como un proceso nuevo, tal como la usan los scripts,
+en tres escenarios: la ayuda (--help), un subcomando sobre una base ya
+inicializada (arranque en caliente) y el menú interactivo, del que se sale
+enseguida. A cada mediana se le resta la del intérprete vacío
+(python -c pass), de modo que el presupuesto mide solo el costo propio de
+la aplicación y no depende tanto de la máquina.
+
+También verifica que el subcomando no importe los módulos que main.py
+difiere hasta que hacen falta (la interfaz y los submenús).
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(RAIZ, "main.py")
+
+# Milisegundos por encima del intérprete vacío que puede tardar cada escenario.
+PRESUPUESTO_MS = {"ayuda": 55, "subcomando": 55, "menu": 80}
+MODULOS_DIFERIDOS = ("colorama", "ui", "productos", "categorias", "inventario", "depositos",
+                     "exportador")
+
+ESCENARIOS = [
+    ("ayuda", [MAIN, "--help"], None),
+    ("subcomando", [MAIN, "categories"], None),
+    ("menu", [MAIN], "5\n"),
+]
+
+def _medir(argumentos, entrada, directorio, repeticiones):
+    """Mediana en milisegundos de ejecutar python con `argumentos` en `directorio`."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, *argumentos], cwd=directorio, input=entrada,
+                       capture_output=True, text=True, check=True)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+def _modulos_diferidos_cargados(directorio):
+    """Retorna los módulos de MODULOS_DIFERIDOS que importa el subcomando."""
+    salida = subprocess.run([sys.executable, "-X", "importtime", MAIN, "categories"], cwd=directorio,
+                            capture_output=True, text=True, check=True).stderr
+    importados = {linea.rsplit("|", 1)[-1].strip() for linea in salida.splitlines() if "|" in linea}
+    return [modulo for modulo in MODULOS_DIFERIDOS if modulo in importados]
+
+def medir_arranque(repeticiones=20):
+    """Mide cada escenario de ESCENARIOS y lo compara con PRESUPUESTO_MS.
+    Args: repeticiones (int): Ejecuciones por escenario.
+    Returns: Lista de diccionarios con 'escenario', 'mediana_ms', 'interprete_ms',
+    'propio_ms', 'presupuesto_ms', 'dentro_del_presupuesto' y, en el
+    subcomando, 'modulos_diferidos_cargados'.
+    """
+    with tempfile.TemporaryDirectory() as directorio:
+        # La primera ejecución crea el esquema; las medidas son en caliente.
+        subprocess.run([sys.executable, MAIN, "categories"], cwd=directorio, capture_output=True, check=True)
+        interprete = _medir(["-c", "pass"], None, directorio, repeticiones)
+        resultados = []
+        for nombre, argumentos, entrada in ESCENARIOS:
+            mediana = _medir(argumentos, entrada, directorio, repeticiones)
+            propio = mediana - interprete
+            resultado = {
+                "escenario": nombre, "mediana_ms": mediana, "interprete_ms": interprete,
+                "propio_ms": propio, "presupuesto_ms": PRESUPUESTO_MS[nombre],
+                "dentro_del_presupuesto": propio <= PRESUPUESTO_MS[nombre],
+            }
+            if nombre == "subcomando":
+                cargados = _modulos_diferidos_cargados(directorio)
+                resultado["modulos_diferidos_cargados"] = cargados
+                resultado["dentro_del_presupuesto"] = resultado["dentro_del_presupuesto"] and not cargados
+            resultados.append(resultado)
+    return resultados
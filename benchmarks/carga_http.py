@@ -0,0 +1,89 @@
+"""Prueba de carga del servicio HTTP/JSON (servidor.py).
+
+Levanta el servidor en un puerto libre sobre el catálogo activo y lanza
+varios clientes con conexiones keep-alive que piden listados, productos
+por ID y el reporte de stock bajo. Cada escenario se corre dos veces: sin
+ETag (el servidor consulta y serializa siempre) y reenviando el último
+ETag recibido (el servidor responde 304 mientras nadie escriba).
+"""
+import http.client
+import random
+import statistics
+import threading
+import time
+from servidor import ServidorInventario
+
+CLIENTES_POR_DEFECTO = 8
+
+def _rutas(cantidad_productos, cantidad, semilla):
+    """Arma una secuencia reproducible de rutas GET a pedir."""
+    azar = random.Random(semilla)
+    fijas = ["/productos?tamano=50", "/stock-bajo?limite=5", "/categorias", "/buscar?q=cafe"]
+    return [azar.choice(fijas) if azar.random() < 0.5 else f"/productos/{azar.randint(1, max(cantidad_productos, 1))}"
+            for _ in range(cantidad)]
+
+def _cliente(puerto, rutas, con_etag, latencias, estados):
+    """Ejecuta las peticiones de un cliente sobre una sola conexión keep-alive."""
+    conexion = http.client.HTTPConnection("127.0.0.1", puerto, timeout=30)
+    etags = {}
+    try:
+        for ruta in rutas:
+            cabeceras = {"If-None-Match": etags[ruta]} if con_etag and ruta in etags else {}
+            inicio = time.perf_counter()
+            conexion.request("GET", ruta, headers=cabeceras)
+            respuesta = conexion.getresponse()
+            respuesta.read()
+            latencias.append(time.perf_counter() - inicio)
+            estados[respuesta.status] = estados.get(respuesta.status, 0) + 1
+            if respuesta.getheader("ETag"):
+                etags[ruta] = respuesta.getheader("ETag")
+    finally:
+        conexion.close()
+
+def _escenario(puerto, cantidad_productos, clientes, peticiones, con_etag):
+    """Corre un escenario completo y resume sus tiempos."""
+    por_cliente = max(peticiones // clientes, 1)
+    latencias = []
+    estados = {}
+    hilos = [threading.Thread(target=_cliente,
+                              args=(puerto, _rutas(cantidad_productos, por_cliente, semilla),
+                                    con_etag, latencias, estados))
+             for semilla in range(clientes)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    segundos = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "productos": cantidad_productos,
+        "escenario": "con_etag" if con_etag else "sin_etag",
+        "clientes": clientes,
+        "peticiones": len(latencias),
+        "segundos": segundos,
+        "peticiones_por_segundo": len(latencias) / segundos,
+        "mediana_ms": statistics.median(latencias) * 1000,
+        "p95_ms": latencias[int(len(latencias) * 0.95) - 1] * 1000,
+        "estados": {str(estado): veces for estado, veces in sorted(estados.items())},
+    }
+
+def medir_servidor_http(cantidad_productos, clientes=CLIENTES_POR_DEFECTO, peticiones=2000):
+    """Mide el servidor HTTP sobre el catálogo activo, con y sin ETag.
+    Args:
+    cantidad_productos (int): Tamaño del catálogo activo.
+    clientes (int): Clientes simultáneos (y tamaño del grupo de hilos del servidor).
+    peticiones (int): Total de peticiones por escenario.
+    Returns: Lista de diccionarios con 'escenario', 'peticiones_por_segundo',
+    'mediana_ms', 'p95_ms' y la cantidad de respuestas por estado HTTP.
+    """
+    servidor = ServidorInventario(("127.0.0.1", 0), hilos=clientes, registrar=False)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    try:
+        puerto = servidor.server_address[1]
+        return [_escenario(puerto, cantidad_productos, clientes, peticiones, con_etag)
+                for con_etag in (False, True)]
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
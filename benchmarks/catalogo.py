@@ -0,0 +1,74 @@
+"""Generador de catálogos sintéticos para los benchmarks.
+
+Crea una base de datos SQLite con el esquema de la aplicación, las
+categorías permitidas y la cantidad de productos pedida, usando
+agregar_productos_bulk_db para que la carga sea rápida incluso con
+millones de filas. Los datos son reproducibles a partir de una semilla.
+"""
+import os
+import random
+import time
+import database as db
+from categorias import LIMITE_CATEGORIAS
+
+PALABRAS = (
+    "acero", "algodon", "azul", "bateria", "blanco", "cable", "caja", "cafe",
+    "clasico", "compacto", "cuero", "digital", "doble", "eco", "electrico",
+    "flexible", "grande", "inalambrico", "kit", "lampara", "liviano", "madera",
+    "mini", "negro", "organico", "pack", "plastico", "portatil", "premium",
+    "rojo", "set", "silla", "soporte", "termico", "verde", "vidrio",
+)
+
+def nombre_categoria(numero):
+    """Retorna el nombre sintético de la categoría número `numero` (desde 1)."""
+    return f"Categoría {numero:02d}"
+
+def generar_filas(cantidad_productos, ids_categorias, semilla=42):
+    """Genera filas de productos sintéticos listas para agregar_productos_bulk_db.
+    Args:
+    cantidad_productos (int): Cuántas filas generar.
+    ids_categorias (list): IDs de categoría entre los que se reparten los productos.
+    semilla (int): Semilla del generador aleatorio.
+    Returns: Generador de tuplas (nombre, descripcion, cantidad, precio, cat_id).
+    """
+    azar = random.Random(semilla)
+    for numero in range(cantidad_productos):
+        palabras = azar.sample(PALABRAS, 5)
+        nombre = f"{palabras[0].capitalize()} {palabras[1]} {numero:08d}"
+        descripcion = " ".join(palabras)
+        cantidad = azar.randint(1, 500)
+        precio = azar.randint(1, 100000)
+        yield nombre, descripcion, cantidad, precio, azar.choice(ids_categorias)
+
+def generar_catalogo(ruta, cantidad_productos, cantidad_categorias=LIMITE_CATEGORIAS,
+                     semilla=42, reutilizar=True):
+    """Crea (o reutiliza) una base de datos sintética y la deja como DB_NAME.
+    Args:
+    ruta (str): Ruta del archivo SQLite a crear.
+    cantidad_productos (int): Cantidad de productos del catálogo.
+    cantidad_categorias (int): Cantidad de categorías.
+    semilla (int): Semilla del generador aleatorio.
+    reutilizar (bool): Si el archivo ya existe con esa cantidad de productos, no se regenera.
+    Returns: Los segundos que tomó la carga (0 si se reutilizó el archivo).
+    """
+    db.cerrar_conexiones()
+    db.DB_NAME = ruta
+    if reutilizar and os.path.exists(ruta):
+        db.inicializar_db()
+        conn = db.obtener_conexion()
+        existentes = conn.execute("SELECT COUNT(*) FROM productos").fetchone()[0]
+        if existentes == cantidad_productos:
+            return 0.0
+        db.cerrar_conexiones()
+
+    for sufijo in ("", "-wal", "-shm"):
+        if os.path.exists(ruta + sufijo):
+            os.remove(ruta + sufijo)
+    db.inicializar_db()
+
+    inicio = time.perf_counter()
+    ids_categorias = [db.agregar_categoria_db(nombre_categoria(numero))
+                      for numero in range(1, cantidad_categorias + 1)]
+    db.agregar_productos_bulk_db(generar_filas(cantidad_productos, ids_categorias, semilla), 50000)
+    db.obtener_conexion().execute("ANALYZE")
+    return time.perf_counter() - inicio
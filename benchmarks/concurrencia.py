@@ -0,0 +1,77 @@
+"""Throughput de lecturas concurrentes con database_async.py.
+
+Ejecuta la misma tanda de consultas de solo lectura primero en secuencia,
+con las funciones síncronas de database.py, y luego con la API asíncrona
+usando grupos de 1, 2, 4 y 8 hilos lectores. sqlite3 libera el GIL mientras
+SQLite ejecuta cada sentencia, de modo que las consultas pesadas avanzan en
+paralelo sobre conexiones distintas.
+"""
+import asyncio
+import random
+import time
+import database as db
+import database_async as adb
+
+LECTORES_POR_DEFECTO = (1, 2, 4, 8)
+
+def _consultas(cantidad, semilla=5):
+    """Arma una tanda reproducible de consultas de lectura sin caché.
+    Args:
+    cantidad (int): Cantidad de consultas.
+    semilla (int): Semilla para elegir consultas y parámetros.
+    Returns: Lista de tuplas (nombre_funcion, argumentos).
+    """
+    azar = random.Random(semilla)
+    ids_categoria = [id_cat for id_cat, _ in db.obtener_categorias_db()]
+    textos = ["cafe", "negro", "premium", "caja", "azul"]
+    consultas = []
+    for _ in range(cantidad):
+        tipo = azar.randrange(3)
+        if tipo == 0:
+            consultas.append(("contar_productos_en_categoria_db", (azar.choice(ids_categoria),)))
+        elif tipo == 1:
+            consultas.append(("obtener_pagina_productos_por_stock_db", (azar.randint(1, 20),)))
+        else:
+            consultas.append(("buscar_productos_texto_db", (azar.choice(textos),)))
+    return consultas
+
+def _secuencial(consultas):
+    """Ejecuta las consultas de a una con database.py y retorna los segundos."""
+    inicio = time.perf_counter()
+    for nombre, args in consultas:
+        getattr(db, nombre)(*args)
+    return time.perf_counter() - inicio
+
+async def _concurrente(consultas):
+    """Lanza todas las consultas juntas con database_async.py y retorna los segundos."""
+    inicio = time.perf_counter()
+    await asyncio.gather(*(getattr(adb, nombre)(*args) for nombre, args in consultas))
+    return time.perf_counter() - inicio
+
+def medir_lecturas_concurrentes(cantidad_productos, consultas=2000, lectores=LECTORES_POR_DEFECTO):
+    """Mide consultas por segundo en secuencia y con distintos grupos de lectores.
+    Args:
+    cantidad_productos (int): Tamaño del catálogo activo.
+    consultas (int): Cantidad de consultas por medición.
+    lectores (iterable): Tamaños de grupo de lectores a medir.
+    Returns: Lista de diccionarios con 'productos', 'modo', 'lectores',
+    'consultas', 'segundos', 'consultas_por_segundo' y 'aceleracion'
+    (respecto de la ejecución secuencial).
+    """
+    tanda = _consultas(consultas)
+    _secuencial(tanda[:50])  # calienta la conexión y la caché de páginas
+    base = _secuencial(tanda)
+    resultados = [{"productos": cantidad_productos, "modo": "secuencial", "lectores": 1,
+                   "consultas": consultas, "segundos": base,
+                   "consultas_por_segundo": consultas / base, "aceleracion": 1.0}]
+    for cantidad in lectores:
+        adb.iniciar(lectores=cantidad)
+        try:
+            segundos = asyncio.run(_concurrente(tanda))
+        finally:
+            adb.cerrar()
+        resultados.append({"productos": cantidad_productos, "modo": "async", "lectores": cantidad,
+                           "consultas": consultas, "segundos": segundos,
+                           "consultas_por_segundo": consultas / segundos,
+                           "aceleracion": base / segundos})
+    return resultados
@@ -0,0 +1,148 @@
+"""Mediciones de tiempo de la capa de datos y de la interfaz.
+
+Cada medición ejecuta una operación varias veces sobre el catálogo activo
+(database.DB_NAME) y registra el mínimo, la mediana y la media en segundos,
+junto con la cantidad de filas que produjo la última ejecución.
+"""
+import contextlib
+import io
+import random
+import statistics
+import time
+import database as db
+import indice_nombres
+import ui
+
+def medir(nombre, operacion, repeticiones):
+    """Ejecuta una operación varias veces y resume sus tiempos.
+    Args:
+    nombre (str): Nombre de la operación en los resultados.
+    operacion (callable): Función sin argumentos a medir. Si retorna una
+    colección o un entero, se registra como cantidad de filas.
+    repeticiones (int): Cantidad de ejecuciones.
+    Returns: Diccionario con 'operacion', 'repeticiones', 'min_s',
+    'mediana_s', 'media_s' y 'filas'.
+    """
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = operacion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    if isinstance(resultado, (list, tuple)):
+        filas = len(resultado)
+    elif isinstance(resultado, int) and not isinstance(resultado, bool):
+        filas = resultado
+    else:
+        filas = None
+    return {
+        "operacion": nombre,
+        "repeticiones": repeticiones,
+        "min_s": min(tiempos),
+        "mediana_s": statistics.median(tiempos),
+        "media_s": statistics.fmean(tiempos),
+        "filas": filas,
+    }
+
+def _silenciar(funcion, *args):
+    """Ejecuta una función de ui.py descartando lo que imprime.
+    Mide el costo de armar el texto de la tabla sin depender de la terminal.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        funcion(*args)
+
+def operaciones_de_lectura(cantidad_productos, limite_completo, semilla=7):
+    """Arma la lista de operaciones de solo lectura a medir.
+    Las que recorren el catálogo completo se omiten si supera limite_completo.
+    Args:
+    cantidad_productos (int): Tamaño del catálogo activo.
+    limite_completo (int): Tamaño máximo para las operaciones completas.
+    semilla (int): Semilla para elegir los IDs consultados.
+    Returns: Lista de tuplas (nombre, operacion).
+    """
+    azar = random.Random(semilla)
+    ids = [azar.randint(1, max(cantidad_productos, 1)) for _ in range(1000)]
+    id_categoria = db.obtener_categorias_db()[0][0]
+    pagina, _ = db.obtener_pagina_productos_db()
+    reporte_pagina, _ = db.obtener_pagina_productos_por_stock_db(5)
+
+    def por_id_sin_cache():
+        db.invalidar_cache()
+        return [db.obtener_producto_por_id_db(azar.choice(ids))]
+
+    operaciones = [
+        ("contar_categorias_db", db.contar_categorias_db),
+        ("obtener_categorias_db", db.obtener_categorias_db),
+        ("obtener_producto_por_id_db", por_id_sin_cache),
+        ("obtener_producto_por_id_db[cache]", lambda: [db.obtener_producto_por_id_db(ids[0])]),
+        ("contar_productos_en_categoria_db", lambda: db.contar_productos_en_categoria_db(id_categoria)),
+        ("obtener_productos_por_stock_db[5]", lambda: db.obtener_productos_por_stock_db(5)),
+        ("obtener_pagina_productos_db", lambda: db.obtener_pagina_productos_db()[0]),
+        ("obtener_pagina_productos_por_stock_db[5]", lambda: db.obtener_pagina_productos_por_stock_db(5)[0]),
+        ("buscar_productos_texto_db", lambda: db.buscar_productos_texto_db("cafe negro")),
+        ("ui.mostrar_lista_productos[pagina]", lambda: _silenciar(ui.mostrar_lista_productos, pagina)),
+        ("ui.mostrar_reporte_stock[pagina]", lambda: _silenciar(ui.mostrar_reporte_stock, reporte_pagina, 5)),
+    ]
+    if cantidad_productos <= limite_completo:
+        operaciones += [
+            ("obtener_productos_db", db.obtener_productos_db),
+            ("obtener_productos_por_stock_db[50]", lambda: db.obtener_productos_por_stock_db(50)),
+            ("ui.mostrar_lista_productos[completo]",
+             lambda: _silenciar(ui.mostrar_lista_productos, db.obtener_productos_db())),
+            ("ui.mostrar_reporte_stock[50]",
+             lambda: _silenciar(ui.mostrar_reporte_stock, db.obtener_productos_por_stock_db(50), 50)),
+        ]
+        # El índice de nombres vive en memoria: se arma antes de medir las búsquedas.
+        indice_nombres.sugerir_productos("")
+        operaciones += [
+            ("indice_nombres.sugerir_productos[prefijo]", lambda: indice_nombres.sugerir_productos("cafe neg")),
+            ("indice_nombres.sugerir_productos[tipeo]", lambda: indice_nombres.sugerir_productos("cafe nergo")),
+        ]
+    return operaciones
+
+def operaciones_de_escritura(semilla=11):
+    """Arma la lista de operaciones que modifican el catálogo activo.
+    Cada producto agregado se elimina en la misma operación de borrado,
+    para que el tamaño del catálogo no cambie entre mediciones.
+    Args: semilla (int): Semilla para los valores escritos.
+    Returns: Lista de tuplas (nombre, operacion).
+    """
+    azar = random.Random(semilla)
+    id_categoria = db.obtener_categorias_db()[0][0]
+    agregados = []
+
+    def agregar():
+        agregados.append(db.agregar_producto_db("Benchmark", "producto temporal", 10, 100, id_categoria))
+
+    def modificar():
+        db.modificar_producto_campos_db(agregados[-1], {"cantidad": azar.randint(1, 500), "precio": azar.randint(1, 1000)})
+
+    def eliminar():
+        db.eliminar_producto_db(agregados.pop())
+
+    return [
+        ("agregar_producto_db", agregar),
+        ("modificar_producto_campos_db", modificar),
+        ("eliminar_producto_db", eliminar),
+        ("ajustar_precios_categoria_db[0%]", lambda: db.ajustar_precios_categoria_db(id_categoria, 0)),
+    ]
+
+def ejecutar_suite(cantidad_productos, repeticiones, limite_completo):
+    """Mide todas las operaciones sobre el catálogo activo.
+    Args:
+    cantidad_productos (int): Tamaño del catálogo activo.
+    repeticiones (int): Ejecuciones por operación.
+    limite_completo (int): Tamaño máximo para las operaciones completas.
+    Returns: Lista de diccionarios de resultados (ver medir), con 'productos' agregado.
+    """
+    resultados = []
+    for nombre, operacion in operaciones_de_lectura(cantidad_productos, limite_completo):
+        resultados.append(medir(nombre, operacion, repeticiones))
+    for nombre, operacion in operaciones_de_escritura():
+        # El ajuste de precios recorre toda una categoría: basta una ejecución.
+        veces = 1 if nombre.startswith("ajustar_precios") else repeticiones
+        resultados.append(medir(nombre, operacion, veces))
+    for resultado in resultados:
+        resultado["productos"] = cantidad_productos
+    return resultados
@@ -0,0 +1,49 @@
+"""Memoria ocupada por un listado completo según cómo se representan las filas.
+
+Compara, sobre el catálogo activo, el listado de productos como lista de
+tuplas (lo que entrega sqlite3 sin row_factory), como lista de
+modelos.Producto (obtener_productos_db) y como modelos.LoteProductos
+(obtener_lote_productos_db). La memoria se mide con tracemalloc: es lo
+que queda asignado mientras el resultado sigue vivo.
+"""
+import gc
+import time
+import tracemalloc
+import database as db
+
+def _tuplas():
+    """El listado completo como lo entrega sqlite3, sin row_factory."""
+    return db.obtener_conexion().execute(db.SQL_PRODUCTOS).fetchall()
+
+REPRESENTACIONES = [
+    ("tuplas", _tuplas),
+    ("Producto", db.obtener_productos_db),
+    ("LoteProductos", db.obtener_lote_productos_db),
+]
+
+def medir_memoria_listado(cantidad_productos):
+    """Mide memoria y tiempo de cada representación del listado completo.
+    Args: cantidad_productos (int): Tamaño del catálogo activo.
+    Returns: Lista de diccionarios con 'productos', 'representacion',
+    'bytes', 'bytes_por_fila', 'pico_bytes' y 'segundos'.
+    """
+    resultados = []
+    for nombre, obtener in REPRESENTACIONES:
+        gc.collect()
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        listado = obtener()
+        segundos = time.perf_counter() - inicio
+        actual, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        filas = len(listado)
+        del listado
+        resultados.append({
+            "productos": cantidad_productos,
+            "representacion": nombre,
+            "bytes": actual,
+            "bytes_por_fila": actual / filas if filas else 0.0,
+            "pico_bytes": pico,
+            "segundos": segundos,
+        })
+    return resultados
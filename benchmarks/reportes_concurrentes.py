@@ -0,0 +1,105 @@
+"""Latencia de escritura mientras otros procesos generan reportes.
+
+Un proceso escribe (modifica la cantidad de productos al azar, como un
+empleado en el menú) mientras varios procesos lectores repiten el listado
+completo y el reporte de stock bajo. Se comparan tres situaciones:
+
+* sin_reportes: solo el escritor, como referencia.
+* directo: los lectores leen el archivo en uso.
+* instantanea: los lectores usan database.activar_modo_reportes y leen de
+  una copia en memoria, refrescada cada INTERVALO_REFRESCO_S si hubo cambios.
+
+En modo WAL los lectores no bloquean al escritor, pero cada lectura larga
+impide que el checkpoint recicle el -wal; por eso también se informa el
+tamaño final del -wal. Se trabaja sobre una copia del catálogo activo.
+"""
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+import database as db
+from benchmarks.stock_concurrente import _copiar_catalogo
+
+MODOS = ("sin_reportes", "directo", "instantanea")
+INTERVALO_REFRESCO_S = 1.0
+
+def _generar_reportes(ruta, modo, listo, fin):
+    """Proceso lector: repite el listado completo y el reporte de stock bajo hasta `fin`.
+    Args:
+    ruta (str): Archivo de la base.
+    modo (str): 'directo' o 'instantanea'.
+    listo, fin (multiprocessing.Event): Avisa que está listo; indica cuándo terminar.
+    Returns: La cantidad de reportes generados.
+    """
+    db.DB_NAME = ruta
+    if modo == "instantanea":
+        db.activar_modo_reportes(INTERVALO_REFRESCO_S)
+    else:
+        db.obtener_conexion()
+    listo.set()
+    reportes = 0
+    while not fin.is_set():
+        db.obtener_productos_db()
+        db.obtener_productos_por_stock_db(10)
+        reportes += 1
+    db.desactivar_modo_reportes()
+    db.cerrar_conexiones()
+    return reportes
+
+def _percentil(valores, fraccion):
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    return valores[min(len(valores) - 1, int(fraccion * len(valores)))]
+
+def medir_escrituras_con_reportes(cantidad_productos, lectores=2, escrituras=300):
+    """Mide la latencia de escritura con y sin reportes concurrentes.
+    Args:
+    cantidad_productos (int): Tamaño del catálogo activo.
+    lectores (int): Procesos que generan reportes.
+    escrituras (int): Escrituras que mide el escritor en cada modo.
+    Returns: Lista de diccionarios con 'productos', 'modo', 'lectores',
+    'escrituras', 'mediana_ms', 'p95_ms', 'p99_ms', 'maximo_ms',
+    'reportes' (generados por todos los lectores) y 'wal_bytes'.
+    """
+    contexto = multiprocessing.get_context("spawn")
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "reportes_concurrentes.db")
+        _copiar_catalogo(ruta)
+        ruta_activa = db.DB_NAME
+        db.cerrar_conexiones()
+        db.DB_NAME = ruta
+        try:
+            ids = [fila[0] for fila in db.obtener_conexion().execute("SELECT id FROM productos")]
+            azar = random.Random(0)
+            for modo in MODOS:
+                db.obtener_conexion().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                procesos = 0 if modo == "sin_reportes" else lectores
+                with contexto.Manager() as gestor, contexto.Pool(max(procesos, 1)) as grupo:
+                    fin = gestor.Event()
+                    listos = [gestor.Event() for _ in range(procesos)]
+                    tareas = [grupo.apply_async(_generar_reportes, (ruta, modo, listo, fin)) for listo in listos]
+                    for listo in listos:
+                        listo.wait()
+                    latencias = []
+                    for _ in range(escrituras):
+                        id_prod = azar.choice(ids)
+                        inicio = time.perf_counter()
+                        db.modificar_producto_campos_db(id_prod, {"cantidad": azar.randint(0, 100)})
+                        latencias.append(time.perf_counter() - inicio)
+                    fin.set()
+                    reportes = sum(tarea.get() for tarea in tareas)
+                wal = ruta + "-wal"
+                latencias.sort()
+                resultados.append({
+                    "productos": cantidad_productos, "modo": modo, "lectores": procesos,
+                    "escrituras": escrituras, "mediana_ms": statistics.median(latencias) * 1000,
+                    "p95_ms": _percentil(latencias, 0.95) * 1000, "p99_ms": _percentil(latencias, 0.99) * 1000,
+                    "maximo_ms": latencias[-1] * 1000, "reportes": reportes,
+                    "wal_bytes": os.path.getsize(wal) if os.path.exists(wal) else 0,
+                })
+        finally:
+            db.cerrar_conexiones()
+            db.DB_NAME = ruta_activa
+    return resultados
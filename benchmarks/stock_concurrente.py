@@ -0,0 +1,151 @@
+"""Descuentos de stock concurrentes desde varios procesos.
+
+Varios procesos venden al mismo tiempo, con pedidos de 1 a 3 líneas, un
+grupo chico de productos "calientes" cuyo stock alcanza para una parte de
+la demanda. Se comparan dos modos:
+
+* condicional: database.registrar_pedido_db (UPDATE ... WHERE cantidad >= n).
+* lectura_escritura: lee la cantidad y después escribe cantidad - n, como
+  hacía el menú de modificación; entre la lectura y la escritura otro
+  proceso puede vender, y esa venta se pierde.
+
+Al terminar se compara, producto por producto, el stock final con el
+inicial menos lo que los procesos informaron como vendido, y con el saldo
+que da el libro de movimientos (database.stock_a_fecha_db). El stock
+inicial se carga con IDs repetidos en un mismo lote, para verificar que el
+libro no se desfase. Se trabaja sobre
+una copia del catálogo activo para no alterarlo.
+"""
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import database as db
+
+PROCESOS_POR_DEFECTO = (1, 2, 4)
+MODOS = ("condicional", "lectura_escritura")
+
+def _vender(ruta, modo, ids, pedidos, semilla, inicio):
+    """Proceso vendedor: registra `pedidos` pedidos al azar sobre `ids`.
+    Args:
+    ruta (str): Archivo de la base.
+    modo (str): Uno de MODOS.
+    ids (list): IDs de los productos calientes.
+    pedidos (int): Cantidad de pedidos a intentar.
+    semilla (int): Semilla de este proceso.
+    inicio (multiprocessing.Event): Largada común de todos los procesos.
+    Returns: Tupla (vendidas, confirmados, rechazados, t_inicio, t_fin);
+    vendidas es un diccionario {id_prod: unidades}.
+    """
+    db.DB_NAME = ruta
+    azar = random.Random(semilla)
+    vendidas = dict.fromkeys(ids, 0)
+    confirmados = rechazados = 0
+    db.obtener_conexion()
+    inicio.wait()
+    t_inicio = time.time()
+    for _ in range(pedidos):
+        lineas = [(azar.choice(ids), azar.randint(1, 3)) for _ in range(azar.randint(1, 3))]
+        if modo == "condicional":
+            try:
+                db.registrar_pedido_db(lineas)
+            except db.StockInsuficienteError:
+                rechazados += 1
+                continue
+        else:
+            pendientes = {}
+            for id_prod, cantidad in lineas:
+                pendientes[id_prod] = pendientes.get(id_prod, 0) + cantidad
+            actuales = {id_prod: db.obtener_conexion().execute(
+                "SELECT cantidad FROM productos WHERE id = ?", (id_prod,)).fetchone()[0] for id_prod in pendientes}
+            if any(actuales[id_prod] < cantidad for id_prod, cantidad in pendientes.items()):
+                rechazados += 1
+                continue
+            with db.transaccion():
+                for id_prod, cantidad in pendientes.items():
+                    db.modificar_producto_campos_db(id_prod, {"cantidad": actuales[id_prod] - cantidad})
+        for id_prod, cantidad in lineas:
+            vendidas[id_prod] += cantidad
+        confirmados += 1
+    t_fin = time.time()
+    db.cerrar_conexiones()
+    return vendidas, confirmados, rechazados, t_inicio, t_fin
+
+def _copiar_catalogo(destino):
+    """Copia la base activa a `destino` con la API de backup de SQLite."""
+    copia = sqlite3.connect(destino)
+    try:
+        db.obtener_conexion().backup(copia)
+    finally:
+        copia.close()
+
+def medir_descuentos_concurrentes(cantidad_productos, procesos=PROCESOS_POR_DEFECTO, pedidos=500,
+                                  productos_calientes=10):
+    """Mide pedidos por segundo y verifica que no se pierdan ventas.
+    Args:
+    cantidad_productos (int): Tamaño del catálogo activo.
+    procesos (iterable): Cantidades de procesos vendedores a medir.
+    pedidos (int): Pedidos que intenta cada proceso.
+    productos_calientes (int): Cantidad de productos sobre los que se vende.
+    Returns: Lista de diccionarios con 'productos', 'modo', 'procesos',
+    'pedidos', 'confirmados', 'rechazados', 'segundos', 'pedidos_por_segundo',
+    'unidades_perdidas' (ventas confirmadas que no se reflejan en el stock),
+    'stock_negativo', 'libro_desfasado' (productos cuyo saldo según el libro
+    de movimientos no coincide con la cantidad) y 'consistente'.
+    """
+    contexto = multiprocessing.get_context("spawn")
+    resultados = []
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "stock_concurrente.db")
+        _copiar_catalogo(ruta)
+        ruta_activa = db.DB_NAME
+        db.cerrar_conexiones()
+        db.DB_NAME = ruta
+        try:
+            ids = [fila[0] for fila in db.obtener_conexion().execute(
+                "SELECT id FROM productos ORDER BY id LIMIT ?", (productos_calientes,))]
+            for modo in MODOS:
+                for cantidad in procesos:
+                    # El stock alcanza para la mitad de la demanda esperada
+                    # (4 unidades por pedido en promedio).
+                    stock = max(1, cantidad * pedidos * 4 // (2 * len(ids)))
+                    # Cada ID va dos veces: primero en 0 y después con el stock.
+                    db.actualizar_cantidades_db([(id_prod, 0) for id_prod in ids]
+                                                + [(id_prod, stock) for id_prod in ids])
+                    db.cerrar_conexiones()
+
+                    with contexto.Manager() as gestor, contexto.Pool(cantidad) as grupo:
+                        inicio = gestor.Event()
+                        tareas = [grupo.apply_async(_vender, (ruta, modo, ids, pedidos, semilla, inicio))
+                                  for semilla in range(cantidad)]
+                        time.sleep(0.5)  # deja que todos los procesos abran su conexión
+                        inicio.set()
+                        salidas = [tarea.get() for tarea in tareas]
+
+                    vendidas = dict.fromkeys(ids, 0)
+                    for parciales, _, _, _, _ in salidas:
+                        for id_prod, unidades in parciales.items():
+                            vendidas[id_prod] += unidades
+                    finales = dict(db.obtener_conexion().execute(
+                        f"SELECT id, cantidad FROM productos WHERE id IN ({','.join('?' * len(ids))})", ids))
+                    perdidas = sum(finales[id_prod] - (stock - vendidas[id_prod]) for id_prod in ids)
+                    negativos = sum(1 for valor in finales.values() if valor < 0)
+                    ahora = int(time.time())
+                    desfasados = sum(1 for id_prod in ids if db.stock_a_fecha_db(id_prod, ahora) != finales[id_prod])
+                    confirmados = sum(salida[1] for salida in salidas)
+                    segundos = max(salida[4] for salida in salidas) - min(salida[3] for salida in salidas)
+                    resultados.append({
+                        "productos": cantidad_productos, "modo": modo, "procesos": cantidad,
+                        "pedidos": cantidad * pedidos, "confirmados": confirmados,
+                        "rechazados": sum(salida[2] for salida in salidas),
+                        "segundos": segundos, "pedidos_por_segundo": cantidad * pedidos / segundos,
+                        "unidades_perdidas": perdidas, "stock_negativo": negativos,
+                        "libro_desfasado": desfasados,
+                        "consistente": perdidas == 0 and negativos == 0 and desfasados == 0,
+                    })
+        finally:
+            db.cerrar_conexiones()
+            db.DB_NAME = ruta_activa
+    return resultados
@@ -8,6 +8,8 @@ import sqlite3
 import database as db
 import ui
 
+LIMITE_CATEGORIAS = 20
+
 def agregar_nueva_categoria():
     """Orquesta la adición de una nueva categoría, validando la entrada.
     Si ya hay 10 categorías, muestra un mensaje de error.
@@ -16,8 +18,8 @@ def agregar_nueva_categoria():
     Args: no tiene
     Returns: no tiene
     """
-    if db.contar_categorias_db() >= 20:
-        ui.mostrar_mensaje_error("Ud ha alcanzado el límite de 20 categorías.")
+    if db.contar_categorias_db() >= LIMITE_CATEGORIAS:
+        ui.mostrar_mensaje_error(f"Ud ha alcanzado el límite de {LIMITE_CATEGORIAS} categorías.")
         return
 
     while True:
@@ -43,12 +45,13 @@ def modificar_una_categoria():
     categorias = db.obtener_categorias_db()
     if not ui.mostrar_lista_categorias(categorias):
         return
+    ids_validos = {id_cat for id_cat, _ in categorias}
 
     while True:
         try:
             id_cat_str = ui.obtener_input("Ingrese el ID de la categoría a modificar: ")
             id_cat = int(id_cat_str)
-            if id_cat in [c[0] for c in categorias]:
+            if id_cat in ids_validos:
                 break
             else:
                 ui.mostrar_mensaje_error(" ID no válido. Intente de nuevo.")
@@ -78,12 +81,13 @@ def eliminar_una_categoria():
     categorias = db.obtener_categorias_db()
     if not ui.mostrar_lista_categorias(categorias):
         return
+    ids_validos = {id_cat for id_cat, _ in categorias}
 
     while True:
         try:
             id_cat_str = ui.obtener_input(" Ingrese el ID de la categoría a eliminar: ")
             id_cat = int(id_cat_str)
-            if id_cat in [c[0] for c in categorias]:
+            if id_cat in ids_validos:
                 break
             else:
                 ui.mostrar_mensaje_error(" ID no válido. Intente de nuevo.")
@@ -0,0 +1,272 @@
+# cli.py
+"""
+Módulo de línea de comandos no interactiva. 🤖
+Permite usar el inventario desde scripts sin pasar por el menú: cada
+subcomando (list, get, add, modify, delete, low-stock, categories,
+changes, compact-changes) ejecuta una operación y escribe el resultado en JSON. El subcomando batch lee
+muchos comandos de un archivo o de la entrada estándar y los ejecuta sobre
+una única conexión y una única transacción, respondiendo en JSON Lines.
+"""
+import argparse
+import json
+import shlex
+import sqlite3
+import sys
+import database as db
+import modelos
+
+CAMPOS_PRODUCTO = modelos.Producto._fields
+
+class ErrorDeComando(Exception):
+    """Error de uso o de validación de un comando; se informa en el JSON."""
+
+class _ParserSinSalida(argparse.ArgumentParser):
+    """ArgumentParser que levanta ErrorDeComando en lugar de terminar el proceso.
+    Se usa en el modo batch, donde un comando mal escrito no debe cortar el lote.
+    """
+    def error(self, message):
+        raise ErrorDeComando(message)
+
+    def exit(self, status=0, message=None):
+        raise ErrorDeComando(message or "Comando inválido.")
+
+def _producto_a_dict(fila):
+    """Convierte un modelos.Producto en un diccionario con nombres de campo."""
+    return fila._asdict()
+
+def _entero(minimo):
+    """Retorna un tipo de argparse que acepta enteros mayores o iguales a `minimo`."""
+    def convertir(texto):
+        try:
+            valor = int(texto)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"'{texto}' no es un número entero.") from None
+        if valor < minimo:
+            raise argparse.ArgumentTypeError(f"El valor debe ser mayor o igual a {minimo}.")
+        return valor
+    return convertir
+
+def _texto_no_vacio(texto):
+    """Tipo de argparse que rechaza textos vacíos."""
+    if not texto.strip():
+        raise argparse.ArgumentTypeError("El texto no puede estar vacío.")
+    return texto.strip()
+
+def _resolver_categoria(valor):
+    """Obtiene el ID de una categoría a partir de su ID o de su nombre.
+    Levanta un error ErrorDeComando: Si la categoría no existe.
+    """
+    for id_cat, nombre in db.obtener_categorias_db():
+        if valor == str(id_cat) or valor == nombre:
+            return id_cat
+    raise ErrorDeComando(f"La categoría '{valor}' no existe.")
+
+def _comando_list(argumentos):
+    """Retorna todos los productos, ordenados por nombre, de a una página por vez."""
+    return (_producto_a_dict(fila) for fila in db.iterar_productos_db())
+
+def _comando_get(argumentos):
+    """Retorna un producto por ID."""
+    fila = db.obtener_producto_por_id_db(argumentos.id)
+    if fila is None:
+        raise ErrorDeComando(f"No se encontró ningún producto con el ID {argumentos.id}.")
+    return _producto_a_dict(fila)
+
+def _comando_add(argumentos):
+    """Agrega un producto y retorna su ID."""
+    categoria_id = _resolver_categoria(argumentos.categoria)
+    nuevo_id = db.agregar_producto_db(argumentos.nombre, argumentos.descripcion,
+                                      argumentos.cantidad, argumentos.precio, categoria_id)
+    return {"id": nuevo_id}
+
+def _comando_modify(argumentos):
+    """Modifica los campos indicados de un producto y lo retorna actualizado."""
+    if db.obtener_producto_por_id_db(argumentos.id) is None:
+        raise ErrorDeComando(f"No se encontró ningún producto con el ID {argumentos.id}.")
+    cambios = {campo: getattr(argumentos, campo)
+               for campo in ("nombre", "descripcion", "cantidad", "precio")
+               if getattr(argumentos, campo) is not None}
+    if argumentos.categoria is not None:
+        cambios["categoria_id"] = _resolver_categoria(argumentos.categoria)
+    if not cambios:
+        raise ErrorDeComando("Debe indicar al menos un campo a modificar.")
+    db.modificar_producto_campos_db(argumentos.id, cambios)
+    return _producto_a_dict(db.obtener_producto_por_id_db(argumentos.id))
+
+def _comando_delete(argumentos):
+    """Elimina un producto por ID."""
+    if db.obtener_producto_por_id_db(argumentos.id) is None:
+        raise ErrorDeComando(f"No se encontró ningún producto con el ID {argumentos.id}.")
+    db.eliminar_producto_db(argumentos.id)
+    return {"id": argumentos.id}
+
+def _comando_low_stock(argumentos):
+    """Retorna los productos con stock menor o igual al límite, ordenados por cantidad."""
+    return (_producto_a_dict(fila) for fila in db.iterar_productos_por_stock_db(argumentos.limite))
+
+def _comando_categories(argumentos):
+    """Retorna todas las categorías."""
+    return [{"id": id_cat, "nombre": nombre} for id_cat, nombre in db.obtener_categorias_db()]
+
+def _comando_changes(argumentos):
+    """Retorna los productos y categorías que cambiaron desde un cursor, con el cursor siguiente."""
+    try:
+        cambios, cursor = db.obtener_cambios_db(argumentos.desde, argumentos.limite)
+    except db.CursorVencidoError as error:
+        raise ErrorDeComando(str(error)) from None
+    return {
+        "cursor": cursor,
+        "cambios": [{"secuencia": cambio.secuencia, "tabla": cambio.tabla, "id": cambio.fila_id,
+                     "operacion": cambio.operacion, "fila": None if cambio.fila is None else cambio.fila._asdict()}
+                    for cambio in cambios],
+    }
+
+def _comando_compact_changes(argumentos):
+    """Compacta el registro de cambios y retorna cuántas entradas borró."""
+    return {"borradas": db.compactar_cambios_db(argumentos.purgar_hasta)}
+
+def agregar_subcomandos(parser, incluir_batch=False):
+    """Agrega los subcomandos no interactivos a un ArgumentParser.
+    Args:
+    parser (argparse.ArgumentParser): El parser principal (o el del modo batch).
+    incluir_batch (bool): Si es True, agrega también el subcomando batch.
+    Returns: El objeto de subparsers creado.
+    """
+    subparsers = parser.add_subparsers(dest="comando", metavar="COMANDO")
+
+    sub = subparsers.add_parser("list", help="Lista todos los productos ordenados por nombre.")
+    sub.set_defaults(funcion=_comando_list)
+
+    sub = subparsers.add_parser("get", help="Muestra un producto por ID.")
+    sub.add_argument("id", type=int)
+    sub.set_defaults(funcion=_comando_get)
+
+    sub = subparsers.add_parser("add", help="Agrega un producto.")
+    sub.add_argument("--nombre", required=True, type=_texto_no_vacio)
+    sub.add_argument("--descripcion", required=True, type=_texto_no_vacio)
+    sub.add_argument("--cantidad", required=True, type=_entero(1))
+    sub.add_argument("--precio", required=True, type=_entero(0))
+    sub.add_argument("--categoria", required=True, help="ID o nombre de la categoría.")
+    sub.set_defaults(funcion=_comando_add)
+
+    sub = subparsers.add_parser("modify", help="Modifica uno o más campos de un producto.")
+    sub.add_argument("id", type=int)
+    sub.add_argument("--nombre", type=_texto_no_vacio)
+    sub.add_argument("--descripcion", type=_texto_no_vacio)
+    sub.add_argument("--cantidad", type=_entero(0))
+    sub.add_argument("--precio", type=_entero(0))
+    sub.add_argument("--categoria", help="ID o nombre de la categoría.")
+    sub.set_defaults(funcion=_comando_modify)
+
+    sub = subparsers.add_parser("delete", help="Elimina un producto por ID.")
+    sub.add_argument("id", type=int)
+    sub.set_defaults(funcion=_comando_delete)
+
+    sub = subparsers.add_parser("low-stock", help="Lista los productos con cantidad menor o igual al límite.")
+    sub.add_argument("limite", type=_entero(0))
+    sub.set_defaults(funcion=_comando_low_stock)
+
+    sub = subparsers.add_parser("categories", help="Lista las categorías.")
+    sub.set_defaults(funcion=_comando_categories)
+
+    sub = subparsers.add_parser("changes", help="Lista los productos y categorías que cambiaron desde un cursor.")
+    sub.add_argument("--desde", type=_entero(0), default=0,
+                     help="Cursor devuelto por la llamada anterior (0 para recorrer todo).")
+    sub.add_argument("--limite", type=_entero(1), default=1000, help="Máximo de filas por llamada.")
+    sub.set_defaults(funcion=_comando_changes)
+
+    sub = subparsers.add_parser("compact-changes", help="Compacta el registro de cambios.")
+    sub.add_argument("--purgar-hasta", type=_entero(1), metavar="CURSOR",
+                     help="Borra también las bajas hasta CURSOR, ya leídas por todos los que sincronizan.")
+    sub.set_defaults(funcion=_comando_compact_changes)
+
+    if incluir_batch:
+        sub = subparsers.add_parser("batch", help="Ejecuta muchos comandos en una sola transacción.")
+        sub.add_argument("archivo", nargs="?", type=argparse.FileType("r", encoding="utf-8"), default="-",
+                         help="Archivo con un comando por línea ('-' o nada para la entrada estándar).")
+        sub.add_argument("--atomico", action="store_true",
+                         help="Revierte el lote completo si algún comando falla.")
+
+    return subparsers
+
+def _escribir_json(salida, respuesta, sangria=None):
+    """Escribe una respuesta JSON; si el resultado es un generador, lo
+    escribe elemento por elemento para no cargar el listado en memoria.
+    """
+    resultado = respuesta.get("resultado")
+    if resultado is None or isinstance(resultado, (dict, list)):
+        salida.write(json.dumps(respuesta, ensure_ascii=False, indent=sangria) + "\n")
+        return
+
+    cabecera = json.dumps({**respuesta, "resultado": []}, ensure_ascii=False)
+    salida.write(cabecera[:cabecera.rindex("[") + 1])
+    for indice, elemento in enumerate(resultado):
+        salida.write(("," if indice else "") + json.dumps(elemento, ensure_ascii=False))
+    salida.write(cabecera[cabecera.rindex("]"):] + "\n")
+
+def _ejecutar_comando(argumentos):
+    """Ejecuta un comando ya parseado y arma la respuesta.
+    Returns: Diccionario con 'ok' y 'resultado' o 'error'.
+    """
+    try:
+        return {"ok": True, "comando": argumentos.comando, "resultado": argumentos.funcion(argumentos)}
+    except ErrorDeComando as error:
+        return {"ok": False, "comando": argumentos.comando, "error": str(error)}
+    except sqlite3.IntegrityError as error:
+        return {"ok": False, "comando": argumentos.comando, "error": f"Restricción de la base de datos: {error}"}
+
+def ejecutar(argumentos, salida=sys.stdout):
+    """Ejecuta un subcomando individual y escribe el resultado en JSON.
+    Args:
+    argumentos (argparse.Namespace): Las opciones parseadas por main.
+    salida: Archivo de texto donde escribir el JSON.
+    Returns: El código de salida del proceso (0 si tuvo éxito, 1 si no).
+    """
+    if argumentos.comando == "batch":
+        return ejecutar_lote(argumentos.archivo, argumentos.atomico, salida)
+    respuesta = _ejecutar_comando(argumentos)
+    _escribir_json(salida, respuesta, sangria=2)
+    return 0 if respuesta["ok"] else 1
+
+def ejecutar_lote(archivo, atomico=False, salida=sys.stdout):
+    """Ejecuta un lote de comandos en una sola transacción.
+    Cada línea es un comando con la misma sintaxis que en la línea de
+    comandos (ej: `modify 3 --precio 150`); las líneas vacías y las que
+    empiezan con '#' se ignoran. Cada comando corre en su propio SAVEPOINT:
+    si falla, se revierte solo ese comando y el lote continúa, salvo con
+    `atomico`, donde el primer error revierte el lote completo.
+    Args:
+    archivo: Archivo de texto abierto con los comandos.
+    atomico (bool): Si es True, todo o nada.
+    salida: Archivo de texto donde escribir una línea JSON por comando.
+    Returns: El código de salida del proceso (0 si todos tuvieron éxito, 1 si no).
+    """
+    parser = _ParserSinSalida(prog="batch", add_help=False)
+    agregar_subcomandos(parser)
+    errores = 0
+    try:
+        with db.transaccion():
+            for numero, linea in enumerate(archivo, start=1):
+                linea = linea.strip()
+                if not linea or linea.startswith("#"):
+                    continue
+                respuesta = None
+                try:
+                    argumentos = parser.parse_args(shlex.split(linea))
+                    if argumentos.comando is None:
+                        raise ErrorDeComando("Falta el comando.")
+                    with db.transaccion():
+                        respuesta = _ejecutar_comando(argumentos)
+                        if not respuesta["ok"]:
+                            raise ErrorDeComando(respuesta["error"])
+                except (ErrorDeComando, ValueError) as error:
+                    respuesta = respuesta or {"ok": False, "error": str(error)}
+                respuesta = {"linea": numero, **respuesta}
+                _escribir_json(salida, respuesta)
+                if not respuesta["ok"]:
+                    errores += 1
+                    if atomico:
+                        raise ErrorDeComando("Lote revertido.")
+    except ErrorDeComando as error:
+        _escribir_json(salida, {"ok": False, "error": str(error)})
+    return 0 if errores == 0 else 1
@@ -1,4 +1,4 @@
- # database.py
+# database.py
 """Módulo de Acceso a Datos (Data Access Layer).
 
 Este módulo centraliza todas las interacciones con la base de datos SQLite,
@@ -7,39 +7,482 @@ permitiendo un acceso más limpio y organizado a las operaciones CRUD
 (Create, Read, Update, Delete) sobre las tablas 'categorias' y 'productos'.
 Incluye funciones para inicializar la base de datos y manejar las conexiones,
 asegurando que las claves foráneas estén habilitadas para mantener la integridad referencial. 
+
+Las conexiones se reutilizan: cada hilo mantiene una única conexión ya
+configurada (claves foráneas, modo WAL y tiempo de espera por bloqueo),
+que comparten todas las funciones *_db en lugar de abrir y cerrar el
+archivo en cada llamada.
 """
+import contextlib
+import functools
+import itertools
+import os
+import random
+import re
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import modelos
 
 DB_NAME = "inventario.db"
+BUSY_TIMEOUT_MS = 5000
+TAMANO_PAGINA = 50
+MAX_CACHE_PRODUCTOS = 1024
+
+_COLUMNAS_PRODUCTO = """
+        SELECT p.id, p.nombre, p.descripcion, p.cantidad, p.precio, c.nombre
+        FROM productos p
+        JOIN categorias c ON p.categoria_id = c.id
+"""
+SQL_PRODUCTOS = _COLUMNAS_PRODUCTO + "ORDER BY p.nombre, p.id"
+SQL_PRODUCTO_POR_ID = _COLUMNAS_PRODUCTO + "WHERE p.id = ?"
+SQL_PRODUCTOS_POR_STOCK = _COLUMNAS_PRODUCTO + "WHERE p.cantidad <= ? ORDER BY p.cantidad, p.id"
+SQL_CONTAR_EN_CATEGORIA = "SELECT COUNT(*) FROM productos WHERE categoria_id = ?"
+SQL_TOP_VALOR = _COLUMNAS_PRODUCTO + "ORDER BY p.cantidad * p.precio DESC, p.id LIMIT ?"
+MOTIVO_AJUSTE = "Ajuste"
+MOTIVO_VENTA = "Venta"
+MOTIVO_COMPRA = "Compra"
+# Reintentos ante "database is locked" (SQLITE_BUSY) cuando se agota
+# BUSY_TIMEOUT_MS: la espera se duplica en cada intento, con ±50% de azar.
+REINTENTOS_BLOQUEO = 5
+ESPERA_BLOQUEO_S = 0.05
+CORTE_CADA_MOVIMIENTOS = 100_000
+SQL_MOVIMIENTO_AJUSTE = """
+    INSERT INTO movimientos (producto_id, delta, motivo, fecha)
+    SELECT id, :cantidad - cantidad, :motivo, :fecha FROM productos
+    WHERE id = :id AND cantidad <> :cantidad
+"""
+# Un corte por producto con movimientos posteriores al último corte. La
+# fecha del corte es la de su movimiento más reciente, así solo se usa para
+# fechas en las que todos los movimientos que resume ya habían ocurrido.
+SQL_GENERAR_CORTES = """
+    INSERT INTO cortes_stock (producto_id, movimiento_id, fecha, cantidad)
+    SELECT m.producto_id, m.ultimo, m.fecha, p.cantidad
+    FROM (SELECT producto_id, MAX(id) AS ultimo, MAX(fecha) AS fecha
+          FROM movimientos WHERE id > ? GROUP BY producto_id) AS m
+    JOIN productos p ON p.id = m.producto_id
+"""
+# Cambios posteriores a una secuencia, uno por fila (el más reciente), con
+# los datos actuales de la fila; p.id y cat.id son NULL si ya no existe.
+# Recorre la clave primaria desde el cursor y descarta las entradas que
+# tienen otra más nueva para la misma fila (idx_cambios_fila): cada página
+# cuesta lo mismo sin importar cuántos cambios quedan por leer.
+SQL_CAMBIOS_DESDE = """
+    SELECT c.secuencia, c.tabla, c.fila_id, c.operacion,
+           p.id, p.nombre, p.descripcion, p.cantidad, p.precio, pc.nombre, cat.id, cat.nombre
+    FROM (SELECT secuencia, tabla, fila_id, operacion FROM cambios
+          WHERE secuencia > ?
+            AND NOT EXISTS (SELECT 1 FROM cambios d
+                            WHERE d.tabla = cambios.tabla AND d.fila_id = cambios.fila_id
+                              AND d.secuencia > cambios.secuencia)
+          ORDER BY secuencia LIMIT ?) AS c
+    LEFT JOIN productos p ON c.tabla = 'productos' AND p.id = c.fila_id
+    LEFT JOIN categorias pc ON pc.id = p.categoria_id
+    LEFT JOIN categorias cat ON c.tabla = 'categorias' AND cat.id = c.fila_id
+    ORDER BY c.secuencia
+"""
+# Borra las entradas que tienen otra más reciente para la misma fila.
+SQL_COMPACTAR_CAMBIOS = """
+    DELETE FROM cambios
+    WHERE secuencia < (SELECT MAX(c.secuencia) FROM cambios c
+                       WHERE c.tabla = cambios.tabla AND c.fila_id = cambios.fila_id)
+"""
+
+SQL_KARDEX = """
+    SELECT id, fecha, motivo, delta,
+           (SELECT cantidad FROM productos WHERE id = :id)
+           - COALESCE(SUM(delta) OVER (ORDER BY id DESC ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING), 0)
+    FROM (SELECT id, fecha, motivo, delta FROM movimientos
+          WHERE producto_id = :id ORDER BY id DESC LIMIT :limite)
+    ORDER BY id
+"""
+SQL_STOCK_A_FECHA = """
+    WITH corte AS (
+        SELECT movimiento_id, cantidad FROM cortes_stock
+        WHERE producto_id = :id AND fecha <= :fecha
+        ORDER BY movimiento_id DESC LIMIT 1
+    )
+    SELECT COALESCE((SELECT cantidad FROM corte), 0) + COALESCE((
+        SELECT SUM(delta) FROM movimientos
+        WHERE producto_id = :id AND id > COALESCE((SELECT movimiento_id FROM corte), 0)
+          AND fecha <= :fecha
+    ), 0)
+"""
+SQL_BUSCAR_TEXTO = """
+        SELECT p.id, p.nombre, p.descripcion, p.cantidad, p.precio, c.nombre
+        FROM (
+            SELECT rowid, rank FROM productos_fts
+            WHERE productos_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        ) f
+        JOIN productos p ON p.id = f.rowid
+        JOIN categorias c ON p.categoria_id = c.id
+        ORDER BY f.rank
+"""
+
+_local = threading.local()
+_conexiones_abiertas = []
+_lock_conexiones = threading.Lock()
+_generacion = 0
+_configuradores_conexion = []
+
+def _crear_conexion(nombre_db):
+    """Abre y configura una nueva conexión a la base de datos.
+
+    Activa las claves foráneas, el modo de journal WAL (lectores y escritor
+    no se bloquean entre sí) y un tiempo de espera ante bloqueos.
+    Args: nombre_db (str): Ruta del archivo SQLite.
+    Returns: sqlite3.Connection: La conexión configurada.
+    """
+    conn = sqlite3.connect(nombre_db, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};")
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    for configurar in _configuradores_conexion:
+        configurar(conn)
+    return conn
+
+def registrar_configurador_conexion(configurar):
+    """Registra una función que se aplica a cada conexión del pool.
+    Se aplica a las conexiones ya abiertas y a todas las que se abran después;
+    sirve, por ejemplo, para instalar callbacks de trazas o de progreso.
+    Args: configurar (callable): Recibe un sqlite3.Connection.
+    Returns: no tiene
+    """
+    with _lock_conexiones:
+        _configuradores_conexion.append(configurar)
+        for conn in _conexiones_abiertas:
+            configurar(conn)
 
 def obtener_conexion():
-    """Establece y retorna una conexión a la base de datos.
+    """Retorna la conexión a la base de datos del hilo actual.
 
-    Activa el soporte para claves foráneas (`PRAGMA foreign_keys = ON`)
-    para garantizar la integridad referencial en cada conexión.
+    La primera llamada de cada hilo abre y configura la conexión; las
+    siguientes reutilizan la misma. Si DB_NAME cambia, se abre una nueva.
+    Las funciones que la usan no deben cerrarla.
     Args: no tiene
     Returns: sqlite3.Connection: Un objeto de conexión a la base de datos.
      
     """
-    conn = sqlite3.connect(DB_NAME)
-    conn.execute("PRAGMA foreign_keys = ON;")
+    conn = getattr(_local, "conn", None)
+    clave = (DB_NAME, _generacion)
+    if conn is None or _local.clave != clave:
+        conn = _crear_conexion(DB_NAME)
+        _local.conn = conn
+        _local.clave = clave
+        _local.version_datos = None
+        with _lock_conexiones:
+            _conexiones_abiertas.append(conn)
     return conn
 
-def inicializar_db():
-    """Crea el esquema de la base de datos si las tablas no existen.
-    Define y crea las tablas 'categorias' y 'productos'.
-    args: no tiene
-    Returns: no tiene  
+def cerrar_conexiones():
+    """Cierra todas las conexiones abiertas por el pool.
+
+    Se debe llamar al salir de la aplicación o al cambiar de base de datos.
+    Los hilos que sigan activos abrirán una conexión nueva en su próxima llamada.
+    Args: no tiene
+    Returns: no tiene
+    """
+    global _generacion
+    with _lock_conexiones:
+        _generacion += 1
+        for conn in _conexiones_abiertas:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _conexiones_abiertas.clear()
+    _local.__dict__.clear()
+    invalidar_cache()
+
+_monitor = None
+_lock_monitor = threading.Lock()
+
+def version_datos_db():
+    """Retorna un número que cambia cada vez que se confirma una escritura.
+    Usa una conexión propia que nunca escribe, por lo que su PRAGMA
+    data_version refleja los commits de todas las demás conexiones, de
+    este proceso o de otros. Solo tiene sentido compararlo por igualdad
+    dentro del mismo proceso: se reinicia al reabrir las conexiones.
+    Args: no tiene
+    Returns: int: La versión actual de los datos.
+    """
+    global _monitor
+    clave = (DB_NAME, _generacion)
+    with _lock_monitor:
+        if _monitor is None or _monitor[0] != clave:
+            conn = _crear_conexion(DB_NAME)
+            with _lock_conexiones:
+                _conexiones_abiertas.append(conn)
+            _monitor = (clave, conn)
+        return _monitor[1].execute("PRAGMA data_version").fetchone()[0]
+
+# Modo reportes: los listados y reportes se leen de una copia de la base
+# tomada con la API de backup, en lugar del archivo en uso.
+_instantanea = None
+_lock_instantanea = threading.Lock()
+_refresco_instantanea = None
+
+def _tomar_instantanea(destino):
+    """Copia la base activa con la API de backup y retorna la conexión a la copia.
+    La copia se hace en un solo paso (pages=-1) desde una conexión propia:
+    es una única transacción de lectura, por lo que la foto es consistente
+    y, en modo WAL, los escritores no esperan mientras se toma.
+    """
+    origen = _crear_conexion(DB_NAME)
+    copia = sqlite3.connect(destino, check_same_thread=False)
+    try:
+        origen.backup(copia)
+    finally:
+        origen.close()
+    # La copia hereda el modo WAL del original; en disco no hace falta y
+    # dejaría archivos -wal y -shm por cada instantánea.
+    copia.execute("PRAGMA journal_mode = DELETE")
+    copia.execute("PRAGMA query_only = ON")
+    return copia
+
+def refrescar_instantanea_db(forzar=False):
+    """Vuelve a tomar la instantánea del modo reportes si la base cambió.
+    La copia nueva se arma aparte y recién después reemplaza a la anterior,
+    así los reportes que se estén leyendo terminan sobre la foto vieja.
+    Args: forzar (bool): Si es True, la toma aunque no haya cambios.
+    Returns: bool: True si se tomó una instantánea nueva. False si no hacía
+    falta o si el modo reportes no está activo.
+    """
+    global _instantanea
+    with _lock_instantanea:
+        anterior = _instantanea
+        if anterior is None:
+            return False
+        clave = (DB_NAME, _generacion)
+        # La versión se lee antes de copiar: si alguien escribe durante la
+        # copia, el próximo refresco ve la diferencia y vuelve a copiar.
+        version = version_datos_db()
+        if not forzar and anterior["clave"] == clave and anterior["version"] == version:
+            return False
+        numero = anterior["numero"] + 1
+        destino = ":memory:"
+        if anterior["directorio"] is not None:
+            destino = os.path.join(anterior["directorio"], f"instantanea_{os.getpid()}_{numero}.db")
+        _instantanea = dict(anterior, clave=clave, version=version, numero=numero, destino=destino,
+                            conn=_tomar_instantanea(destino), tomada=time.time())
+    _descartar_instantanea(anterior)
+    return True
+
+def _descartar_instantanea(instantanea):
+    """Borra el archivo de una instantánea reemplazada, si lo tenía.
+    La conexión no se cierra: un reporte en curso puede seguir leyéndola y
+    se libera sola cuando nadie más la usa. Donde no se puede borrar un
+    archivo abierto (Windows), queda en el directorio.
+    """
+    if instantanea is not None and instantanea["destino"] not in (None, ":memory:"):
+        try:
+            os.remove(instantanea["destino"])
+        except OSError:
+            pass
+
+def activar_modo_reportes(intervalo_s=None, directorio=None):
+    """Hace que los listados y reportes se lean de una instantánea de la base.
+    obtener_productos_db, obtener_productos_por_stock_db y las páginas del
+    listado y del reporte de stock bajo dejan de leer el archivo en uso: no mantienen
+    transacciones de lectura abiertas mientras otros escriben (que en WAL
+    impiden el checkpoint y hacen crecer el -wal). A cambio, muestran los
+    datos de la última instantánea. El resto de las funciones lee siempre
+    la base en uso.
+    Args:
+    intervalo_s (float): Cada cuántos segundos revisar PRAGMA data_version y
+    refrescar la instantánea si hubo escrituras. None para refrescar solo a
+    pedido (refrescar_instantanea_db).
+    directorio (str): None para guardar la copia en memoria, o un directorio
+    donde escribirla. La copia incluye toda la base, con el libro de
+    movimientos: para bases grandes conviene un directorio.
+    Returns: no tiene
+    """
+    global _instantanea, _refresco_instantanea
+    desactivar_modo_reportes()
+    with _lock_instantanea:
+        _instantanea = {"clave": None, "version": None, "directorio": directorio, "numero": 0,
+                        "destino": None, "conn": None, "tomada": None}
+    refrescar_instantanea_db(forzar=True)
+    if intervalo_s:
+        detener = threading.Event()
+
+        def refrescar_periodicamente():
+            while not detener.wait(intervalo_s):
+                refrescar_instantanea_db()
+
+        hilo = threading.Thread(target=refrescar_periodicamente, name="instantanea-reportes", daemon=True)
+        _refresco_instantanea = (hilo, detener)
+        hilo.start()
+
+def desactivar_modo_reportes():
+    """Vuelve a leer los listados y reportes de la base en uso y libera la instantánea.
+    Args: no tiene
+    Returns: no tiene
+    """
+    global _instantanea, _refresco_instantanea
+    if _refresco_instantanea is not None:
+        hilo, detener = _refresco_instantanea
+        detener.set()
+        if hilo is not threading.current_thread():
+            hilo.join()
+        _refresco_instantanea = None
+    with _lock_instantanea:
+        anterior, _instantanea = _instantanea, None
+    if anterior is not None and anterior["conn"] is not None:
+        anterior["conn"].close()
+    _descartar_instantanea(anterior)
+
+def antiguedad_instantanea_db():
+    """Retorna hace cuántos segundos se tomó la instantánea, o None si el modo reportes no está activo."""
+    instantanea = _instantanea
+    return None if instantanea is None else time.time() - instantanea["tomada"]
+
+def _conexion_lectura_reportes():
+    """Retorna la conexión de la instantánea si el modo reportes está activo; si no, la del hilo.
+    Si cambió la base activa (DB_NAME o cerrar_conexiones), toma una instantánea nueva.
+    """
+    instantanea = _instantanea
+    if instantanea is None:
+        return obtener_conexion()
+    if instantanea["clave"] != (DB_NAME, _generacion):
+        refrescar_instantanea_db()
+        instantanea = _instantanea or instantanea
+    return instantanea["conn"]
+
+@contextlib.contextmanager
+def transaccion():
+    """Agrupa varias operaciones de escritura en una sola transacción.
+
+    La transacción más externa hace BEGIN IMMEDIATE y COMMIT (o ROLLBACK si
+    hay un error); las anidadas usan SAVEPOINT, de modo que una operación que
+    falla dentro de un lote se revierte sin perder el resto. Todas las
+    funciones de escritura de este módulo la usan, por lo que pueden
+    combinarse dentro de un mismo `with transaccion():`.
+    Args: no tiene
+    Returns: sqlite3.Connection: La conexión del hilo, dentro de la transacción.
     """
     conn = obtener_conexion()
-    cursor = conn.cursor()
-    cursor.execute("""
+    profundidad = getattr(_local, "profundidad", 0)
+    punto = f"sp_{profundidad}"
+    conn.execute("BEGIN IMMEDIATE" if profundidad == 0 else f"SAVEPOINT {punto}")
+    _local.profundidad = profundidad + 1
+    try:
+        yield conn
+    except BaseException:
+        if profundidad == 0:
+            conn.rollback()
+        else:
+            conn.execute(f"ROLLBACK TO {punto}")
+            conn.execute(f"RELEASE {punto}")
+        # Lo leído dentro de la transacción pudo quedar en la caché.
+        invalidar_cache()
+        raise
+    else:
+        if profundidad == 0:
+            conn.commit()
+        else:
+            conn.execute(f"RELEASE {punto}")
+    finally:
+        _local.profundidad = profundidad
+
+# Caché de lectura para las categorías y las búsquedas de un producto por ID.
+# Las funciones de escritura de este módulo la invalidan explícitamente; los
+# cambios hechos por otras conexiones se detectan con PRAGMA data_version.
+_cache = OrderedDict()
+_lock_cache = threading.Lock()
+_generacion_cache = 0
+
+def invalidar_cache(*claves):
+    """Descarta entradas de la caché de lectura.
+    Args: claves: Las claves a descartar, ej: ('producto', 3). Sin claves,
+    descarta toda la caché.
+    Returns: no tiene
+    """
+    global _generacion_cache
+    with _lock_cache:
+        _generacion_cache += 1
+        if not claves:
+            _cache.clear()
+        for clave in claves:
+            _cache.pop((DB_NAME,) + clave, None)
+
+def _invalidar_productos():
+    """Descarta de la caché todas las búsquedas de productos por ID."""
+    global _generacion_cache
+    with _lock_cache:
+        _generacion_cache += 1
+        for clave in [c for c in _cache if c[1] == "producto"]:
+            del _cache[clave]
+
+def _leer_cache(clave, consultar):
+    """Retorna el valor cacheado para la clave o lo consulta y lo guarda.
+    Antes de usar la caché compara PRAGMA data_version con el último valor
+    visto por esta conexión: si otra conexión o proceso escribió en la base,
+    la caché completa se descarta. Los resultados None no se guardan, ni
+    los que se consultaron mientras otra escritura invalidaba la caché.
+    Args:
+    clave (tuple): Identifica la consulta, ej: ('categorias',).
+    consultar (callable): Función sin argumentos que ejecuta la consulta real.
+    Returns: El valor de la consulta.
+    """
+    conn = obtener_conexion()
+    version = conn.execute("PRAGMA data_version").fetchone()[0]
+    if _local.version_datos != version:
+        _local.version_datos = version
+        invalidar_cache()
+
+    clave = (DB_NAME,) + clave
+    with _lock_cache:
+        if clave in _cache:
+            _cache.move_to_end(clave)
+            return _cache[clave]
+        generacion = _generacion_cache
+
+    valor = consultar()
+    if valor is not None:
+        with _lock_cache:
+            if generacion != _generacion_cache:
+                return valor
+            _cache[clave] = valor
+            if len(_cache) > MAX_CACHE_PRODUCTOS:
+                _cache.popitem(last=False)
+    return valor
+
+# Reconstruyen desde cero las tablas de resumen de los reportes (migración 4)
+# con consultas GROUP BY sobre productos.
+SQL_RECALCULAR_RESUMENES = [
+    "DELETE FROM resumen_categorias",
+    "DELETE FROM resumen_precios",
+    """
+    INSERT INTO resumen_categorias (categoria_id, productos, unidades, valor)
+    SELECT c.id, COUNT(p.id), COALESCE(SUM(p.cantidad), 0), COALESCE(SUM(p.cantidad * p.precio), 0)
+    FROM categorias c LEFT JOIN productos p ON p.categoria_id = c.id
+    GROUP BY c.id
+    """,
+    """
+    INSERT INTO resumen_precios (rango, productos)
+    SELECT CASE WHEN precio <= 0 THEN 0 ELSE length(precio) END AS rango, COUNT(*)
+    FROM productos GROUP BY rango
+    """,
+]
+
+# Cada migración lleva el esquema de la versión N-1 a la N (N = posición + 1).
+# La versión actual se guarda en PRAGMA user_version; nunca se deben editar
+# migraciones ya publicadas, solo agregar nuevas al final de la lista.
+MIGRACIONES = [
+    # 1: esquema original.
+    [
+        """
         CREATE TABLE IF NOT EXISTS categorias (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nombre TEXT NOT NULL UNIQUE
         )
-    """)
-    cursor.execute("""
+        """,
+        """
         CREATE TABLE IF NOT EXISTS productos (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nombre TEXT NOT NULL,
@@ -49,9 +492,387 @@ def inicializar_db():
             categoria_id INTEGER NOT NULL,
             FOREIGN KEY (categoria_id) REFERENCES categorias (id) ON DELETE RESTRICT
         )
-    """)
-    conn.commit()
-    conn.close()
+        """,
+    ],
+    # 2: índices para el listado por nombre, el reporte de stock y el conteo
+    # por categoría. Incluyen el id para que el orden sea total (paginación).
+    [
+        "CREATE INDEX IF NOT EXISTS idx_productos_nombre ON productos (nombre, id)",
+        "CREATE INDEX IF NOT EXISTS idx_productos_cantidad ON productos (cantidad, id)",
+        "CREATE INDEX IF NOT EXISTS idx_productos_categoria ON productos (categoria_id)",
+    ],
+    # 3: índice de texto completo (FTS5) sobre nombre y descripción,
+    # sincronizado con productos mediante triggers.
+    [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+            nombre, descripcion,
+            content='productos', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS productos_fts_ai AFTER INSERT ON productos BEGIN
+            INSERT INTO productos_fts (rowid, nombre, descripcion)
+            VALUES (new.id, new.nombre, new.descripcion);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS productos_fts_ad AFTER DELETE ON productos BEGIN
+            INSERT INTO productos_fts (productos_fts, rowid, nombre, descripcion)
+            VALUES ('delete', old.id, old.nombre, old.descripcion);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS productos_fts_au AFTER UPDATE OF nombre, descripcion ON productos BEGIN
+            INSERT INTO productos_fts (productos_fts, rowid, nombre, descripcion)
+            VALUES ('delete', old.id, old.nombre, old.descripcion);
+            INSERT INTO productos_fts (rowid, nombre, descripcion)
+            VALUES (new.id, new.nombre, new.descripcion);
+        END
+        """,
+        "INSERT INTO productos_fts (productos_fts) VALUES ('rebuild')",
+    ],
+    # 4: resúmenes para los reportes, mantenidos por triggers: totales por
+    # categoría y cantidad de productos por rango de precio (0, 1-9, 10-99,
+    # ...; el rango es la cantidad de dígitos del precio). Leerlos cuesta lo
+    # mismo sin importar la cantidad de productos. Índice por valor de stock
+    # para el ranking de productos.
+    [
+        """
+        CREATE TABLE IF NOT EXISTS resumen_categorias (
+            categoria_id INTEGER PRIMARY KEY REFERENCES categorias (id) ON DELETE CASCADE,
+            productos INTEGER NOT NULL DEFAULT 0,
+            unidades INTEGER NOT NULL DEFAULT 0,
+            valor INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS resumen_precios (
+            rango INTEGER PRIMARY KEY,
+            productos INTEGER NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_categorias_ai AFTER INSERT ON categorias BEGIN
+            INSERT INTO resumen_categorias (categoria_id) VALUES (new.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_productos_ai AFTER INSERT ON productos BEGIN
+            UPDATE resumen_categorias
+            SET productos = productos + 1, unidades = unidades + new.cantidad,
+                valor = valor + new.cantidad * new.precio
+            WHERE categoria_id = new.categoria_id;
+            INSERT INTO resumen_precios (rango, productos)
+            VALUES (CASE WHEN new.precio <= 0 THEN 0 ELSE length(new.precio) END, 1)
+            ON CONFLICT (rango) DO UPDATE SET productos = productos + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_productos_ad AFTER DELETE ON productos BEGIN
+            UPDATE resumen_categorias
+            SET productos = productos - 1, unidades = unidades - old.cantidad,
+                valor = valor - old.cantidad * old.precio
+            WHERE categoria_id = old.categoria_id;
+            UPDATE resumen_precios SET productos = productos - 1
+            WHERE rango = CASE WHEN old.precio <= 0 THEN 0 ELSE length(old.precio) END;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_productos_au AFTER UPDATE OF cantidad, precio, categoria_id ON productos BEGIN
+            UPDATE resumen_categorias
+            SET productos = productos - 1, unidades = unidades - old.cantidad,
+                valor = valor - old.cantidad * old.precio
+            WHERE categoria_id = old.categoria_id;
+            UPDATE resumen_categorias
+            SET productos = productos + 1, unidades = unidades + new.cantidad,
+                valor = valor + new.cantidad * new.precio
+            WHERE categoria_id = new.categoria_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS resumen_precios_au AFTER UPDATE OF precio ON productos
+        WHEN old.precio IS NOT new.precio BEGIN
+            UPDATE resumen_precios SET productos = productos - 1
+            WHERE rango = CASE WHEN old.precio <= 0 THEN 0 ELSE length(old.precio) END;
+            INSERT INTO resumen_precios (rango, productos)
+            VALUES (CASE WHEN new.precio <= 0 THEN 0 ELSE length(new.precio) END, 1)
+            ON CONFLICT (rango) DO UPDATE SET productos = productos + 1;
+        END
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_productos_valor ON productos (cantidad * precio DESC, id)",
+        *SQL_RECALCULAR_RESUMENES,
+    ],
+    # 5: libro de movimientos de stock (solo se agregan filas) y cortes
+    # periódicos del saldo de cada producto. productos.cantidad es el saldo
+    # actual: las funciones de este módulo que lo cambian registran el
+    # movimiento en la misma transacción, y el stock inicial de cada alta lo
+    # registra un trigger. El stock existente entra como 'Saldo inicial'.
+    # Las fechas son segundos Unix (UTC).
+    [
+        """
+        CREATE TABLE IF NOT EXISTS movimientos (
+            id INTEGER PRIMARY KEY,
+            producto_id INTEGER NOT NULL REFERENCES productos (id) ON DELETE CASCADE,
+            delta INTEGER NOT NULL,
+            motivo TEXT NOT NULL,
+            fecha INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_movimientos_producto ON movimientos (producto_id, id)",
+        """
+        CREATE TABLE IF NOT EXISTS cortes_stock (
+            producto_id INTEGER NOT NULL REFERENCES productos (id) ON DELETE CASCADE,
+            movimiento_id INTEGER NOT NULL,
+            fecha INTEGER NOT NULL,
+            cantidad INTEGER NOT NULL,
+            PRIMARY KEY (producto_id, movimiento_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_cortes_stock_movimiento ON cortes_stock (movimiento_id)",
+        """
+        CREATE TRIGGER IF NOT EXISTS movimientos_bu BEFORE UPDATE ON movimientos BEGIN
+            SELECT RAISE(ABORT, 'Los movimientos de stock no se pueden modificar');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS movimientos_alta_ai AFTER INSERT ON productos
+        WHEN new.cantidad <> 0 BEGIN
+            INSERT INTO movimientos (producto_id, delta, motivo, fecha)
+            VALUES (new.id, new.cantidad, 'Alta', CAST(strftime('%s', 'now') AS INTEGER));
+        END
+        """,
+        """
+        INSERT INTO movimientos (producto_id, delta, motivo, fecha)
+        SELECT id, cantidad, 'Saldo inicial', CAST(strftime('%s', 'now') AS INTEGER)
+        FROM productos WHERE cantidad <> 0 ORDER BY id
+        """,
+    ],
+    # 6: registro de depósitos. El stock de cada depósito vive en su propio
+    # archivo (ver ESQUEMA_DEPOSITO); productos.cantidad es el del depósito
+    # central, guardado en este archivo.
+    [
+        """
+        CREATE TABLE IF NOT EXISTS depositos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL UNIQUE,
+            archivo TEXT NOT NULL UNIQUE
+        )
+        """,
+    ],
+    # 7: registro de cambios (CDC) de productos y categorías para la
+    # sincronización incremental. Cada alta, modificación o baja agrega una
+    # fila con una secuencia creciente (AUTOINCREMENT: no se reutiliza aunque
+    # se borren filas al compactar). Solo se guarda qué fila cambió; los
+    # datos se leen de la tabla al consultar. Lo ya existente entra como alta.
+    [
+        """
+        CREATE TABLE IF NOT EXISTS cambios (
+            secuencia INTEGER PRIMARY KEY AUTOINCREMENT,
+            tabla TEXT NOT NULL,
+            fila_id INTEGER NOT NULL,
+            operacion TEXT NOT NULL CHECK (operacion IN ('A', 'M', 'B'))
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_cambios_fila ON cambios (tabla, fila_id, secuencia)",
+        """
+        CREATE TABLE IF NOT EXISTS cambios_purgados (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            hasta INTEGER NOT NULL
+        )
+        """,
+        "INSERT OR IGNORE INTO cambios_purgados (id, hasta) VALUES (1, 0)",
+        """
+        CREATE TRIGGER IF NOT EXISTS cambios_productos_ai AFTER INSERT ON productos BEGIN
+            INSERT INTO cambios (tabla, fila_id, operacion) VALUES ('productos', new.id, 'A');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS cambios_productos_au AFTER UPDATE ON productos
+        WHEN old.nombre IS NOT new.nombre OR old.descripcion IS NOT new.descripcion
+            OR old.cantidad IS NOT new.cantidad OR old.precio IS NOT new.precio
+            OR old.categoria_id IS NOT new.categoria_id BEGIN
+            INSERT INTO cambios (tabla, fila_id, operacion) VALUES ('productos', new.id, 'M');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS cambios_productos_ad AFTER DELETE ON productos BEGIN
+            INSERT INTO cambios (tabla, fila_id, operacion) VALUES ('productos', old.id, 'B');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS cambios_categorias_ai AFTER INSERT ON categorias BEGIN
+            INSERT INTO cambios (tabla, fila_id, operacion) VALUES ('categorias', new.id, 'A');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS cambios_categorias_au AFTER UPDATE ON categorias
+        WHEN old.nombre IS NOT new.nombre BEGIN
+            INSERT INTO cambios (tabla, fila_id, operacion) VALUES ('categorias', new.id, 'M');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS cambios_categorias_ad AFTER DELETE ON categorias BEGIN
+            INSERT INTO cambios (tabla, fila_id, operacion) VALUES ('categorias', old.id, 'B');
+        END
+        """,
+        "INSERT INTO cambios (tabla, fila_id, operacion) SELECT 'categorias', id, 'A' FROM categorias ORDER BY id",
+        "INSERT INTO cambios (tabla, fila_id, operacion) SELECT 'productos', id, 'A' FROM productos ORDER BY id",
+    ],
+    # 8: umbrales de reposición por producto y por categoría (el del
+    # producto tiene prioridad). umbrales_version cambia con cualquier
+    # modificación de los umbrales, para que quien vigila el stock sepa
+    # cuándo recalcular todo.
+    [
+        """
+        CREATE TABLE IF NOT EXISTS umbrales_producto (
+            producto_id INTEGER PRIMARY KEY REFERENCES productos (id) ON DELETE CASCADE,
+            minimo INTEGER NOT NULL CHECK (minimo >= 0)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS umbrales_categoria (
+            categoria_id INTEGER PRIMARY KEY REFERENCES categorias (id) ON DELETE CASCADE,
+            minimo INTEGER NOT NULL CHECK (minimo >= 0)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS umbrales_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+        """,
+        "INSERT OR IGNORE INTO umbrales_version (id, version) VALUES (1, 0)",
+        *(f"""
+        CREATE TRIGGER IF NOT EXISTS {tabla}_{sufijo} AFTER {evento} ON {tabla} BEGIN
+            UPDATE umbrales_version SET version = version + 1;
+        END
+        """ for tabla in ("umbrales_producto", "umbrales_categoria")
+          for sufijo, evento in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))),
+    ],
+    # 9: el libro de movimientos sobrevive a la baja de un producto. Se
+    # rehacen movimientos y cortes_stock sin la clave foránea en cascada
+    # (borraba todo el historial del producto); la baja registra un
+    # movimiento 'Baja' que lleva el saldo a 0, y el libro ya no admite
+    # borrados además de modificaciones.
+    [
+        # Los triggers que nombran a movimientos se rehacen al final: al
+        # renombrar la tabla nueva, SQLite revisa los que quedan en el esquema.
+        "DROP TRIGGER IF EXISTS movimientos_bu",
+        "DROP TRIGGER IF EXISTS movimientos_alta_ai",
+        """
+        CREATE TABLE movimientos_nueva (
+            id INTEGER PRIMARY KEY,
+            producto_id INTEGER NOT NULL,
+            delta INTEGER NOT NULL,
+            motivo TEXT NOT NULL,
+            fecha INTEGER NOT NULL
+        )
+        """,
+        "INSERT INTO movimientos_nueva (id, producto_id, delta, motivo, fecha) "
+        "SELECT id, producto_id, delta, motivo, fecha FROM movimientos",
+        "DROP TABLE movimientos",
+        "ALTER TABLE movimientos_nueva RENAME TO movimientos",
+        "CREATE INDEX IF NOT EXISTS idx_movimientos_producto ON movimientos (producto_id, id)",
+        """
+        CREATE TABLE cortes_stock_nueva (
+            producto_id INTEGER NOT NULL,
+            movimiento_id INTEGER NOT NULL,
+            fecha INTEGER NOT NULL,
+            cantidad INTEGER NOT NULL,
+            PRIMARY KEY (producto_id, movimiento_id)
+        ) WITHOUT ROWID
+        """,
+        "INSERT INTO cortes_stock_nueva SELECT producto_id, movimiento_id, fecha, cantidad FROM cortes_stock",
+        "DROP TABLE cortes_stock",
+        "ALTER TABLE cortes_stock_nueva RENAME TO cortes_stock",
+        "CREATE INDEX IF NOT EXISTS idx_cortes_stock_movimiento ON cortes_stock (movimiento_id)",
+        """
+        CREATE TRIGGER IF NOT EXISTS movimientos_bu BEFORE UPDATE ON movimientos BEGIN
+            SELECT RAISE(ABORT, 'Los movimientos de stock no se pueden modificar');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS movimientos_bd BEFORE DELETE ON movimientos BEGIN
+            SELECT RAISE(ABORT, 'Los movimientos de stock no se pueden borrar');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS movimientos_alta_ai AFTER INSERT ON productos
+        WHEN new.cantidad <> 0 BEGIN
+            INSERT INTO movimientos (producto_id, delta, motivo, fecha)
+            VALUES (new.id, new.cantidad, 'Alta', CAST(strftime('%s', 'now') AS INTEGER));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS movimientos_baja_ad AFTER DELETE ON productos
+        WHEN old.cantidad <> 0 BEGIN
+            INSERT INTO movimientos (producto_id, delta, motivo, fecha)
+            VALUES (old.id, -old.cantidad, 'Baja', CAST(strftime('%s', 'now') AS INTEGER));
+        END
+        """,
+    ],
+]
+
+# Esquema de cada archivo de depósito. No tiene claves foráneas hacia
+# productos (SQLite no las admite entre archivos): los IDs se validan contra
+# el catálogo al escribir. Un producto sin fila no se maneja en ese depósito.
+ESQUEMA_DEPOSITO = [
+    """
+    CREATE TABLE IF NOT EXISTS stock (
+        producto_id INTEGER PRIMARY KEY,
+        cantidad INTEGER NOT NULL CHECK (cantidad >= 0)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_stock_cantidad ON stock (cantidad, producto_id)",
+    """
+    CREATE TABLE IF NOT EXISTS movimientos (
+        id INTEGER PRIMARY KEY,
+        producto_id INTEGER NOT NULL,
+        delta INTEGER NOT NULL,
+        motivo TEXT NOT NULL,
+        fecha INTEGER NOT NULL
+    )
+    """,
+]
+
+def version_esquema_db():
+    """Retorna la versión del esquema guardada en la base de datos.
+    Args: no tiene
+    Returns: int: El valor de PRAGMA user_version (0 si la base es nueva).
+    """
+    conn = obtener_conexion()
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def inicializar_db():
+    """Crea o actualiza el esquema de la base de datos.
+    Aplica, en orden y cada una en su propia transacción, las migraciones
+    de MIGRACIONES que todavía no se aplicaron según PRAGMA user_version.
+    args: no tiene
+    Returns: no tiene  
+    """
+    conn = obtener_conexion()
+    version_objetivo = len(MIGRACIONES)
+    if version_esquema_db() >= version_objetivo:
+        return
+
+    for version in range(1, version_objetivo + 1):
+        # BEGIN IMMEDIATE toma el bloqueo de escritura: si otro proceso
+        # migra al mismo tiempo, se espera y se vuelve a leer la versión.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version_esquema_db() >= version:
+                conn.rollback()
+                continue
+            for sentencia in MIGRACIONES[version - 1]:
+                conn.execute(sentencia)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+    conn.execute("PRAGMA optimize")
 
 def contar_categorias_db():
     """Cuenta el número total de categorías en la base de datos.
@@ -59,25 +880,28 @@ def contar_categorias_db():
     return: El número total de categorías.
     
     """
-    conn = obtener_conexion()
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM categorias")
-    total = cursor.fetchone()[0]
-    conn.close()
-    return total
+    def consultar():
+        conn = obtener_conexion()
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM categorias")
+        return cursor.fetchone()[0]
+
+    return _leer_cache(("contar_categorias",), consultar)
 
 def obtener_categorias_db():
     """Recupera todas las categorías de la base de datos, ordenadas por Id.
     args: no tiene
-    return: Una lista de tuplas, donde cada tupla es (id, nombre).
+    return: Una lista de modelos.Categoria (id, nombre).
      
     """
-    conn = obtener_conexion()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, nombre FROM categorias ORDER BY id")
-    categorias = cursor.fetchall()
-    conn.close()
-    return categorias
+    def consultar():
+        conn = obtener_conexion()
+        cursor = conn.cursor()
+        cursor.row_factory = modelos.fabrica_categoria
+        cursor.execute("SELECT id, nombre FROM categorias ORDER BY id")
+        return tuple(cursor.fetchall())
+
+    return list(_leer_cache(("categorias",), consultar))
 
 def agregar_categoria_db(nombre):
     """Agrega una nueva categoría a la base de datos.
@@ -92,12 +916,11 @@ def agregar_categoria_db(nombre):
     return: El ID de la categoría recién creada.
      
     """
-    conn = obtener_conexion()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO categorias (nombre) VALUES (?)", (nombre,))
-    nuevo_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with transaccion() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT INTO categorias (nombre) VALUES (?)", (nombre,))
+        nuevo_id = cursor.lastrowid
+    invalidar_cache(("categorias",), ("contar_categorias",))
     return nuevo_id
 
 def modificar_categoria_db(id_cat, nuevo_nombre):
@@ -112,11 +935,11 @@ def modificar_categoria_db(id_cat, nuevo_nombre):
     
     return: no tiene
     """
-    conn = obtener_conexion()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE categorias SET nombre = ? WHERE id = ?", (nuevo_nombre, id_cat))
-    conn.commit()
-    conn.close()
+    with transaccion() as conn:
+        cursor = conn.cursor()
+        cursor.execute("UPDATE categorias SET nombre = ? WHERE id = ?", (nuevo_nombre, id_cat))
+    # El nombre de la categoría también forma parte de cada producto cacheado.
+    invalidar_cache()
 
 def contar_productos_en_categoria_db(id_cat):
     """Cuenta el número de productos asociados a una categoría específica.
@@ -127,9 +950,8 @@ def contar_productos_en_categoria_db(id_cat):
     """
     conn = obtener_conexion()
     cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM productos WHERE categoria_id = ?", (id_cat,))
+    cursor.execute(SQL_CONTAR_EN_CATEGORIA, (id_cat,))
     total = cursor.fetchone()[0]
-    conn.close()
     return total
 
 def eliminar_categoria_db(id_cat):
@@ -137,30 +959,30 @@ def eliminar_categoria_db(id_cat):
     Valida que la categoría no tenga productos asociados antes de eliminarla.
     args: id_cat (int): El ID de la categoría a eliminar.
     """
-    conn = obtener_conexion()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM categorias WHERE id = ?", (id_cat,))
-    conn.commit()
-    conn.close()
+    with transaccion() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM categorias WHERE id = ?", (id_cat,))
+    invalidar_cache(("categorias",), ("contar_categorias",))
+
+def _cursor_productos(reportes=False):
+    """Retorna un cursor que entrega modelos.Producto.
+    Args: reportes (bool): Si es True y el modo reportes está activo, el
+    cursor lee de la instantánea; si no, de la conexión del hilo.
+    """
+    cursor = (_conexion_lectura_reportes() if reportes else obtener_conexion()).cursor()
+    cursor.row_factory = modelos.fabrica_producto
+    return cursor
 
 def obtener_productos_db():
     """Recupera todos los productos con sus detalles y nombre de categoría.
     args: no tiene
-    return: Lista de tuplas. Formato de cada tupla:
-    (id, nombre, descripcion, cantidad, precio, nombre_categoria).
-     
+    return: Lista de modelos.Producto
+    (id, nombre, descripcion, cantidad, precio, categoria).
+    Con el modo reportes activo, lee de la instantánea (ver activar_modo_reportes).
     """
-    conn = obtener_conexion()
-    cursor = conn.cursor()
-    sql = """
-        SELECT p.id, p.nombre, p.descripcion, p.cantidad, p.precio, c.nombre
-        FROM productos p
-        JOIN categorias c ON p.categoria_id = c.id
-        ORDER BY p.nombre
-    """
-    cursor.execute(sql)
+    cursor = _cursor_productos(reportes=True)
+    cursor.execute(SQL_PRODUCTOS)
     productos = cursor.fetchall()
-    conn.close()
     return productos
 
 def agregar_producto_db(nombre, descripcion, cantidad, precio, cat_id):
@@ -177,42 +999,65 @@ def agregar_producto_db(nombre, descripcion, cantidad, precio, cat_id):
     
     Levanta un error sqlite3.IntegrityError: Si el nombre del producto ya existe.
     
-    return: no tiene      
+    return: El ID del producto recién creado.
      
+    """
+    with transaccion() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO productos (nombre, descripcion, cantidad, precio, categoria_id) VALUES (?, ?, ?, ?, ?)",
+            (nombre, descripcion, cantidad, precio, cat_id)
+        )
+    return cursor.lastrowid
+
+def agregar_productos_bulk_db(filas, tamano_lote=5000):
+    """Agrega muchos productos en transacciones por lotes.
+    Consume el iterable de a `tamano_lote` filas e inserta cada lote con un
+    único executemany y un único commit, sin cargar todas las filas en memoria.
+    Si un lote falla, se revierte completo y se propaga el error.
+
+    Args: 
+    filas (iterable): Tuplas (nombre, descripcion, cantidad, precio, cat_id).
+    tamano_lote (int): Cantidad de filas por transacción.
+
+    Levanta un error sqlite3.IntegrityError: Si alguna fila viola una restricción.
+
+    return: La cantidad de productos insertados.
     """
     conn = obtener_conexion()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO productos (nombre, descripcion, cantidad, precio, categoria_id) VALUES (?, ?, ?, ?, ?)",
-        (nombre, descripcion, cantidad, precio, cat_id)
-    )
-    conn.commit()
-    conn.close()
+    iterador = iter(filas)
+    total = 0
+    while True:
+        lote = list(itertools.islice(iterador, tamano_lote))
+        if not lote:
+            break
+        with transaccion():
+            conn.executemany(
+                "INSERT INTO productos (nombre, descripcion, cantidad, precio, categoria_id) VALUES (?, ?, ?, ?, ?)",
+                lote
+            )
+        total += len(lote)
+    return total
 
 def obtener_producto_por_id_db(id_prod):
     """Recupera un único producto por su ID.
     Args: 
     id_prod (int): El ID del producto a buscar.
     
-    return: Una tupla con los datos del producto, o None si no se encuentra.
-    Formato: (id, nombre, desc, cant, precio, nombre_cat).
+    return: Un modelos.Producto con los datos del producto, o None si no se encuentra.
      
     """
-    conn = obtener_conexion()
-    cursor = conn.cursor()
-    sql = """
-        SELECT p.id, p.nombre, p.descripcion, p.cantidad, p.precio, c.nombre
-        FROM productos p
-        JOIN categorias c ON p.categoria_id = c.id
-        WHERE p.id = ?
-    """
-    cursor.execute(sql, (id_prod,))
-    resultado = cursor.fetchone()
-    conn.close()
-    return resultado
+    def consultar():
+        cursor = _cursor_productos()
+        cursor.execute(SQL_PRODUCTO_POR_ID, (id_prod,))
+        return cursor.fetchone()
+
+    return _leer_cache(("producto", id_prod), consultar)
 
 def eliminar_producto_db(id_prod):
     """Elimina un producto por su ID.
+    Su historial en el libro de movimientos se conserva: si tenía stock,
+    se registra un movimiento 'Baja' que lleva el saldo a 0.
     
     Args: 
     id_prod (int): El ID del producto a eliminar.
@@ -222,11 +1067,12 @@ def eliminar_producto_db(id_prod):
     return: no tiene
      
     """
-    conn = obtener_conexion()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM productos WHERE id = ?", (id_prod,))
-    conn.commit()
-    conn.close()
+    with transaccion() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM productos WHERE id = ?", (id_prod,))
+    invalidar_cache(("producto", id_prod))
+
+CAMPOS_MODIFICABLES = ('nombre', 'descripcion', 'cantidad', 'precio', 'categoria_id')
 
 def modificar_producto_db(id_prod, campo_a_modificar, nuevo_valor):
     """Modifica un campo específico de un producto. 
@@ -240,35 +1086,872 @@ def modificar_producto_db(id_prod, campo_a_modificar, nuevo_valor):
 
     return: no tiene
     """
-    campos_permitidos = ['nombre', 'descripcion', 'cantidad', 'precio', 'categoria_id']
-    if campo_a_modificar not in campos_permitidos:
-        raise ValueError("Campo no válido para modificar")
+    modificar_producto_campos_db(id_prod, {campo_a_modificar: nuevo_valor})
+
+def modificar_producto_campos_db(id_prod, cambios):
+    """Modifica varios campos de un producto con una sola sentencia UPDATE.
+    Si cambia la cantidad, la diferencia queda registrada como un movimiento
+    de stock con motivo MOTIVO_AJUSTE.
+    Args: 
+    id_prod (int): El ID del producto a modificar.
+    cambios (dict): Pares {campo: nuevo_valor}; los campos deben estar en CAMPOS_MODIFICABLES.
+
+    Levanta un error ValueError: Si algún campo no está en la lista permitida.
 
-    sql = f"UPDATE productos SET {campo_a_modificar} = ? WHERE id = ?"
+    return: no tiene
+    """
+    if not cambios:
+        return
+    for campo in cambios:
+        if campo not in CAMPOS_MODIFICABLES:
+            raise ValueError("Campo no válido para modificar")
+
+    asignaciones = ", ".join(f"{campo} = ?" for campo in cambios)
+    sql = f"UPDATE productos SET {asignaciones} WHERE id = ?"
+    with transaccion() as conn:
+        if 'cantidad' in cambios:
+            conn.execute(SQL_MOVIMIENTO_AJUSTE, _ajuste(id_prod, cambios['cantidad']))
+        cursor = conn.cursor()
+        cursor.execute(sql, (*cambios.values(), id_prod))
+        if 'cantidad' in cambios:
+            _cortar_stock_si_corresponde(conn)
+    invalidar_cache(("producto", id_prod))
+
+def ajustar_precios_categoria_db(id_cat, porcentaje):
+    """Ajusta el precio de todos los productos de una categoría en un porcentaje.
+    El nuevo precio se redondea al entero más cercano. Se ejecuta como una
+    única sentencia UPDATE, en una sola transacción.
+    Args: 
+    id_cat (int): El ID de la categoría.
+    porcentaje (float): El ajuste; ej: 10 sube un 10%, -5 baja un 5%.
+
+    Levanta un error ValueError: Si el porcentaje es menor a -100 (precios negativos).
+
+    return: La cantidad de productos modificados.
+    """
+    if porcentaje < -100:
+        raise ValueError("El porcentaje no puede ser menor a -100")
+
+    with transaccion() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE productos SET precio = CAST(ROUND(precio * (100 + ?) / 100.0) AS INTEGER) WHERE categoria_id = ?",
+            (porcentaje, id_cat)
+        )
+    _invalidar_productos()
+    return cursor.rowcount
+
+def actualizar_cantidades_db(pares):
+    """Actualiza la cantidad en stock de muchos productos en una sola transacción.
+    Cada diferencia queda registrada como un movimiento con motivo MOTIVO_AJUSTE.
+    Args: 
+    pares (iterable): Tuplas (id_prod, nueva_cantidad). Si un ID se repite,
+    vale la última cantidad.
+
+    Levanta un error ValueError: Si alguna cantidad es negativa; en ese caso no se modifica nada.
+
+    return: La cantidad de productos modificados (los IDs inexistentes se ignoran).
+    """
+    # Una sola cantidad por ID: los movimientos se calculan todos contra el
+    # stock previo al lote, así que un ID repetido dejaría el libro desfasado.
+    valores = [(cantidad, id_prod) for id_prod, cantidad in dict(pares).items()]
+    if any(cantidad < 0 for cantidad, _ in valores):
+        raise ValueError("La cantidad no puede ser negativa")
+
+    with transaccion() as conn:
+        conn.executemany(SQL_MOVIMIENTO_AJUSTE, (_ajuste(id_prod, cantidad) for cantidad, id_prod in valores))
+        cursor = conn.cursor()
+        cursor.executemany("UPDATE productos SET cantidad = ? WHERE id = ?", valores)
+        _cortar_stock_si_corresponde(conn)
+    invalidar_cache(*(("producto", id_prod) for _, id_prod in valores))
+    return cursor.rowcount
+
+def _ajuste(id_prod, cantidad):
+    """Parámetros de SQL_MOVIMIENTO_AJUSTE para llevar un producto a `cantidad`."""
+    return {"id": id_prod, "cantidad": cantidad, "motivo": MOTIVO_AJUSTE, "fecha": int(time.time())}
+
+def registrar_movimientos_db(movimientos, tamano_lote=5000):
+    """Registra entradas y salidas de stock en el libro de movimientos.
+    Consume el iterable de a `tamano_lote` movimientos; cada lote se agrega
+    con un único executemany y actualiza productos.cantidad en la misma
+    transacción. Si un lote falla, se revierte completo y se propaga el error.
+
+    Args:
+    movimientos (iterable): Tuplas (id_prod, delta, motivo); delta es
+    positivo para una entrada y negativo para una salida.
+    tamano_lote (int): Cantidad de movimientos por transacción.
+
+    Levanta un error ValueError: Si un producto no existe o quedaría con stock negativo.
+
+    return: La cantidad de movimientos registrados.
+    """
     conn = obtener_conexion()
-    cursor = conn.cursor()
-    cursor.execute(sql, (nuevo_valor, id_prod))
-    conn.commit()
-    conn.close()
+    iterador = iter(movimientos)
+    total = 0
+    while True:
+        lote = list(itertools.islice(iterador, tamano_lote))
+        if not lote:
+            break
+        fecha = int(time.time())
+        with transaccion():
+            cursor = conn.cursor()
+            cursor.executemany(
+                "UPDATE productos SET cantidad = cantidad + ?1 WHERE id = ?2 AND cantidad + ?1 >= 0",
+                ((delta, id_prod) for id_prod, delta, _ in lote)
+            )
+            if cursor.rowcount < len(lote):
+                raise ValueError("Hay productos inexistentes o sin stock suficiente en el lote")
+            conn.executemany(
+                "INSERT INTO movimientos (producto_id, delta, motivo, fecha) VALUES (?, ?, ?, ?)",
+                ((id_prod, delta, motivo, fecha) for id_prod, delta, motivo in lote)
+            )
+            _cortar_stock_si_corresponde(conn)
+        invalidar_cache(*(("producto", id_prod) for id_prod, _, _ in lote))
+        total += len(lote)
+    return total
+
+class StockInsuficienteError(ValueError):
+    """Un pedido pide más unidades de las disponibles (o productos inexistentes).
+    `faltantes` es una lista de tuplas (id_prod, pedido, disponible); disponible
+    es None si el producto no existe."""
+    def __init__(self, faltantes):
+        self.faltantes = faltantes
+        detalle = ", ".join(f"ID {id_prod}: pedido {pedido}, disponible {disponible if disponible is not None else 'inexistente'}"
+                            for id_prod, pedido, disponible in faltantes)
+        super().__init__(f"Stock insuficiente ({detalle})")
+
+def _reintentar_si_bloqueada(funcion):
+    """Decorador: repite la función si la base sigue bloqueada por otro proceso.
+    Solo reintenta cuando no hay una transacción exterior abierta; dentro de
+    un `with transaccion():` el error se propaga para que lo maneje quien la abrió.
+    """
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        for intento in range(REINTENTOS_BLOQUEO + 1):
+            try:
+                return funcion(*args, **kwargs)
+            except sqlite3.OperationalError as error:
+                bloqueada = "locked" in str(error) or "busy" in str(error)
+                if not bloqueada or intento == REINTENTOS_BLOQUEO or getattr(_local, "profundidad", 0):
+                    raise
+                time.sleep(ESPERA_BLOQUEO_S * 2 ** intento * random.uniform(0.5, 1.5))
+    return envoltura
+
+@_reintentar_si_bloqueada
+def registrar_pedido_db(lineas, motivo=MOTIVO_VENTA):
+    """Descuenta el stock de todas las líneas de un pedido, o de ninguna.
+    Cada línea es un único UPDATE condicional (cantidad >= pedido), de modo
+    que dos ventas simultáneas del mismo producto nunca pisan el valor de la
+    otra ni dejan stock negativo, aunque vengan de procesos distintos. Todas
+    las líneas van en una sola transacción y quedan en el libro de movimientos.
+
+    Args:
+    lineas (iterable): Tuplas (id_prod, cantidad); un mismo producto puede repetirse.
+    motivo (str): Motivo de los movimientos, ej: 'Venta' o 'Reserva pedido 12'.
+
+    Levanta un error ValueError: Si alguna cantidad no es positiva.
+    Levanta un error StockInsuficienteError: Si alguna línea no puede cumplirse; no se descuenta nada.
+
+    return: Lista con el stock que quedó de cada línea, en el mismo orden.
+    """
+    lineas = list(lineas)
+    if any(cantidad <= 0 for _, cantidad in lineas):
+        raise ValueError("La cantidad pedida debe ser mayor a cero")
+
+    fecha = int(time.time())
+    with transaccion() as conn:
+        saldos = []
+        faltantes = []
+        for id_prod, cantidad in lineas:
+            cursor = conn.execute(
+                "UPDATE productos SET cantidad = cantidad - ?1 WHERE id = ?2 AND cantidad >= ?1",
+                (cantidad, id_prod)
+            )
+            fila = conn.execute("SELECT cantidad FROM productos WHERE id = ?", (id_prod,)).fetchone()
+            if cursor.rowcount == 0:
+                faltantes.append((id_prod, cantidad, fila[0] if fila else None))
+            else:
+                saldos.append(fila[0])
+        if faltantes:
+            raise StockInsuficienteError(faltantes)
+        conn.executemany(
+            "INSERT INTO movimientos (producto_id, delta, motivo, fecha) VALUES (?, ?, ?, ?)",
+            ((id_prod, -cantidad, motivo, fecha) for id_prod, cantidad in lineas)
+        )
+        _cortar_stock_si_corresponde(conn)
+    invalidar_cache(*(("producto", id_prod) for id_prod, _ in lineas))
+    return saldos
+
+def descontar_stock_db(id_prod, cantidad, motivo=MOTIVO_VENTA):
+    """Descuenta unidades de un producto si hay stock suficiente (ver registrar_pedido_db).
+    Args:
+    id_prod (int): El ID del producto.
+    cantidad (int): Unidades a descontar; debe ser mayor a cero.
+    motivo (str): Motivo del movimiento.
+
+    Levanta un error StockInsuficienteError: Si no hay stock suficiente o el producto no existe.
+
+    return: int: El stock que quedó.
+    """
+    return registrar_pedido_db([(id_prod, cantidad)], motivo)[0]
+
+def _cortar_stock_si_corresponde(conn):
+    """Genera cortes de stock si desde el último se acumularon CORTE_CADA_MOVIMIENTOS
+    movimientos. Debe llamarse dentro de una transacción de escritura.
+    Returns: no tiene
+    """
+    ultimo = conn.execute("SELECT COALESCE(MAX(id), 0) FROM movimientos").fetchone()[0]
+    cortado = conn.execute("SELECT COALESCE(MAX(movimiento_id), 0) FROM cortes_stock").fetchone()[0]
+    if ultimo - cortado >= CORTE_CADA_MOVIMIENTOS:
+        conn.execute(SQL_GENERAR_CORTES, (cortado,))
+
+def generar_cortes_stock_db():
+    """Guarda el saldo actual de cada producto que tuvo movimientos desde el último corte.
+    Las consultas de stock a una fecha parten del último corte anterior a
+    esa fecha, de modo que solo suman los movimientos posteriores a él.
+    Se ejecuta sola cada CORTE_CADA_MOVIMIENTOS movimientos.
+    Args: no tiene
+    Returns: La cantidad de productos cortados.
+    """
+    with transaccion() as conn:
+        cortado = conn.execute("SELECT COALESCE(MAX(movimiento_id), 0) FROM cortes_stock").fetchone()[0]
+        cursor = conn.execute(SQL_GENERAR_CORTES, (cortado,))
+    return cursor.rowcount
+
+def stock_a_fecha_db(id_prod, fecha):
+    """Calcula el stock que tenía un producto en un momento dado.
+    Args:
+    id_prod (int): El ID del producto.
+    fecha (int): Segundos Unix; se incluyen los movimientos de ese instante.
+    Returns: int: El saldo a esa fecha (0 si no había movimientos).
+    """
+    conn = obtener_conexion()
+    return conn.execute(SQL_STOCK_A_FECHA, {"id": id_prod, "fecha": fecha}).fetchone()[0]
+
+def kardex_producto_db(id_prod, limite=TAMANO_PAGINA):
+    """Recupera los últimos movimientos de un producto con el saldo después de cada uno.
+    Args:
+    id_prod (int): El ID del producto.
+    limite (int): Cantidad máxima de movimientos (los más recientes).
+    Returns: Lista de modelos.Movimiento (id, fecha, motivo, delta, saldo), del más antiguo al más reciente.
+    """
+    cursor = obtener_conexion().cursor()
+    cursor.row_factory = modelos.fabrica_movimiento
+    cursor.execute(SQL_KARDEX, {"id": id_prod, "limite": limite})
+    return cursor.fetchall()
 
 def obtener_productos_por_stock_db(limite):
     """Recupera productos cuya cantidad sea menor o igual a un límite.
     Args: limite: El número máximo de stock para el filtro.
  
-    return: Lista de productos con stock bajo. 
-    Formato de cada tupla:(id, nombre, descripcion, cantidad, precio, nombre_categoria).
-        
+    return: Lista de modelos.Producto con stock bajo, ordenada por cantidad.
+    Con el modo reportes activo, lee de la instantánea (ver activar_modo_reportes).
+    """
+    cursor = _cursor_productos(reportes=True)
+    cursor.execute(SQL_PRODUCTOS_POR_STOCK, (limite,))
+    productos = cursor.fetchall()
+    return productos
+
+class CursorVencidoError(ValueError):
+    """El cursor de sincronización es anterior a la última purga del registro de cambios.
+    Quien sincroniza debe volver a leer todo desde obtener_cambios_db(0).
+    """
+
+def ultima_secuencia_cambios_db():
+    """Retorna la secuencia del último cambio registrado (0 si no hay ninguno).
+    Args: no tiene
+    Returns: int
+    """
+    fila = obtener_conexion().execute("SELECT seq FROM sqlite_sequence WHERE name = 'cambios'").fetchone()
+    return fila[0] if fila else 0
+
+def obtener_cambios_db(desde=0, limite=1000):
+    """Recupera los productos y categorías que cambiaron después de un cursor.
+    Cada fila aparece una sola vez, con su último cambio y sus datos
+    actuales, aunque haya cambiado varias veces: el costo depende de cuántas
+    filas cambiaron y no del tamaño del catálogo. Con desde=0 se recorre el
+    catálogo completo (todo lo existente figura como alta).
+
+    Args:
+    desde (int): El cursor: la secuencia devuelta por la llamada anterior, o 0.
+    limite (int): Máximo de filas por llamada.
+
+    Levanta un error CursorVencidoError: Si `desde` (distinto de 0) es
+    anterior a la última purga de bajas (compactar_cambios_db con
+    purgar_hasta): ese cursor podría no enterarse de alguna baja. Desde 0
+    se reconstruye la copia completa y las bajas no hacen falta.
+
+    return: Tupla (cambios, cursor): una lista de modelos.Cambio ordenada
+    por secuencia y el cursor para la próxima llamada (igual a `desde` si no
+    hubo cambios). Si operacion es 'B', o fila es None, la fila ya no
+    existe; si no, fila es el modelos.Producto o modelos.Categoria actual.
     """
     conn = obtener_conexion()
-    cursor = conn.cursor()
-    sql = """
-        SELECT p.id, p.nombre, p.descripcion, p.cantidad, p.precio, c.nombre
-        FROM productos p
-        JOIN categorias c ON p.categoria_id = c.id
-        WHERE p.cantidad <= ?
-        ORDER BY p.cantidad ASC
+    filas = conn.execute(SQL_CAMBIOS_DESDE, (desde, limite)).fetchall()
+    # La purga se verifica después de leer: si una purga llegó antes de la
+    # consulta, se ve aquí; si llegó después, la consulta ya estaba completa.
+    purgado_hasta = conn.execute("SELECT hasta FROM cambios_purgados").fetchone()[0]
+    if 0 < desde < purgado_hasta:
+        raise CursorVencidoError(f"El cursor {desde} es anterior a la purga del registro de cambios "
+                                 f"(hasta {purgado_hasta}); hay que sincronizar desde 0")
+    cambios = []
+    for secuencia, tabla, fila_id, operacion, *producto, id_cat, nombre_cat in filas:
+        if tabla == "productos":
+            fila = None if producto[0] is None else modelos.fabrica_producto(None, producto)
+        else:
+            fila = None if id_cat is None else modelos.Categoria(id_cat, nombre_cat)
+        cambios.append(modelos.Cambio(secuencia, tabla, fila_id, operacion, fila))
+    return cambios, (cambios[-1].secuencia if cambios else desde)
+
+def compactar_cambios_db(purgar_hasta=None):
+    """Compacta el registro de cambios.
+    Deja solo el último cambio de cada fila, lo que no altera lo que
+    devuelve obtener_cambios_db para ningún cursor: el registro queda con a
+    lo sumo una entrada por fila existente más las bajas. Opcionalmente
+    borra además las bajas hasta una secuencia que ya leyeron todos los que
+    sincronizan; los cursores anteriores a ella quedan vencidos.
+    Args: purgar_hasta (int): Secuencia hasta la que se purgan las bajas (inclusive), o None.
+    Returns: La cantidad de entradas borradas.
     """
-    cursor.execute(sql, (limite,))
-    productos = cursor.fetchall()
-    conn.close()
-    return productos
\ No newline at end of file
+    with transaccion() as conn:
+        borradas = conn.execute(SQL_COMPACTAR_CAMBIOS).rowcount
+        if purgar_hasta is not None:
+            borradas += conn.execute("DELETE FROM cambios WHERE operacion = 'B' AND secuencia <= ?",
+                                     (purgar_hasta,)).rowcount
+            conn.execute("UPDATE cambios_purgados SET hasta = MAX(hasta, ?)", (purgar_hasta,))
+    return borradas
+
+# Productos con cantidad menor o igual a su umbral de reposición: el del
+# producto, si no el de su categoría, si no :defecto (NULL: sin umbral).
+SQL_BAJO_UMBRAL = """
+    SELECT p.id, p.nombre, p.descripcion, p.cantidad, p.precio, c.nombre,
+           COALESCE(up.minimo, uc.minimo, :defecto) AS umbral
+    FROM productos p
+    JOIN categorias c ON c.id = p.categoria_id
+    LEFT JOIN umbrales_producto up ON up.producto_id = p.id
+    LEFT JOIN umbrales_categoria uc ON uc.categoria_id = p.categoria_id
+    WHERE p.cantidad <= COALESCE(up.minimo, uc.minimo, :defecto)
+"""
+
+def fijar_umbral_producto_db(id_prod, minimo):
+    """Fija el umbral de reposición de un producto.
+    Args:
+    id_prod (int): El ID del producto.
+    minimo (int): Cantidad a partir de la cual (inclusive) el stock es bajo;
+    None para quitar el umbral propio y usar el de la categoría.
+    Returns: no tiene
+    """
+    with transaccion() as conn:
+        if minimo is None:
+            conn.execute("DELETE FROM umbrales_producto WHERE producto_id = ?", (id_prod,))
+        else:
+            conn.execute("INSERT INTO umbrales_producto (producto_id, minimo) VALUES (?, ?) "
+                         "ON CONFLICT (producto_id) DO UPDATE SET minimo = excluded.minimo", (id_prod, minimo))
+
+def fijar_umbral_categoria_db(id_cat, minimo):
+    """Fija el umbral de reposición de los productos de una categoría que no tienen uno propio.
+    Args:
+    id_cat (int): El ID de la categoría.
+    minimo (int): El umbral; None para quitarlo.
+    Returns: no tiene
+    """
+    with transaccion() as conn:
+        if minimo is None:
+            conn.execute("DELETE FROM umbrales_categoria WHERE categoria_id = ?", (id_cat,))
+        else:
+            conn.execute("INSERT INTO umbrales_categoria (categoria_id, minimo) VALUES (?, ?) "
+                         "ON CONFLICT (categoria_id) DO UPDATE SET minimo = excluded.minimo", (id_cat, minimo))
+
+def version_umbrales_db():
+    """Retorna un número que cambia cada vez que se modifica algún umbral de reposición.
+    Args: no tiene
+    Returns: int
+    """
+    return obtener_conexion().execute("SELECT version FROM umbrales_version").fetchone()[0]
+
+def productos_bajo_umbral_db(defecto=None, ids=None):
+    """Recupera los productos con cantidad menor o igual a su umbral de reposición.
+    El umbral es el del producto, si no el de su categoría, si no `defecto`.
+    Args:
+    defecto (int): Umbral de los productos sin umbral propio ni de categoría;
+    None para no considerarlos.
+    ids (iterable): Si se indica, solo se evalúan esos productos.
+    Returns: Lista de modelos.BajoUmbral (producto, umbral), ordenada por ID.
+    """
+    conn = obtener_conexion()
+    if ids is None:
+        filas = conn.execute(SQL_BAJO_UMBRAL + " ORDER BY p.id", {"defecto": defecto}).fetchall()
+    else:
+        ids = sorted(set(ids))
+        filas = []
+        for inicio in range(0, len(ids), 500):
+            lote = ids[inicio:inicio + 500]
+            parametros = {"defecto": defecto, **{f"id{i}": id_prod for i, id_prod in enumerate(lote)}}
+            marcadores = ", ".join(f":id{i}" for i in range(len(lote)))
+            filas += conn.execute(SQL_BAJO_UMBRAL + f" AND p.id IN ({marcadores}) ORDER BY p.id",
+                                  parametros).fetchall()
+    return [modelos.BajoUmbral(modelos.fabrica_producto(None, fila[:6]), fila[6]) for fila in filas]
+
+NOMBRE_DEPOSITO_CENTRAL = "Central"
+# Los reportes consolidados adjuntan (ATTACH) todos los depósitos a una
+# misma conexión; SQLite admite 10 bases adjuntas por conexión por defecto.
+MAX_DEPOSITOS = 10
+
+def _ruta_deposito(archivo):
+    """Resuelve el archivo de un depósito relativo a la carpeta de DB_NAME."""
+    return os.path.join(os.path.dirname(os.path.abspath(DB_NAME)), archivo)
+
+def _conexion_deposito(archivo):
+    """Retorna la conexión del hilo actual al archivo de un depósito.
+    Cada depósito tiene su propio archivo y su propio bloqueo de escritura:
+    las escrituras de un depósito no esperan a las de los demás ni a las
+    del catálogo. La primera vez que se abre un archivo se crea su esquema.
+    Args: archivo (str): El archivo del depósito (ver obtener_depositos_db).
+    Returns: sqlite3.Connection
+    """
+    clave = (DB_NAME, _generacion)
+    if getattr(_local, "clave_depositos", None) != clave:
+        _local.depositos = {}
+        _local.clave_depositos = clave
+    conn = _local.depositos.get(archivo)
+    if conn is None:
+        conn = _crear_conexion(_ruta_deposito(archivo))
+        if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+            with conn:
+                for sentencia in ESQUEMA_DEPOSITO:
+                    conn.execute(sentencia)
+                conn.execute("PRAGMA user_version = 1")
+        _local.depositos[archivo] = conn
+        with _lock_conexiones:
+            _conexiones_abiertas.append(conn)
+    return conn
+
+def _conexion_reportes(depositos):
+    """Retorna una conexión de solo lectura al catálogo con todos los depósitos adjuntos.
+    Cada depósito queda adjunto como dep_<id>. Es una conexión aparte de la
+    del pool: una transacción de escritura sobre una conexión con bases
+    adjuntas bloquea todos esos archivos.
+    Args: depositos (list): Lista de modelos.Deposito a adjuntar.
+    Returns: sqlite3.Connection
+    """
+    clave = (DB_NAME, _generacion, tuple(depositos))
+    if getattr(_local, "clave_reportes", None) != clave:
+        anterior = getattr(_local, "reportes", None)
+        if anterior is not None and _local.clave_reportes[:2] == clave[:2]:
+            with _lock_conexiones:
+                _conexiones_abiertas.remove(anterior)
+            anterior.close()
+        conn = _crear_conexion(DB_NAME)
+        conn.execute("PRAGMA query_only = ON")
+        for deposito in depositos:
+            _conexion_deposito(deposito.archivo)  # crea el esquema si el archivo es nuevo
+            conn.execute(f"ATTACH DATABASE ? AS dep_{deposito.id}", (_ruta_deposito(deposito.archivo),))
+        _local.reportes = conn
+        _local.clave_reportes = clave
+        with _lock_conexiones:
+            _conexiones_abiertas.append(conn)
+    return _local.reportes
+
+def agregar_deposito_db(nombre, archivo=None):
+    """Registra un depósito y crea su archivo.
+    Args:
+    nombre (str): El nombre del depósito; debe ser único.
+    archivo (str): Archivo SQLite del depósito, relativo a la carpeta de la
+    base principal. Si es None se arma a partir del nombre.
+
+    Levanta un error ValueError: Si ya hay MAX_DEPOSITOS depósitos.
+    Levanta un error sqlite3.IntegrityError: Si el nombre o el archivo ya están registrados.
+
+    return: El ID del depósito creado.
+    """
+    if archivo is None:
+        archivo = "deposito_" + re.sub(r"\W+", "_", nombre.lower()).strip("_") + ".db"
+    with transaccion() as conn:
+        if conn.execute("SELECT COUNT(*) FROM depositos").fetchone()[0] >= MAX_DEPOSITOS:
+            raise ValueError(f"No se pueden registrar más de {MAX_DEPOSITOS} depósitos")
+        cursor = conn.execute("INSERT INTO depositos (nombre, archivo) VALUES (?, ?)", (nombre, archivo))
+    _conexion_deposito(archivo)
+    return cursor.lastrowid
+
+def obtener_depositos_db():
+    """Recupera los depósitos registrados (sin incluir el central).
+    Args: no tiene
+    Returns: Lista de modelos.Deposito (id, nombre, archivo), ordenada por ID.
+    """
+    cursor = obtener_conexion().cursor()
+    cursor.row_factory = modelos.fabrica_deposito
+    cursor.execute("SELECT id, nombre, archivo FROM depositos ORDER BY id")
+    return cursor.fetchall()
+
+def _obtener_deposito(id_deposito):
+    """Retorna el modelos.Deposito con ese ID o levanta ValueError si no existe."""
+    for deposito in obtener_depositos_db():
+        if deposito.id == id_deposito:
+            return deposito
+    raise ValueError(f"No existe el depósito {id_deposito}")
+
+@_reintentar_si_bloqueada
+def registrar_movimientos_deposito_db(id_deposito, movimientos):
+    """Registra entradas y salidas de stock en un depósito, todas o ninguna.
+    Solo escribe en el archivo del depósito. Las salidas son un UPDATE
+    condicional (cantidad + delta >= 0), como en registrar_pedido_db.
+
+    Args:
+    id_deposito (int): El ID del depósito.
+    movimientos (iterable): Tuplas (id_prod, delta, motivo).
+
+    Levanta un error ValueError: Si el depósito o algún producto no existe.
+    Levanta un error StockInsuficienteError: Si alguna salida supera el stock del depósito.
+
+    return: La cantidad de movimientos registrados.
+    """
+    movimientos = list(movimientos)
+    deposito = _obtener_deposito(id_deposito)
+    ids = {id_prod for id_prod, _, _ in movimientos}
+    marcadores = ",".join("?" * len(ids))
+    existentes = {fila[0] for fila in obtener_conexion().execute(
+        f"SELECT id FROM productos WHERE id IN ({marcadores})", tuple(ids))}
+    if ids - existentes:
+        raise ValueError(f"Productos inexistentes: {sorted(ids - existentes)}")
+
+    conn = _conexion_deposito(deposito.archivo)
+    fecha = int(time.time())
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        faltantes = []
+        for id_prod, delta, _ in movimientos:
+            if delta >= 0:
+                conn.execute(
+                    "INSERT INTO stock (producto_id, cantidad) VALUES (?, ?) "
+                    "ON CONFLICT (producto_id) DO UPDATE SET cantidad = cantidad + excluded.cantidad",
+                    (id_prod, delta)
+                )
+            elif conn.execute("UPDATE stock SET cantidad = cantidad + ?1 WHERE producto_id = ?2 AND cantidad + ?1 >= 0",
+                              (delta, id_prod)).rowcount == 0:
+                fila = conn.execute("SELECT cantidad FROM stock WHERE producto_id = ?", (id_prod,)).fetchone()
+                faltantes.append((id_prod, -delta, fila[0] if fila else 0))
+        if faltantes:
+            raise StockInsuficienteError(faltantes)
+        conn.executemany(
+            "INSERT INTO movimientos (producto_id, delta, motivo, fecha) VALUES (?, ?, ?, ?)",
+            ((id_prod, delta, motivo, fecha) for id_prod, delta, motivo in movimientos)
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return len(movimientos)
+
+def obtener_productos_por_stock_deposito_db(id_deposito, limite):
+    """Reporte de stock bajo de un depósito: productos que maneja con cantidad <= limite.
+    Se resuelve en una sola consulta sobre el depósito adjunto y el catálogo.
+    Args:
+    id_deposito (int): El ID del depósito, o None para el depósito central.
+    limite (int): El número máximo de stock para el filtro.
+    Returns: Lista de modelos.Producto con la cantidad de ese depósito, ordenada por cantidad.
+    """
+    if id_deposito is None:
+        return obtener_productos_por_stock_db(limite)
+    depositos = obtener_depositos_db()
+    if id_deposito not in {deposito.id for deposito in depositos}:
+        raise ValueError(f"No existe el depósito {id_deposito}")
+    cursor = _conexion_reportes(depositos).cursor()
+    cursor.row_factory = modelos.fabrica_producto
+    cursor.execute(f"""
+        SELECT p.id, p.nombre, p.descripcion, s.cantidad, p.precio, c.nombre
+        FROM dep_{id_deposito}.stock s
+        JOIN productos p ON p.id = s.producto_id
+        JOIN categorias c ON c.id = p.categoria_id
+        WHERE s.cantidad <= ?
+        ORDER BY s.cantidad, s.producto_id
+    """, (limite,))
+    return cursor.fetchall()
+
+def reporte_stock_consolidado_db(limite):
+    """Reporte de stock bajo consolidado: suma el stock de todos los depósitos.
+    Recorre el depósito central y todos los archivos adjuntos en una sola
+    consulta (UNION ALL + GROUP BY), sin copiar datos entre archivos.
+    Args: limite (int): El máximo de stock total para el filtro.
+    Returns: Tupla (nombres, filas): los nombres de los depósitos (el central
+    primero) y una lista de modelos.StockConsolidado, cuyo producto lleva la
+    cantidad total y `cantidades` la de cada depósito en el orden de `nombres`.
+    Ordenada por cantidad total.
+    """
+    depositos = obtener_depositos_db()
+    conn = _conexion_reportes(depositos)
+    fuentes = ["SELECT 0 AS origen, id AS producto_id, cantidad FROM main.productos"]
+    fuentes += [f"SELECT {deposito.id}, producto_id, cantidad FROM dep_{deposito.id}.stock" for deposito in depositos]
+    columnas = "".join(f", SUM(CASE WHEN origen = {origen} THEN cantidad ELSE 0 END)"
+                       for origen in [0] + [deposito.id for deposito in depositos])
+    filas = conn.execute(f"""
+        SELECT p.id, p.nombre, p.descripcion, t.total, p.precio, c.nombre, t.*
+        FROM (SELECT producto_id, SUM(cantidad) AS total{columnas}
+              FROM ({" UNION ALL ".join(fuentes)})
+              GROUP BY producto_id HAVING SUM(cantidad) <= ?) t
+        JOIN productos p ON p.id = t.producto_id
+        JOIN categorias c ON c.id = p.categoria_id
+        ORDER BY t.total, p.id
+    """, (limite,)).fetchall()
+    nombres = [NOMBRE_DEPOSITO_CENTRAL] + [deposito.nombre for deposito in depositos]
+    return nombres, [modelos.StockConsolidado(modelos.fabrica_producto(None, fila[:6]), fila[8:])
+                     for fila in filas]
+
+def _consulta_fts(texto):
+    """Convierte el texto ingresado por el usuario en una consulta FTS5.
+    Cada palabra se busca como prefijo y todas deben aparecer; las comillas
+    evitan que la sintaxis de FTS5 (AND, OR, *, etc.) cause errores.
+    Args: texto (str): El texto a buscar.
+    Returns: La expresión MATCH, o una cadena vacía si no hay palabras.
+    """
+    palabras = re.findall(r"\w+", texto)
+    return " ".join(f'"{palabra}"*' for palabra in palabras)
+
+def buscar_productos_texto_db(texto, limite=TAMANO_PAGINA):
+    """Busca productos por nombre o descripción usando el índice FTS5.
+    Los resultados se ordenan por relevancia (bm25).
+    Args:
+    texto (str): Las palabras a buscar (coincidencia por prefijo).
+    limite (int): Cantidad máxima de resultados.
+    Returns: Lista de modelos.Producto.
+    """
+    consulta = _consulta_fts(texto)
+    if not consulta:
+        return []
+    cursor = _cursor_productos()
+    cursor.execute(SQL_BUSCAR_TEXTO, (consulta, limite))
+    return cursor.fetchall()
+
+def resumen_por_categoria_db():
+    """Recupera los totales de cada categoría desde la tabla de resumen.
+    Los triggers la mantienen al día en cada alta, baja o modificación, por
+    lo que el costo depende de la cantidad de categorías, no de productos.
+    Args: no tiene
+    Returns: Lista de modelos.ResumenCategoria (categoria_id, categoria,
+    productos, unidades, valor), ordenada por valor de stock descendente.
+    """
+    cursor = obtener_conexion().cursor()
+    cursor.row_factory = lambda _, fila: modelos.ResumenCategoria(*fila)
+    cursor.execute("""
+        SELECT r.categoria_id, c.nombre, r.productos, r.unidades, r.valor
+        FROM resumen_categorias r
+        JOIN categorias c ON c.id = r.categoria_id
+        ORDER BY r.valor DESC, c.nombre
+    """)
+    return cursor.fetchall()
+
+def totales_inventario_db():
+    """Suma los totales de todas las categorías.
+    Args: no tiene
+    Returns: Tupla (productos, unidades, valor).
+    """
+    conn = obtener_conexion()
+    return conn.execute(
+        "SELECT COALESCE(SUM(productos), 0), COALESCE(SUM(unidades), 0), COALESCE(SUM(valor), 0) "
+        "FROM resumen_categorias"
+    ).fetchone()
+
+def top_productos_por_valor_db(cantidad=10):
+    """Recupera los productos con mayor valor de stock (cantidad * precio).
+    Usa el índice idx_productos_valor: solo se leen las primeras filas.
+    Args: cantidad (int): Cantidad de productos a retornar.
+    Returns: Lista de modelos.Producto, de mayor a menor valor.
+    """
+    cursor = _cursor_productos()
+    cursor.execute(SQL_TOP_VALOR, (cantidad,))
+    return cursor.fetchall()
+
+def distribucion_precios_db():
+    """Recupera cuántos productos hay en cada rango de precios.
+    Los rangos van por cantidad de dígitos: 0, 1-9, 10-99, 100-999, etc.
+    Args: no tiene
+    Returns: Lista de modelos.RangoPrecio (desde, hasta, productos), por precio
+    ascendente; los rangos sin productos se omiten.
+    """
+    conn = obtener_conexion()
+    filas = conn.execute(
+        "SELECT rango, productos FROM resumen_precios WHERE productos > 0 ORDER BY rango"
+    ).fetchall()
+    return [modelos.RangoPrecio(10 ** (rango - 1) if rango else 0, 10 ** rango - 1 if rango else 0, productos)
+            for rango, productos in filas]
+
+def recalcular_resumenes_db():
+    """Reconstruye las tablas de resumen a partir de productos.
+    No hace falta en el uso normal (los triggers las mantienen); sirve para
+    repararlas si la base se modificó con los triggers desactivados.
+    Args: no tiene
+    Returns: no tiene
+    """
+    with transaccion() as conn:
+        for sentencia in SQL_RECALCULAR_RESUMENES:
+            conn.execute(sentencia)
+
+def _obtener_pagina(columnas_orden, filtro, parametros, clave, tamano, anterior, reportes=False):
+    """Recupera una página de productos usando paginación por clave (keyset).
+    En lugar de OFFSET, filtra por la clave de orden de la última fila
+    vista, de modo que cada página cuesta lo mismo sin importar su posición.
+    Args:
+    columnas_orden (str): Columnas del ORDER BY, ej: 'p.nombre, p.id'.
+    filtro (str): Condición WHERE adicional, o cadena vacía.
+    parametros (tuple): Parámetros del filtro.
+    clave (tuple): Valores de columnas_orden de la fila de referencia, o None.
+    tamano (int): Cantidad de filas por página.
+    anterior (bool): Si es True, retorna la página previa a la clave.
+    reportes (bool): Si es True, lee de la instantánea del modo reportes, si está activo.
+    Returns: Tupla (filas, hay_mas): las filas en orden ascendente y si
+    existen más filas en la dirección recorrida.
+    """
+    condiciones = [filtro] if filtro else []
+    if clave is not None:
+        operador = "<" if anterior else ">"
+        condiciones.append(f"({columnas_orden}) {operador} ({', '.join('?' * len(clave))})")
+        parametros = tuple(parametros) + tuple(clave)
+    direccion = " DESC" if anterior else ""
+    orden = ", ".join(columna + direccion for columna in columnas_orden.split(", "))
+    where = "WHERE " + " AND ".join(condiciones) + "\n" if condiciones else ""
+    sql = f"{_COLUMNAS_PRODUCTO}{where}ORDER BY {orden} LIMIT ?"
+
+    filas = _cursor_productos(reportes).execute(sql, parametros + (tamano + 1,)).fetchall()
+    hay_mas = len(filas) > tamano
+    filas = filas[:tamano]
+    if anterior:
+        filas.reverse()
+    return filas, hay_mas
+
+def obtener_pagina_productos_db(clave=None, tamano=TAMANO_PAGINA, anterior=False):
+    """Recupera una página de productos ordenados por nombre.
+    Args:
+    clave (tuple): (nombre, id) de la última fila de la página actual, o de
+    la primera si anterior es True. None para la primera página.
+    tamano (int): Cantidad de filas por página.
+    anterior (bool): Si es True, retorna la página previa.
+    Returns: Tupla (filas, hay_mas). Cada fila es un modelos.Producto
+    (id, nombre, descripcion, cantidad, precio, nombre_categoria).
+    Con el modo reportes activo, lee de la instantánea (ver activar_modo_reportes).
+    """
+    return _obtener_pagina("p.nombre, p.id", "", (), clave, tamano, anterior, reportes=True)
+
+def obtener_pagina_productos_por_stock_db(limite, clave=None, tamano=TAMANO_PAGINA, anterior=False):
+    """Recupera una página de productos con cantidad menor o igual a un límite.
+    Args:
+    limite (int): El número máximo de stock para el filtro.
+    clave (tuple): (cantidad, id) de la fila de referencia, o None.
+    tamano (int): Cantidad de filas por página.
+    anterior (bool): Si es True, retorna la página previa.
+    Returns: Tupla (filas, hay_mas), con filas ordenadas por cantidad.
+    Con el modo reportes activo, lee de la instantánea (ver activar_modo_reportes).
+    """
+    return _obtener_pagina("p.cantidad, p.id", "p.cantidad <= ?", (limite,), clave, tamano, anterior,
+                           reportes=True)
+
+def iterar_productos_db(tamano_lote=500):
+    """Recorre todos los productos ordenados por nombre, de a una página.
+    Args: tamano_lote (int): Cantidad de filas leídas por consulta.
+    Returns: Generador de modelos.Producto.
+    """
+    clave = None
+    while True:
+        filas, hay_mas = obtener_pagina_productos_db(clave, tamano_lote)
+        yield from filas
+        if not hay_mas:
+            return
+        clave = (filas[-1].nombre, filas[-1].id)
+
+def iterar_productos_por_stock_db(limite, tamano_lote=500):
+    """Recorre los productos con stock bajo ordenados por cantidad, de a una página.
+    Args:
+    limite (int): El número máximo de stock para el filtro.
+    tamano_lote (int): Cantidad de filas leídas por consulta.
+    Returns: Generador de modelos.Producto ordenados por cantidad.
+    """
+    clave = None
+    while True:
+        filas, hay_mas = obtener_pagina_productos_por_stock_db(limite, clave, tamano_lote)
+        yield from filas
+        if not hay_mas:
+            return
+        clave = (filas[-1].cantidad, filas[-1].id)
+
+def _leer_en_lotes(sql, parametros, tamano_lote):
+    """Ejecuta una consulta y entrega sus filas en bloques con fetchmany.
+    A diferencia de la paginación, usa un único cursor: todo el recorrido
+    ve la misma foto de la base aunque otros escriban mientras tanto.
+    """
+    cursor = _cursor_productos()
+    cursor.arraysize = tamano_lote
+    try:
+        cursor.execute(sql, parametros)
+        while True:
+            lote = cursor.fetchmany()
+            if not lote:
+                return
+            yield lote
+    finally:
+        cursor.close()
+
+def leer_productos_en_lotes_db(tamano_lote=1000):
+    """Recorre todos los productos ordenados por nombre en bloques de filas.
+    Pensado para exportaciones: la memoria usada depende solo de tamano_lote.
+    Args: tamano_lote (int): Cantidad de filas por bloque.
+    Returns: Generador de listas de modelos.Producto.
+    """
+    return _leer_en_lotes(SQL_PRODUCTOS, (), tamano_lote)
+
+def obtener_lote_productos_db(tamano_lote=5000):
+    """Recupera todos los productos ordenados por nombre en un modelos.LoteProductos.
+    Para catálogos grandes ocupa mucha menos memoria que obtener_productos_db:
+    las filas se leen en bloques y se guardan por columnas.
+    Args: tamano_lote (int): Cantidad de filas leídas por bloque.
+    Returns: modelos.LoteProductos
+    """
+    lote = modelos.LoteProductos()
+    cursor = obtener_conexion().cursor()
+    cursor.arraysize = tamano_lote
+    cursor.execute(SQL_PRODUCTOS)
+    while True:
+        filas = cursor.fetchmany()
+        if not filas:
+            return lote
+        lote.extender(filas)
+
+def leer_productos_por_stock_en_lotes_db(limite, tamano_lote=1000):
+    """Recorre los productos con stock bajo ordenados por cantidad en bloques de filas.
+    Args:
+    limite (int): El número máximo de stock para el filtro.
+    tamano_lote (int): Cantidad de filas por bloque.
+    Returns: Generador de listas de modelos.Producto con el mismo formato que obtener_productos_por_stock_db.
+    """
+    return _leer_en_lotes(SQL_PRODUCTOS_POR_STOCK, (limite,), tamano_lote)
+
+# Consultas de este módulo que deben resolverse con un índice: nombre,
+# SQL, parámetros de ejemplo, índice que se espera ver en el plan y si el
+# ORDER BY también debe salir del índice (sin ordenar en un B-tree temporal).
+CONSULTAS_INDEXADAS = [
+    ("obtener_productos_db", SQL_PRODUCTOS, (), "idx_productos_nombre", True),
+    ("obtener_producto_por_id_db", SQL_PRODUCTO_POR_ID, (1,), "INTEGER PRIMARY KEY", True),
+    ("obtener_productos_por_stock_db", SQL_PRODUCTOS_POR_STOCK, (0,), "idx_productos_cantidad", True),
+    ("contar_productos_en_categoria_db", SQL_CONTAR_EN_CATEGORIA, (1,), "idx_productos_categoria", True),
+    ("top_productos_por_valor_db", SQL_TOP_VALOR, (10,), "idx_productos_valor", True),
+    # El saldo se acumula en orden inverso sobre los `limite` más recientes.
+    ("kardex_producto_db", SQL_KARDEX, {"id": 1, "limite": 1}, "idx_movimientos_producto", False),
+    # Solo se ordenan las `limite` filas ya leídas en orden de secuencia.
+    ("obtener_cambios_db", SQL_CAMBIOS_DESDE, (0, 1), "idx_cambios_fila", False),
+    # El orden por relevancia se aplica solo sobre los `limite` resultados.
+    ("buscar_productos_texto_db", SQL_BUSCAR_TEXTO, ('"a"*', 1), "VIRTUAL TABLE INDEX", False),
+]
+
+def verificar_planes_consultas_db():
+    """Comprueba con EXPLAIN QUERY PLAN que cada consulta use su índice.
+    Args: no tiene
+    Returns: Lista de tuplas (nombre_funcion, usa_indice, detalle_del_plan),
+    una por cada entrada de CONSULTAS_INDEXADAS.
+    """
+    conn = obtener_conexion()
+    resultados = []
+    for nombre, sql, parametros, indice, orden_por_indice in CONSULTAS_INDEXADAS:
+        filas = conn.execute("EXPLAIN QUERY PLAN " + sql, parametros).fetchall()
+        detalle = " | ".join(fila[-1] for fila in filas)
+        usa_indice = indice in detalle
+        if orden_por_indice and "USE TEMP B-TREE" in detalle:
+            usa_indice = False
+        resultados.append((nombre, usa_indice, detalle))
+    return resultados
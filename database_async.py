@@ -0,0 +1,331 @@
+# database_async.py
+"""Módulo de Acceso a Datos asíncrono (asyncio).
+
+Ofrece una versión `async` de cada función *_db de database.py para usar el
+inventario desde servicios asyncio sin bloquear el event loop. Las lecturas
+se ejecutan en un grupo acotado de hilos lectores, cada uno con su propia
+conexión SQLite (el pool por hilo de database.py); las escrituras se
+encolan en un único hilo escritor, que las ejecuta de a una. Con el modo
+WAL, los lectores no esperan al escritor ni entre sí.
+
+Uso típico:
+    import database_async as adb
+    productos = await adb.obtener_productos_db()
+    ...
+    adb.cerrar()
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import database as db
+
+LECTORES_POR_DEFECTO = 4
+
+_lectores = None
+_escritor = None
+_lock = threading.Lock()
+
+def iniciar(lectores=LECTORES_POR_DEFECTO):
+    """Crea el grupo de hilos lectores y el hilo escritor.
+    Se llama automáticamente en la primera operación; llamarla antes permite
+    elegir la cantidad de lectores. Si ya estaba iniciado, no hace nada.
+    Args: lectores (int): Cantidad máxima de conexiones de lectura simultáneas.
+    Returns: no tiene
+    """
+    global _lectores, _escritor
+    with _lock:
+        if _lectores is None:
+            _lectores = ThreadPoolExecutor(max_workers=lectores, thread_name_prefix="db-lector")
+            _escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-escritor")
+
+def cerrar():
+    """Espera las operaciones pendientes, detiene los hilos y cierra las conexiones.
+    Cierra todas las conexiones del pool de database.py, incluidas las del hilo actual.
+    Args: no tiene
+    Returns: no tiene
+    """
+    global _lectores, _escritor
+    with _lock:
+        if _lectores is None:
+            return
+        _lectores.shutdown(wait=True)
+        _escritor.shutdown(wait=True)
+        _lectores = _escritor = None
+    db.cerrar_conexiones()
+
+async def _en_hilo(ejecutor, funcion, *args, **kwargs):
+    """Ejecuta una función bloqueante en el ejecutor indicado y espera su resultado."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(ejecutor, functools.partial(funcion, *args, **kwargs))
+
+async def ejecutar_lectura(funcion, *args, **kwargs):
+    """Ejecuta cualquier función de lectura en el grupo de hilos lectores.
+    Args: funcion (callable): Función bloqueante, ej: una de database.py.
+    Returns: Lo que retorne la función.
+    """
+    iniciar()
+    return await _en_hilo(_lectores, funcion, *args, **kwargs)
+
+async def ejecutar_escritura(funcion, *args, **kwargs):
+    """Encola una función en el hilo escritor, que ejecuta las escrituras de a una.
+    Sirve también para agrupar varias operaciones en una transacción, ej:
+    pasando una función que use `with db.transaccion():`.
+    Args: funcion (callable): Función bloqueante que escribe en la base.
+    Returns: Lo que retorne la función.
+    """
+    iniciar()
+    return await _en_hilo(_escritor, funcion, *args, **kwargs)
+
+# --- Lecturas ---------------------------------------------------------------
+
+async def version_esquema_db():
+    """Versión asíncrona de database.version_esquema_db."""
+    return await ejecutar_lectura(db.version_esquema_db)
+
+async def version_datos_db():
+    """Versión asíncrona de database.version_datos_db."""
+    return await ejecutar_lectura(db.version_datos_db)
+
+async def antiguedad_instantanea_db():
+    """Versión asíncrona de database.antiguedad_instantanea_db."""
+    return await ejecutar_lectura(db.antiguedad_instantanea_db)
+
+async def contar_categorias_db():
+    """Versión asíncrona de database.contar_categorias_db."""
+    return await ejecutar_lectura(db.contar_categorias_db)
+
+async def obtener_categorias_db():
+    """Versión asíncrona de database.obtener_categorias_db."""
+    return await ejecutar_lectura(db.obtener_categorias_db)
+
+async def contar_productos_en_categoria_db(id_cat):
+    """Versión asíncrona de database.contar_productos_en_categoria_db."""
+    return await ejecutar_lectura(db.contar_productos_en_categoria_db, id_cat)
+
+async def obtener_productos_db():
+    """Versión asíncrona de database.obtener_productos_db."""
+    return await ejecutar_lectura(db.obtener_productos_db)
+
+async def obtener_lote_productos_db(tamano_lote=5000):
+    """Versión asíncrona de database.obtener_lote_productos_db."""
+    return await ejecutar_lectura(db.obtener_lote_productos_db, tamano_lote)
+
+async def obtener_producto_por_id_db(id_prod):
+    """Versión asíncrona de database.obtener_producto_por_id_db."""
+    return await ejecutar_lectura(db.obtener_producto_por_id_db, id_prod)
+
+async def obtener_productos_por_stock_db(limite):
+    """Versión asíncrona de database.obtener_productos_por_stock_db."""
+    return await ejecutar_lectura(db.obtener_productos_por_stock_db, limite)
+
+async def obtener_depositos_db():
+    """Versión asíncrona de database.obtener_depositos_db."""
+    return await ejecutar_lectura(db.obtener_depositos_db)
+
+async def obtener_productos_por_stock_deposito_db(id_deposito, limite):
+    """Versión asíncrona de database.obtener_productos_por_stock_deposito_db."""
+    return await ejecutar_lectura(db.obtener_productos_por_stock_deposito_db, id_deposito, limite)
+
+async def reporte_stock_consolidado_db(limite):
+    """Versión asíncrona de database.reporte_stock_consolidado_db."""
+    return await ejecutar_lectura(db.reporte_stock_consolidado_db, limite)
+
+async def ultima_secuencia_cambios_db():
+    """Versión asíncrona de database.ultima_secuencia_cambios_db."""
+    return await ejecutar_lectura(db.ultima_secuencia_cambios_db)
+
+async def obtener_cambios_db(desde=0, limite=1000):
+    """Versión asíncrona de database.obtener_cambios_db."""
+    return await ejecutar_lectura(db.obtener_cambios_db, desde, limite)
+
+async def version_umbrales_db():
+    """Versión asíncrona de database.version_umbrales_db."""
+    return await ejecutar_lectura(db.version_umbrales_db)
+
+async def productos_bajo_umbral_db(defecto=None, ids=None):
+    """Versión asíncrona de database.productos_bajo_umbral_db."""
+    return await ejecutar_lectura(db.productos_bajo_umbral_db, defecto, None if ids is None else list(ids))
+
+async def kardex_producto_db(id_prod, limite=db.TAMANO_PAGINA):
+    """Versión asíncrona de database.kardex_producto_db."""
+    return await ejecutar_lectura(db.kardex_producto_db, id_prod, limite)
+
+async def stock_a_fecha_db(id_prod, fecha):
+    """Versión asíncrona de database.stock_a_fecha_db."""
+    return await ejecutar_lectura(db.stock_a_fecha_db, id_prod, fecha)
+
+async def resumen_por_categoria_db():
+    """Versión asíncrona de database.resumen_por_categoria_db."""
+    return await ejecutar_lectura(db.resumen_por_categoria_db)
+
+async def totales_inventario_db():
+    """Versión asíncrona de database.totales_inventario_db."""
+    return await ejecutar_lectura(db.totales_inventario_db)
+
+async def top_productos_por_valor_db(cantidad=10):
+    """Versión asíncrona de database.top_productos_por_valor_db."""
+    return await ejecutar_lectura(db.top_productos_por_valor_db, cantidad)
+
+async def distribucion_precios_db():
+    """Versión asíncrona de database.distribucion_precios_db."""
+    return await ejecutar_lectura(db.distribucion_precios_db)
+
+async def buscar_productos_texto_db(texto, limite=db.TAMANO_PAGINA):
+    """Versión asíncrona de database.buscar_productos_texto_db."""
+    return await ejecutar_lectura(db.buscar_productos_texto_db, texto, limite)
+
+async def obtener_pagina_productos_db(clave=None, tamano=db.TAMANO_PAGINA, anterior=False):
+    """Versión asíncrona de database.obtener_pagina_productos_db."""
+    return await ejecutar_lectura(db.obtener_pagina_productos_db, clave, tamano, anterior)
+
+async def obtener_pagina_productos_por_stock_db(limite, clave=None, tamano=db.TAMANO_PAGINA, anterior=False):
+    """Versión asíncrona de database.obtener_pagina_productos_por_stock_db."""
+    return await ejecutar_lectura(db.obtener_pagina_productos_por_stock_db, limite, clave, tamano, anterior)
+
+async def iterar_productos_db(tamano_lote=500):
+    """Versión asíncrona de database.iterar_productos_db: un generador
+    asíncrono que lee una página por vez en el grupo de lectores.
+    """
+    clave = None
+    while True:
+        filas, hay_mas = await obtener_pagina_productos_db(clave, tamano_lote)
+        for fila in filas:
+            yield fila
+        if not hay_mas:
+            return
+        clave = (filas[-1].nombre, filas[-1].id)
+
+async def iterar_productos_por_stock_db(limite, tamano_lote=500):
+    """Versión asíncrona de database.iterar_productos_por_stock_db."""
+    clave = None
+    while True:
+        filas, hay_mas = await obtener_pagina_productos_por_stock_db(limite, clave, tamano_lote)
+        for fila in filas:
+            yield fila
+        if not hay_mas:
+            return
+        clave = (filas[-1].cantidad, filas[-1].id)
+
+async def leer_productos_en_lotes_db(tamano_lote=1000):
+    """Versión asíncrona de database.leer_productos_en_lotes_db: un
+    generador asíncrono de listas de productos. Cada bloque es una página
+    leída en el grupo de lectores; un cursor de SQLite no puede pasar de un
+    hilo a otro.
+    """
+    clave = None
+    while True:
+        filas, hay_mas = await obtener_pagina_productos_db(clave, tamano_lote)
+        if filas:
+            yield filas
+        if not hay_mas:
+            return
+        clave = (filas[-1].nombre, filas[-1].id)
+
+async def leer_productos_por_stock_en_lotes_db(limite, tamano_lote=1000):
+    """Versión asíncrona de database.leer_productos_por_stock_en_lotes_db."""
+    clave = None
+    while True:
+        filas, hay_mas = await obtener_pagina_productos_por_stock_db(limite, clave, tamano_lote)
+        if filas:
+            yield filas
+        if not hay_mas:
+            return
+        clave = (filas[-1].cantidad, filas[-1].id)
+
+# --- Escrituras -------------------------------------------------------------
+
+async def refrescar_instantanea_db(forzar=False):
+    """Versión asíncrona de database.refrescar_instantanea_db.
+    La copia (API de backup de SQLite) puede tardar en bases grandes: se
+    hace en el hilo escritor y no en el event loop.
+    """
+    return await ejecutar_escritura(db.refrescar_instantanea_db, forzar)
+
+async def inicializar_db():
+    """Versión asíncrona de database.inicializar_db."""
+    return await ejecutar_escritura(db.inicializar_db)
+
+async def agregar_categoria_db(nombre):
+    """Versión asíncrona de database.agregar_categoria_db."""
+    return await ejecutar_escritura(db.agregar_categoria_db, nombre)
+
+async def modificar_categoria_db(id_cat, nuevo_nombre):
+    """Versión asíncrona de database.modificar_categoria_db."""
+    return await ejecutar_escritura(db.modificar_categoria_db, id_cat, nuevo_nombre)
+
+async def eliminar_categoria_db(id_cat):
+    """Versión asíncrona de database.eliminar_categoria_db."""
+    return await ejecutar_escritura(db.eliminar_categoria_db, id_cat)
+
+async def agregar_producto_db(nombre, descripcion, cantidad, precio, cat_id):
+    """Versión asíncrona de database.agregar_producto_db."""
+    return await ejecutar_escritura(db.agregar_producto_db, nombre, descripcion, cantidad, precio, cat_id)
+
+async def agregar_productos_bulk_db(filas, tamano_lote=5000):
+    """Versión asíncrona de database.agregar_productos_bulk_db.
+    El iterable se consume en el hilo escritor; no debe depender del event loop.
+    """
+    return await ejecutar_escritura(db.agregar_productos_bulk_db, filas, tamano_lote)
+
+async def eliminar_producto_db(id_prod):
+    """Versión asíncrona de database.eliminar_producto_db."""
+    return await ejecutar_escritura(db.eliminar_producto_db, id_prod)
+
+async def modificar_producto_db(id_prod, campo_a_modificar, nuevo_valor):
+    """Versión asíncrona de database.modificar_producto_db."""
+    return await ejecutar_escritura(db.modificar_producto_db, id_prod, campo_a_modificar, nuevo_valor)
+
+async def modificar_producto_campos_db(id_prod, cambios):
+    """Versión asíncrona de database.modificar_producto_campos_db."""
+    return await ejecutar_escritura(db.modificar_producto_campos_db, id_prod, dict(cambios))
+
+async def ajustar_precios_categoria_db(id_cat, porcentaje):
+    """Versión asíncrona de database.ajustar_precios_categoria_db."""
+    return await ejecutar_escritura(db.ajustar_precios_categoria_db, id_cat, porcentaje)
+
+async def fijar_umbral_producto_db(id_prod, minimo):
+    """Versión asíncrona de database.fijar_umbral_producto_db."""
+    return await ejecutar_escritura(db.fijar_umbral_producto_db, id_prod, minimo)
+
+async def fijar_umbral_categoria_db(id_cat, minimo):
+    """Versión asíncrona de database.fijar_umbral_categoria_db."""
+    return await ejecutar_escritura(db.fijar_umbral_categoria_db, id_cat, minimo)
+
+async def recalcular_resumenes_db():
+    """Versión asíncrona de database.recalcular_resumenes_db."""
+    return await ejecutar_escritura(db.recalcular_resumenes_db)
+
+async def actualizar_cantidades_db(pares):
+    """Versión asíncrona de database.actualizar_cantidades_db."""
+    return await ejecutar_escritura(db.actualizar_cantidades_db, list(pares))
+
+async def registrar_movimientos_db(movimientos, tamano_lote=5000):
+    """Versión asíncrona de database.registrar_movimientos_db.
+    El iterable se consume en el hilo escritor; no debe depender del event loop.
+    """
+    return await ejecutar_escritura(db.registrar_movimientos_db, movimientos, tamano_lote)
+
+async def generar_cortes_stock_db():
+    """Versión asíncrona de database.generar_cortes_stock_db."""
+    return await ejecutar_escritura(db.generar_cortes_stock_db)
+
+async def registrar_pedido_db(lineas, motivo=db.MOTIVO_VENTA):
+    """Versión asíncrona de database.registrar_pedido_db."""
+    return await ejecutar_escritura(db.registrar_pedido_db, list(lineas), motivo)
+
+async def descontar_stock_db(id_prod, cantidad, motivo=db.MOTIVO_VENTA):
+    """Versión asíncrona de database.descontar_stock_db."""
+    return await ejecutar_escritura(db.descontar_stock_db, id_prod, cantidad, motivo)
+
+async def agregar_deposito_db(nombre, archivo=None):
+    """Versión asíncrona de database.agregar_deposito_db."""
+    return await ejecutar_escritura(db.agregar_deposito_db, nombre, archivo)
+
+async def registrar_movimientos_deposito_db(id_deposito, movimientos):
+    """Versión asíncrona de database.registrar_movimientos_deposito_db."""
+    return await ejecutar_escritura(db.registrar_movimientos_deposito_db, id_deposito, list(movimientos))
+
+async def compactar_cambios_db(purgar_hasta=None):
+    """Versión asíncrona de database.compactar_cambios_db."""
+    return await ejecutar_escritura(db.compactar_cambios_db, purgar_hasta)
@@ -0,0 +1,139 @@
+ # depositos.py
+"""
+Módulo de lógica de negocio para los depósitos. 🏬
+El stock del depósito central es la cantidad de cada producto; cada
+depósito adicional guarda su stock en un archivo SQLite propio, de modo
+que las escrituras de un depósito no compiten por el bloqueo de los demás.
+Permite agregar y listar depósitos, registrar entradas y salidas en uno de
+ellos y ver el stock bajo por depósito o consolidado entre todos.
+"""
+import sqlite3
+import database as db
+import ui
+import productos
+
+def agregar_nuevo_deposito():
+    """Orquesta el alta de un depósito, validando que el nombre no esté vacío ni repetido.
+    Args: no tiene
+    Returns: no tiene
+    """
+    while True:
+        nombre = ui.obtener_input("Ingrese el nombre del nuevo depósito: ")
+        if nombre:
+            break
+        ui.mostrar_mensaje_error("El nombre no puede estar vacío.")
+    if nombre.lower() == db.NOMBRE_DEPOSITO_CENTRAL.lower():
+        ui.mostrar_mensaje_error(f"El nombre '{nombre}' está reservado para el depósito central.")
+        return
+
+    try:
+        db.agregar_deposito_db(nombre)
+        ui.mostrar_mensaje_exito(f"Depósito '{nombre}' agregado.")
+    except sqlite3.IntegrityError:
+        ui.mostrar_mensaje_error(f"El depósito '{nombre}' ya existe.")
+    except ValueError as error:
+        ui.mostrar_mensaje_error(str(error))
+
+def listar_depositos():
+    """Muestra el depósito central y los depósitos registrados.
+    Args: no tiene
+    Returns: no tiene
+    """
+    ui.mostrar_lista_depositos(db.obtener_depositos_db(), db.NOMBRE_DEPOSITO_CENTRAL)
+
+def seleccionar_deposito(incluir_central):
+    """Muestra los depósitos y pide el ID de uno.
+    Args: incluir_central (bool): Si es True, una entrada vacía elige el depósito central.
+    Returns: El ID del depósito, None para el central, o False si no hay
+    depósitos para elegir.
+    """
+    depositos = db.obtener_depositos_db()
+    if not depositos and not incluir_central:
+        ui.mostrar_mensaje_info("No hay depósitos registrados. Agregue uno primero.")
+        return False
+    ui.mostrar_lista_depositos(depositos, db.NOMBRE_DEPOSITO_CENTRAL)
+    ids_validos = {deposito.id for deposito in depositos}
+    pregunta = "Ingrese el ID del depósito" + (" (vacío para el central): " if incluir_central else ": ")
+    while True:
+        id_str = ui.obtener_input(pregunta)
+        if not id_str and incluir_central:
+            return None
+        try:
+            id_deposito = int(id_str)
+            if id_deposito in ids_validos:
+                return id_deposito
+            ui.mostrar_mensaje_error("ID no válido. Intente de nuevo.")
+        except ValueError:
+            ui.mostrar_mensaje_error("Debe ingresar un ID numérico.")
+
+def registrar_movimientos_en_deposito():
+    """Orquesta el registro de entradas y salidas de stock en un depósito.
+    Los movimientos se ingresan igual que en la actualización masiva de
+    productos y se registran todos o ninguno.
+    Args: no tiene
+    Returns: no tiene
+    """
+    id_deposito = seleccionar_deposito(incluir_central=False)
+    if id_deposito is False:
+        return
+    movimientos = productos.pedir_movimientos_de_stock()
+    if not movimientos:
+        return
+    try:
+        registrados = db.registrar_movimientos_deposito_db(id_deposito, movimientos)
+    except ValueError as error:
+        ui.mostrar_mensaje_error(f"{error}. No se registró ningún movimiento.")
+        return
+    ui.mostrar_mensaje_exito(f"Se registraron {registrados} movimientos en el depósito.")
+
+def _pedir_limite():
+    """Pide un límite de stock entero y no negativo."""
+    while True:
+        try:
+            limite = int(ui.obtener_input("Ingrese el límite de cantidad para el reporte: "))
+            if limite >= 0:
+                return limite
+            ui.mostrar_mensaje_error("El límite no puede ser un número negativo.")
+        except ValueError:
+            ui.mostrar_mensaje_error("Debe ingresar un número entero válido.")
+
+def generar_stock_bajo_por_deposito():
+    """Pide un depósito y un límite, y muestra los productos de ese depósito con stock bajo.
+    Args: no tiene
+    Returns: no tiene
+    """
+    id_deposito = seleccionar_deposito(incluir_central=True)
+    limite = _pedir_limite()
+    ui.mostrar_reporte_stock(db.obtener_productos_por_stock_deposito_db(id_deposito, limite), limite)
+
+def generar_stock_bajo_consolidado():
+    """Pide un límite y muestra los productos cuyo stock total entre todos los depósitos no lo supera.
+    Args: no tiene
+    Returns: no tiene
+    """
+    limite = _pedir_limite()
+    nombres, filas = db.reporte_stock_consolidado_db(limite)
+    ui.mostrar_reporte_stock_consolidado(nombres, filas, limite)
+
+def gestionar_depositos():
+    """Muestra el menú de depósitos y maneja las opciones.
+    Args: no tiene
+    Returns: no tiene
+    """
+    while True:
+        ui.mostrar_menu_depositos()
+        opcion = ui.obtener_input("Seleccione una opción: ")
+        if opcion == '1':
+            agregar_nuevo_deposito()
+        elif opcion == '2':
+            listar_depositos()
+        elif opcion == '3':
+            registrar_movimientos_en_deposito()
+        elif opcion == '4':
+            generar_stock_bajo_por_deposito()
+        elif opcion == '5':
+            generar_stock_bajo_consolidado()
+        elif opcion == '6':
+            break
+        else:
+            ui.mostrar_mensaje_error("Opción inválida.")
@@ -0,0 +1,167 @@
+# exportador.py
+"""
+Módulo para la exportación de productos y reportes a archivos. 📤
+Escribe el listado de productos o el reporte de stock bajo en formato CSV o
+JSON Lines, leyendo la base en bloques con fetchmany y escribiendo cada
+bloque apenas llega: la memoria usada no depende del tamaño del catálogo.
+El destino puede ser un archivo o la salida estándar ('-'), opcionalmente
+comprimido con gzip. Los archivos generados se pueden volver a importar
+con importador.py (la columna 'id' se ignora al importar).
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import time
+import database as db
+import ui
+import modelos
+
+COLUMNAS = modelos.Producto._fields
+TAMANO_LOTE = 1000
+
+def detectar_formato(ruta):
+    """Deduce el formato de exportación a partir de la extensión del destino.
+    Ignora una extensión .gz final (ej: 'productos.csv.gz' es CSV).
+    Args: ruta (str): Ruta del archivo.
+    Returns: 'csv' o 'jsonl'.
+    Levanta un error ValueError: Si la extensión no es reconocida.
+    """
+    base = ruta[:-3] if ruta.lower().endswith(".gz") else ruta
+    extension = os.path.splitext(base)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Formato de archivo no soportado: '{extension}'")
+
+def _abrir_destino(destino, comprimir):
+    """Abre el destino como archivo de texto UTF-8.
+    Args:
+    destino (str): Ruta del archivo o '-' para la salida estándar.
+    comprimir (bool): Si es True, escribe en formato gzip.
+    Returns: Tupla (archivo_de_texto, debe_cerrarse).
+    """
+    if destino == "-":
+        if not comprimir:
+            return sys.stdout, False
+        binario = gzip.GzipFile(fileobj=sys.stdout.buffer, mode="wb")
+        return io.TextIOWrapper(binario, encoding="utf-8", newline=""), True
+    if comprimir:
+        return gzip.open(destino, "wt", encoding="utf-8", newline=""), True
+    return open(destino, "w", encoding="utf-8", newline=""), True
+
+def _escribir_csv(archivo, lotes):
+    """Escribe el encabezado y cada bloque de filas como CSV. Retorna la cantidad de filas."""
+    escritor = csv.writer(archivo)
+    escritor.writerow(COLUMNAS)
+    filas = 0
+    for lote in lotes:
+        escritor.writerows(lote)
+        filas += len(lote)
+    return filas
+
+def _escribir_jsonl(archivo, lotes):
+    """Escribe cada fila como un objeto JSON por línea. Retorna la cantidad de filas."""
+    filas = 0
+    for lote in lotes:
+        archivo.write("".join(json.dumps(fila._asdict(), ensure_ascii=False) + "\n" for fila in lote))
+        filas += len(lote)
+    return filas
+
+def _exportar(lotes, destino, formato, comprimir):
+    """Escribe los bloques de filas en el destino y arma el resumen.
+    Args:
+    lotes: Generador de listas de filas (ver database.leer_productos_en_lotes_db).
+    destino (str): Ruta del archivo o '-' para la salida estándar.
+    formato (str): 'csv', 'jsonl' o None para deducirlo de la extensión.
+    comprimir (bool): True para gzip; None para deducirlo de la extensión .gz.
+    Returns: Diccionario con 'destino', 'formato', 'filas', 'segundos' y 'filas_por_segundo'.
+    """
+    if formato is None:
+        formato = "csv" if destino == "-" else detectar_formato(destino)
+    if formato not in ("csv", "jsonl"):
+        raise ValueError(f"Formato de exportación no soportado: '{formato}'")
+    if comprimir is None:
+        comprimir = destino.lower().endswith(".gz")
+
+    inicio = time.perf_counter()
+    archivo, cerrar = _abrir_destino(destino, comprimir)
+    try:
+        escribir = _escribir_csv if formato == "csv" else _escribir_jsonl
+        filas = escribir(archivo, lotes)
+    finally:
+        if cerrar:
+            archivo.close()
+        else:
+            archivo.flush()
+    segundos = time.perf_counter() - inicio
+    return {
+        "destino": destino,
+        "formato": formato,
+        "filas": filas,
+        "segundos": segundos,
+        "filas_por_segundo": filas / segundos if segundos else 0.0,
+    }
+
+def exportar_productos(destino, formato=None, comprimir=None, tamano_lote=TAMANO_LOTE):
+    """Exporta todos los productos ordenados por nombre.
+    Args:
+    destino (str): Ruta del archivo o '-' para la salida estándar.
+    formato (str): 'csv' o 'jsonl'. Si es None se deduce de la extensión.
+    comprimir (bool): True para gzip. Si es None, se comprime si el destino termina en .gz.
+    tamano_lote (int): Filas leídas y escritas por bloque.
+    Returns: El resumen de la exportación (ver _exportar).
+    """
+    return _exportar(db.leer_productos_en_lotes_db(tamano_lote), destino, formato, comprimir)
+
+def exportar_reporte_stock(destino, limite, formato=None, comprimir=None, tamano_lote=TAMANO_LOTE):
+    """Exporta el reporte de productos con cantidad menor o igual a `limite`.
+    Args:
+    destino (str): Ruta del archivo o '-' para la salida estándar.
+    limite (int): El número máximo de stock para el filtro.
+    formato (str): 'csv' o 'jsonl'. Si es None se deduce de la extensión.
+    comprimir (bool): True para gzip. Si es None, se comprime si el destino termina en .gz.
+    tamano_lote (int): Filas leídas y escritas por bloque.
+    Returns: El resumen de la exportación (ver _exportar).
+    """
+    return _exportar(db.leer_productos_por_stock_en_lotes_db(limite, tamano_lote), destino, formato, comprimir)
+
+def exportar_a_archivo(limite=None):
+    """Guía al usuario para exportar los productos o el reporte de stock bajo.
+    Args: limite (int): Si se indica, exporta el reporte de stock bajo con ese
+    límite; si es None, exporta todos los productos.
+    Returns: no tiene
+    """
+    ruta = ui.obtener_input("Ingrese la ruta del archivo (.csv, .jsonl, opcionalmente con .gz): ")
+    try:
+        if limite is None:
+            resumen = exportar_productos(ruta)
+        else:
+            resumen = exportar_reporte_stock(ruta, limite)
+    except (ValueError, OSError) as error:
+        ui.mostrar_mensaje_error(str(error))
+        return
+    ui.mostrar_mensaje_exito(f"Se exportaron {resumen['filas']} productos a '{ruta}' "
+                             f"en {resumen['segundos']:.2f} s.")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Exporta productos o el reporte de stock bajo.")
+    parser.add_argument("destino", help="Archivo .csv o .jsonl (con .gz para comprimir), o '-' para la salida estándar.")
+    parser.add_argument("--stock-bajo", type=int, metavar="LIMITE",
+                        help="Exporta solo los productos con cantidad menor o igual a LIMITE.")
+    parser.add_argument("--formato", choices=("csv", "jsonl"), help="Formato (por defecto, según la extensión).")
+    parser.add_argument("--gzip", action="store_true", default=None, help="Comprime la salida con gzip.")
+    argumentos = parser.parse_args()
+
+    db.inicializar_db()
+    if argumentos.stock_bajo is None:
+        resumen = exportar_productos(argumentos.destino, argumentos.formato, argumentos.gzip)
+    else:
+        resumen = exportar_reporte_stock(argumentos.destino, argumentos.stock_bajo, argumentos.formato, argumentos.gzip)
+    db.cerrar_conexiones()
+    print(f"{resumen['filas']} productos exportados en {resumen['segundos']:.2f} s.", file=sys.stderr)
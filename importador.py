@@ -0,0 +1,189 @@
+# importador.py
+"""
+Módulo para la importación masiva de productos desde archivos. 📥
+Lee catálogos de proveedores en formato CSV o JSON Lines fila por fila,
+sin cargar el archivo completo en memoria, valida cada fila con las mismas
+reglas que el alta manual y las inserta en lotes con agregar_productos_bulk_db.
+Las categorías se resuelven por nombre una sola vez y las que no existen
+se crean, respetando el límite de categorías de la aplicación, en la misma
+transacción que el lote que las usa. Acepta los archivos de exportador.py.
+"""
+import csv
+import itertools
+import json
+import os
+import time
+import database as db
+import ui
+from categorias import LIMITE_CATEGORIAS
+
+COLUMNAS = ("nombre", "descripcion", "cantidad", "precio", "categoria")
+MAX_RECHAZOS_DETALLADOS = 100
+
+def _leer_csv(ruta):
+    """Genera un diccionario por cada fila de un archivo CSV con encabezado.
+    Args: ruta (str): Ruta del archivo.
+    Returns: Generador de tuplas (numero_de_linea, dict).
+    """
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        lector = csv.DictReader(archivo)
+        for fila in lector:
+            yield lector.line_num, fila
+
+def _leer_jsonl(ruta):
+    """Genera un diccionario por cada línea de un archivo JSON Lines.
+    Las líneas vacías se ignoran; las que no son JSON válido se entregan como None.
+    Args: ruta (str): Ruta del archivo.
+    Returns: Generador de tuplas (numero_de_linea, dict o None).
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        for numero, linea in enumerate(archivo, start=1):
+            if not linea.strip():
+                continue
+            try:
+                fila = json.loads(linea)
+            except json.JSONDecodeError:
+                fila = None
+            yield numero, fila if isinstance(fila, dict) else None
+
+def detectar_formato(ruta):
+    """Deduce el formato del archivo a partir de su extensión.
+    Args: ruta (str): Ruta del archivo.
+    Returns: 'csv' o 'jsonl'.
+    Levanta un error ValueError: Si la extensión no es reconocida.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Formato de archivo no soportado: '{extension}'")
+
+def _validar_fila(fila):
+    """Valida y normaliza los campos de una fila del archivo.
+    Aplica las mismas reglas que agregar_nuevo_producto, salvo que la
+    cantidad puede ser 0 (productos sin stock, como los que exporta exportador.py).
+    Args: fila (dict): Los datos leídos de una fila.
+    Returns: Tupla (nombre, descripcion, cantidad, precio, nombre_categoria).
+    Levanta un error ValueError: Con el motivo del rechazo.
+    """
+    if fila is None:
+        raise ValueError("La línea no es un objeto JSON válido.")
+    faltantes = [columna for columna in COLUMNAS if fila.get(columna) in (None, "")]
+    if faltantes:
+        raise ValueError(f"Faltan campos: {', '.join(faltantes)}.")
+
+    nombre = str(fila["nombre"]).strip()
+    descripcion = str(fila["descripcion"]).strip()
+    nombre_categoria = str(fila["categoria"]).strip()
+    if not nombre or not descripcion or not nombre_categoria:
+        raise ValueError("El nombre, la descripción y la categoría no pueden estar vacíos.")
+    try:
+        cantidad = int(fila["cantidad"])
+        precio = int(fila["precio"])
+    except (TypeError, ValueError):
+        raise ValueError("La cantidad y el precio deben ser números enteros.") from None
+    if cantidad < 0:
+        raise ValueError("La cantidad no puede ser negativa.")
+    if precio < 0:
+        raise ValueError("El precio no puede ser negativo.")
+    return nombre, descripcion, cantidad, precio, nombre_categoria
+
+def importar_productos(ruta, formato=None, tamano_lote=5000):
+    """Importa productos desde un archivo CSV o JSON Lines.
+    Las filas inválidas se cuentan y se rechazan sin detener la importación;
+    solo se guarda el detalle de las primeras MAX_RECHAZOS_DETALLADOS.
+    Args:
+    ruta (str): Ruta del archivo a importar.
+    formato (str): 'csv' o 'jsonl'. Si es None se deduce de la extensión.
+    tamano_lote (int): Cantidad de filas por transacción.
+    Returns: Un diccionario con el resumen: 'insertados', 'rechazados',
+    'detalle_rechazos' (lista de (linea, motivo)), 'categorias_creadas',
+    'segundos' y 'filas_por_segundo'.
+    """
+    formato = formato or detectar_formato(ruta)
+    lector = _leer_csv(ruta) if formato == "csv" else _leer_jsonl(ruta)
+
+    categorias = {nombre: id_cat for id_cat, nombre in db.obtener_categorias_db()}
+    resumen = {
+        "insertados": 0,
+        "rechazados": 0,
+        "detalle_rechazos": [],
+        "categorias_creadas": [],
+    }
+
+    def rechazar(linea, motivo):
+        resumen["rechazados"] += 1
+        if len(resumen["detalle_rechazos"]) < MAX_RECHAZOS_DETALLADOS:
+            resumen["detalle_rechazos"].append((linea, motivo))
+
+    def filas_validas():
+        for linea, fila in lector:
+            try:
+                yield (linea, *_validar_fila(fila))
+            except ValueError as error:
+                rechazar(linea, str(error))
+
+    def insertar_lote(lote):
+        # Las categorías nuevas se crean en la misma transacción que los
+        # productos del lote: si el lote falla, no quedan categorías huérfanas.
+        nuevas = {}
+        filas = []
+        for linea, nombre, descripcion, cantidad, precio, nombre_categoria in lote:
+            if nombre_categoria not in categorias and nombre_categoria not in nuevas:
+                if len(categorias) + len(nuevas) >= LIMITE_CATEGORIAS:
+                    rechazar(linea, f"La categoría '{nombre_categoria}' no existe y se alcanzó el límite de {LIMITE_CATEGORIAS}.")
+                    continue
+                nuevas[nombre_categoria] = None
+            filas.append((nombre, descripcion, cantidad, precio, nombre_categoria))
+        with db.transaccion():
+            for nombre_categoria in nuevas:
+                nuevas[nombre_categoria] = db.agregar_categoria_db(nombre_categoria)
+            ids = {**categorias, **nuevas}
+            insertados = db.agregar_productos_bulk_db(
+                ((nombre, descripcion, cantidad, precio, ids[nombre_categoria])
+                 for nombre, descripcion, cantidad, precio, nombre_categoria in filas), tamano_lote)
+        categorias.update(nuevas)
+        resumen["categorias_creadas"].extend(nuevas)
+        return insertados
+
+    inicio = time.perf_counter()
+    validas = filas_validas()
+    while True:
+        lote = list(itertools.islice(validas, tamano_lote))
+        if not lote:
+            break
+        resumen["insertados"] += insertar_lote(lote)
+    segundos = time.perf_counter() - inicio
+    resumen["segundos"] = segundos
+    resumen["filas_por_segundo"] = (resumen["insertados"] + resumen["rechazados"]) / segundos if segundos else 0.0
+    return resumen
+
+def importar_desde_archivo():
+    """Guía al usuario para importar productos desde un archivo.
+    Solicita la ruta, ejecuta la importación y muestra el resumen.
+    Args: no tiene
+    Returns: no tiene
+    """
+    ruta = ui.obtener_input("Ingrese la ruta del archivo (.csv o .jsonl): ")
+    if not os.path.isfile(ruta):
+        ui.mostrar_mensaje_error(f"No se encontró el archivo '{ruta}'.")
+        return
+    try:
+        resumen = importar_productos(ruta)
+    except ValueError as error:
+        ui.mostrar_mensaje_error(str(error))
+        return
+    ui.mostrar_resumen_importacion(resumen)
+
+if __name__ == "__main__":
+    import sys
+    from colorama import init
+
+    init(autoreset=True)
+    if len(sys.argv) != 2:
+        print("Uso: python importador.py <archivo.csv|archivo.jsonl>")
+        sys.exit(2)
+    db.inicializar_db()
+    ui.mostrar_resumen_importacion(importar_productos(sys.argv[1]))
+    db.cerrar_conexiones()
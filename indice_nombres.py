@@ -0,0 +1,170 @@
+# indice_nombres.py
+"""
+Módulo de búsqueda por nombre mientras se escribe (typeahead). 🔎
+Mantiene en memoria un índice de trigramas de los nombres de productos y
+categorías: encuentra un nombre a partir de su comienzo ('sil roj') o con
+errores de tipeo ('sila roja'), sin pasar por la base en cada consulta.
+
+El índice se arma la primera vez que se usa, leyendo el registro de
+cambios desde el principio (database.obtener_cambios_db(0)), y antes de
+cada búsqueda aplica solo los cambios nuevos. Así refleja también lo que
+escriben otros procesos o conexiones, y mantenerlo al día cuesta lo que
+cambió, no el tamaño del catálogo.
+"""
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+import database as db
+import modelos
+
+UMBRAL_SIMILITUD = 0.5
+LIMITE_SUGERENCIAS = 10
+_NO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+def normalizar(texto):
+    """Pasa el texto a minúsculas, sin acentos y con solo letras, números y espacios simples.
+    Args: texto (str): El texto a normalizar.
+    Returns: str
+    """
+    sin_acentos = unicodedata.normalize("NFKD", texto.lower()).encode("ascii", "ignore").decode("ascii")
+    return _NO_ALFANUMERICO.sub(" ", sin_acentos).strip()
+
+def trigramas(texto, prefijo=False):
+    """Retorna el conjunto de trigramas de las palabras de un texto.
+    Cada palabra se rellena con dos espacios al comienzo y uno al final, de
+    modo que los primeros trigramas marcan el inicio de la palabra.
+    Args:
+    texto (str): El texto, ya normalizado.
+    prefijo (bool): Si es True, la última palabra se trata como incompleta
+    (sin el espacio final): 'sil' coincide con 'silla'.
+    Returns: set de str.
+    """
+    palabras = texto.split()
+    resultado = set()
+    for posicion, palabra in enumerate(palabras):
+        final = "" if prefijo and posicion == len(palabras) - 1 else " "
+        relleno = "  " + palabra + final
+        resultado.update(relleno[i:i + 3] for i in range(len(relleno) - 2))
+    return resultado
+
+class IndiceNombres:
+    """Índice invertido de trigramas sobre nombres, identificados por ID."""
+    __slots__ = ("nombres", "_listas")
+
+    def __init__(self):
+        self.nombres = {}   # id -> (nombre, cantidad de trigramas)
+        self._listas = {}   # trigrama -> set de IDs
+
+    def __len__(self):
+        return len(self.nombres)
+
+    def agregar(self, id_fila, nombre):
+        """Agrega o reemplaza el nombre de un ID.
+        Args: id_fila (int): El ID. nombre (str): El nombre tal como se muestra.
+        Returns: no tiene
+        """
+        self.quitar(id_fila)
+        propios = trigramas(normalizar(nombre))
+        self.nombres[id_fila] = (nombre, len(propios))
+        for trigrama in propios:
+            self._listas.setdefault(trigrama, set()).add(id_fila)
+
+    def quitar(self, id_fila):
+        """Quita un ID del índice, si estaba.
+        Args: id_fila (int): El ID.
+        Returns: no tiene
+        """
+        anterior = self.nombres.pop(id_fila, None)
+        if anterior is None:
+            return
+        for trigrama in trigramas(normalizar(anterior[0])):
+            lista = self._listas[trigrama]
+            lista.discard(id_fila)
+            if not lista:
+                del self._listas[trigrama]
+
+    def buscar(self, texto, limite=LIMITE_SUGERENCIAS, umbral=UMBRAL_SIMILITUD):
+        """Busca los nombres más parecidos a un texto que puede estar incompleto o mal escrito.
+        El puntaje es la fracción de los trigramas del texto que tiene el
+        nombre; a igual puntaje gana el nombre más parecido en largo. Primero
+        se buscan los nombres que tienen todos los trigramas (intersección
+        de conjuntos); solo si no alcanzan para `limite` se cuentan las
+        coincidencias parciales, que toleran errores de tipeo.
+        Args:
+        texto (str): Lo que escribió el usuario.
+        limite (int): Máximo de resultados.
+        umbral (float): Puntaje mínimo, entre 0 y 1.
+        Returns: Lista de modelos.Sugerencia, de mayor a menor puntaje.
+        """
+        consulta = trigramas(normalizar(texto), prefijo=True)
+        if not consulta:
+            return []
+        listas = sorted((self._listas.get(trigrama, frozenset()) for trigrama in consulta), key=len)
+        total = len(listas)
+        coincidencias = dict.fromkeys(listas[0].intersection(*listas[1:]), total)
+        if len(coincidencias) < limite:
+            # Un nombre con `necesarios` trigramas en común está en alguna
+            # de las listas más cortas: solo esos son candidatos.
+            necesarios = max(1, math.ceil(umbral * total))
+            candidatos = set().union(*listas[:total - necesarios + 1])
+            conteo = Counter()
+            for lista in listas:
+                conteo.update(candidatos.intersection(lista))
+            coincidencias = {id_fila: comunes for id_fila, comunes in conteo.items() if comunes >= necesarios}
+        nombres = self.nombres
+        mejores = heapq.nsmallest(limite, coincidencias.items(),
+                                  key=lambda par: (-par[1], nombres[par[0]][1] - par[1], nombres[par[0]][0]))
+        return [modelos.Sugerencia(id_fila, nombres[id_fila][0], comunes / total) for id_fila, comunes in mejores]
+
+_lock = threading.Lock()
+_estado = None
+
+def _nuevo_estado():
+    """Índices vacíos para la base activa, a completar desde el cursor 0."""
+    return {"base": db.DB_NAME, "cursor": 0, "productos": IndiceNombres(), "categorias": IndiceNombres()}
+
+def _aplicar_cambios(estado):
+    """Aplica a los índices los cambios posteriores a su cursor, de a bloques."""
+    while True:
+        cambios, cursor = db.obtener_cambios_db(estado["cursor"], limite=5000)
+        if not cambios:
+            return
+        for cambio in cambios:
+            indice = estado[cambio.tabla]
+            if cambio.fila is None:
+                indice.quitar(cambio.fila_id)
+            else:
+                indice.agregar(cambio.fila_id, cambio.fila.nombre)
+        estado["cursor"] = cursor
+
+def _indices_actualizados():
+    """Retorna los índices (productos, categorias) de la base activa, con los cambios nuevos aplicados."""
+    global _estado
+    with _lock:
+        if _estado is None or _estado["base"] != db.DB_NAME:
+            _estado = _nuevo_estado()
+        if db.ultima_secuencia_cambios_db() != _estado["cursor"]:
+            try:
+                _aplicar_cambios(_estado)
+            except db.CursorVencidoError:
+                # Se purgaron bajas que el índice no llegó a ver: se arma de nuevo.
+                _estado = _nuevo_estado()
+                _aplicar_cambios(_estado)
+        return _estado["productos"], _estado["categorias"]
+
+def sugerir_productos(texto, limite=LIMITE_SUGERENCIAS):
+    """Busca productos por nombre, aceptando el comienzo de las palabras y errores de tipeo.
+    Args: texto (str): Lo que escribió el usuario. limite (int): Máximo de resultados.
+    Returns: Lista de modelos.Sugerencia (id, nombre, puntaje), de mayor a menor puntaje.
+    """
+    return _indices_actualizados()[0].buscar(texto, limite)
+
+def sugerir_categorias(texto, limite=LIMITE_SUGERENCIAS):
+    """Busca categorías por nombre, aceptando el comienzo de las palabras y errores de tipeo.
+    Args: texto (str): Lo que escribió el usuario. limite (int): Máximo de resultados.
+    Returns: Lista de modelos.Sugerencia (id, nombre, puntaje), de mayor a menor puntaje.
+    """
+    return _indices_actualizados()[1].buscar(texto, limite)
@@ -2,16 +2,23 @@
 """
 Módulo para gestionar operaciones de inventario, como reportes de stock.
 Responsable de generar reportes de productos con stock bajo,
-permitiendo al usuario establecer un límite de cantidad.
+permitiendo al usuario establecer un límite de cantidad, los reportes
+de valor de stock, ranking de productos y distribución de precios, y la
+consulta del libro de movimientos de cada producto (kardex). También
+permite fijar los umbrales de reposición que usa vigilante_stock.
 """
+from datetime import datetime, timedelta
 import database as db
 import ui
+import exportador
+import productos
 
 def generar_reporte_stock_bajo():
     """
     Guía al usuario para generar un reporte de productos con stock bajo.
     Solicita un límite de cantidad y muestra los productos que cumplen con ese criterio.
-    Si no hay productos con stock bajo, muestra un mensaje informativo. 
+    Si no hay productos con stock bajo, muestra un mensaje informativo.
+    Al terminar, ofrece exportar el reporte a un archivo.
     Args: no tiene
     Returns: no tiene
     """
@@ -28,5 +35,141 @@ def generar_reporte_stock_bajo():
         except ValueError:
             ui.mostrar_mensaje_error("Debe ingresar un número entero válido.")
 
-    productos_bajos_stock = db.obtener_productos_por_stock_db(limite)
-    ui.mostrar_reporte_stock(productos_bajos_stock, limite)
\ No newline at end of file
+    ui.mostrar_reporte_stock_paginado(
+        lambda clave, anterior: db.obtener_pagina_productos_por_stock_db(limite, clave, anterior=anterior),
+        limite
+    )
+
+    if ui.obtener_input("¿Desea exportar el reporte a un archivo? (s/n): ").lower() == 's':
+        exportador.exportar_a_archivo(limite)
+
+def generar_reporte_valor_por_categoria():
+    """Muestra el valor de stock (cantidad * precio) y la cantidad de productos de cada categoría.
+    Args: no tiene
+    Returns: no tiene
+    """
+    ui.mostrar_reporte_valor_por_categoria(db.resumen_por_categoria_db(), db.totales_inventario_db())
+
+def generar_ranking_por_valor():
+    """Pide cuántos productos mostrar y muestra los de mayor valor de stock.
+    Args: no tiene
+    Returns: no tiene
+    """
+    while True:
+        try:
+            cantidad = int(ui.obtener_input("¿Cuántos productos desea ver?: "))
+            if cantidad > 0:
+                break
+            ui.mostrar_mensaje_error("Debe ingresar un número mayor a cero.")
+        except ValueError:
+            ui.mostrar_mensaje_error("Debe ingresar un número entero válido.")
+    ui.mostrar_top_productos_valor(db.top_productos_por_valor_db(cantidad))
+
+def generar_distribucion_precios():
+    """Muestra cuántos productos hay en cada rango de precios.
+    Args: no tiene
+    Returns: no tiene
+    """
+    ui.mostrar_distribucion_precios(db.distribucion_precios_db())
+
+def generar_kardex_producto():
+    """Pide un producto y muestra sus últimos movimientos de stock con el saldo.
+    Args: no tiene
+    Returns: no tiene
+    """
+    id_prod = productos.seleccionar_producto("consultar")
+    if id_prod is None:
+        return
+    ui.mostrar_kardex(db.obtener_producto_por_id_db(id_prod), db.kardex_producto_db(id_prod))
+
+def generar_stock_a_fecha():
+    """Pide un producto y una fecha, y muestra el stock que tenía al final de ese día.
+    Args: no tiene
+    Returns: no tiene
+    """
+    id_prod = productos.seleccionar_producto("consultar")
+    if id_prod is None:
+        return
+    while True:
+        fecha_str = ui.obtener_input("Ingrese la fecha (AAAA-MM-DD): ")
+        try:
+            dia = datetime.strptime(fecha_str, "%Y-%m-%d")
+            break
+        except ValueError:
+            ui.mostrar_mensaje_error("Fecha inválida. Use el formato AAAA-MM-DD.")
+    fin_del_dia = int((dia + timedelta(days=1)).timestamp()) - 1
+    stock = db.stock_a_fecha_db(id_prod, fin_del_dia)
+    ui.mostrar_mensaje_info(f"Stock al cierre del {fecha_str}: {stock} unidades.")
+
+def _pedir_umbral():
+    """Pide un umbral entero y no negativo; una entrada vacía retorna None (quitar el umbral)."""
+    while True:
+        umbral_str = ui.obtener_input("Ingrese el umbral de reposición (vacío para quitarlo): ")
+        if not umbral_str:
+            return None
+        try:
+            umbral = int(umbral_str)
+            if umbral >= 0:
+                return umbral
+            ui.mostrar_mensaje_error("El umbral no puede ser un número negativo.")
+        except ValueError:
+            ui.mostrar_mensaje_error("Debe ingresar un número entero válido.")
+
+def configurar_umbrales():
+    """Fija el umbral de reposición de un producto o de una categoría y muestra los productos bajo umbral.
+    El umbral del producto tiene prioridad sobre el de su categoría.
+    Args: no tiene
+    Returns: no tiene
+    """
+    destino = ui.obtener_input("¿Umbral de un producto (p) o de una categoría (c)? ").lower()
+    if destino == 'p':
+        id_prod = productos.seleccionar_producto("configurar")
+        if id_prod is None:
+            return
+        db.fijar_umbral_producto_db(id_prod, _pedir_umbral())
+    elif destino == 'c':
+        categorias = db.obtener_categorias_db()
+        if not ui.mostrar_lista_categorias(categorias):
+            return
+        ids_validos = {id_cat for id_cat, _ in categorias}
+        while True:
+            try:
+                id_cat = int(ui.obtener_input("Ingrese el ID de la categoría: "))
+                if id_cat in ids_validos:
+                    break
+                ui.mostrar_mensaje_error("ID de categoría no válido.")
+            except ValueError:
+                ui.mostrar_mensaje_error("Debe ingresar un ID numérico.")
+        db.fijar_umbral_categoria_db(id_cat, _pedir_umbral())
+    else:
+        ui.mostrar_mensaje_error("Opción inválida.")
+        return
+    ui.mostrar_mensaje_exito("Umbral actualizado.")
+    ui.mostrar_productos_bajo_umbral(db.productos_bajo_umbral_db())
+
+def gestionar_reportes():
+    """Muestra el menú de reportes de inventario y maneja las opciones.
+    Args: no tiene
+    Returns: no tiene
+    """
+    while True:
+        ui.mostrar_menu_reportes()
+        opcion = ui.obtener_input("Seleccione una opción: ")
+        if opcion == '1':
+            generar_reporte_stock_bajo()
+        elif opcion == '2':
+            generar_reporte_valor_por_categoria()
+        elif opcion == '3':
+            generar_ranking_por_valor()
+        elif opcion == '4':
+            generar_distribucion_precios()
+        elif opcion == '5':
+            generar_kardex_producto()
+        elif opcion == '6':
+            generar_stock_a_fecha()
+        elif opcion == '7':
+            configurar_umbrales()
+        elif opcion == '8':
+            break
+        else:
+            ui.mostrar_mensaje_error("Opción inválida.")
@@ -1,38 +1,84 @@
  # main.py
 """
 Módulo principal y punto de entrada para la aplicación de gestión. 🚀
+Para que el arranque sea rápido, la interfaz (ui, colorama) se importa
+solo en el modo interactivo, y cada submenú (productos, categorias,
+inventario, depositos) recién cuando se elige: los subcomandos no los cargan.
 """
-from colorama import init
+import argparse
+import os
+import sys
 import database as db
-import ui
-import productos
-import categorias
-import inventario
+import cli
 
-def main():
+def parsear_argumentos(argv=None):
+    """Procesa las opciones de la línea de comandos.
+    Args: argv (list): Los argumentos; None para usar sys.argv.
+    Returns: argparse.Namespace con las opciones elegidas.
+    """
+    parser = argparse.ArgumentParser(description="Sistema de Gestión de Inventario")
+    parser.add_argument("--profile", nargs="?", const="", metavar="ARCHIVO.json",
+                        help="Mide cada función de la capa de datos y muestra un resumen al salir "
+                             "(o lo guarda en ARCHIVO.json).")
+    parser.add_argument("--sin-color", action="store_true",
+                        help="Muestra todo en texto plano, sin colores (también con la variable NO_COLOR).")
+    parser.add_argument("--sin-paginador", action="store_true",
+                        help="No pasa las tablas largas por el paginador ($PAGER o 'less').")
+    parser.add_argument("--modo-reportes", type=float, nargs="?", const=5.0, metavar="SEGUNDOS",
+                        help="Lee los listados y reportes de una instantánea de la base, refrescada cada "
+                             "SEGUNDOS si hubo cambios (por defecto 5; 0 para no refrescarla).")
+    cli.agregar_subcomandos(parser, incluir_batch=True)
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """
     Ejecuta el ciclo de vida principal de la aplicación.
-    Args: no tiene
+    Args: argv (list): Argumentos de la línea de comandos; None para usar sys.argv.
     Returns: no tiene
     Descripción: Inicializa la base de datos, muestra el menú principal y
-    gestiona las interacciones del usuario hasta que decida salir.
+    gestiona las interacciones del usuario hasta que decida salir. Si se
+    indica un subcomando (ver cli.py), lo ejecuta sin menú y termina.
     """
+    argumentos = parsear_argumentos(argv)
+    if argumentos.profile is not None:
+        import perfilador
+        perfilador.activar(argumentos.profile or None)
 
-    init(autoreset=True)
     db.inicializar_db()
+    if argumentos.modo_reportes is not None:
+        db.activar_modo_reportes(argumentos.modo_reportes or None)
+
+    if argumentos.comando is not None:
+        codigo = cli.ejecutar(argumentos)
+        db.cerrar_conexiones()
+        sys.exit(codigo)
+
+    from colorama import init
+    import ui
+
+    color = not argumentos.sin_color and "NO_COLOR" not in os.environ
+    init(autoreset=True, strip=not color or None)
+    ui.configurar_salida(color=color, paginador=not argumentos.sin_paginador)
 
     while True:
         ui.mostrar_menu_principal()
         opcion = ui.obtener_input(" Seleccione una opción: ")
 
         if opcion == '1':
+            import productos
             productos.gestionar_productos()
         elif opcion == '2':
+            import categorias
             categorias.gestionar_categorias()
         elif opcion == '3':
-            inventario.generar_reporte_stock_bajo()
+            import inventario
+            inventario.gestionar_reportes()
         elif opcion == '4':
+            import depositos
+            depositos.gestionar_depositos()
+        elif opcion == '5':
             ui.mostrar_mensaje_exito("Saliendo del programa. ¡Gracias!")
+            db.cerrar_conexiones()
             break
         else:
             ui.mostrar_mensaje_error("Opción inválida.")
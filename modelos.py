@@ -0,0 +1,148 @@
+# modelos.py
+"""
+Módulo del modelo de datos: los registros que viajan entre capas. 🧩
+Producto y Categoria son tuplas con nombre: ocupan lo mismo que una tupla
+común (no tienen __dict__ por instancia) y siguen funcionando donde se
+esperaba una tupla (desempaquetado, índices, csv, zip), pero permiten leer
+los campos por nombre, ej: producto.cantidad en lugar de producto[3].
+
+Para resultados muy grandes, LoteProductos guarda las filas por columnas:
+los números en arrays compactos y el nombre de la categoría una sola vez
+por categoría, en lugar de un objeto por campo y por fila.
+"""
+import sys
+from array import array
+from collections import namedtuple
+
+# Se definen con collections.namedtuple (y __slots__ vacíos) en lugar de
+# typing.NamedTuple para no importar typing al arrancar.
+
+class Categoria(namedtuple("Categoria", "id nombre")):
+    """Una categoría de productos."""
+    __slots__ = ()
+
+class Producto(namedtuple("Producto", "id nombre descripcion cantidad precio categoria")):
+    """Un producto con el nombre de su categoría ya resuelto."""
+    __slots__ = ()
+
+class ResumenCategoria(namedtuple("ResumenCategoria", "categoria_id categoria productos unidades valor")):
+    """Totales de una categoría: productos, unidades en stock y valor (cantidad * precio)."""
+    __slots__ = ()
+
+class RangoPrecio(namedtuple("RangoPrecio", "desde hasta productos")):
+    """Cantidad de productos con precio entre `desde` y `hasta` (inclusive)."""
+    __slots__ = ()
+
+class Movimiento(namedtuple("Movimiento", "id fecha motivo delta saldo")):
+    """Un movimiento de stock con el saldo del producto después de aplicarlo.
+    La fecha está en segundos Unix; delta es negativo para las salidas."""
+    __slots__ = ()
+
+class Deposito(namedtuple("Deposito", "id nombre archivo")):
+    """Un depósito con su stock en un archivo SQLite propio."""
+    __slots__ = ()
+
+class StockConsolidado(namedtuple("StockConsolidado", "producto cantidades")):
+    """Un producto con su stock total (producto.cantidad) y el de cada depósito."""
+    __slots__ = ()
+
+class Cambio(namedtuple("Cambio", "secuencia tabla fila_id operacion fila")):
+    """Último cambio de una fila de productos o categorías desde un cursor.
+    operacion es 'A' (alta), 'M' (modificación) o 'B' (baja); fila son los
+    datos actuales (Producto o Categoria), o None si la fila ya no existe."""
+    __slots__ = ()
+
+class Sugerencia(namedtuple("Sugerencia", "id nombre puntaje")):
+    """Un nombre encontrado por indice_nombres, con su puntaje de parecido (0 a 1)."""
+    __slots__ = ()
+
+class BajoUmbral(namedtuple("BajoUmbral", "producto umbral")):
+    """Un producto cuya cantidad no supera su umbral de reposición."""
+    __slots__ = ()
+
+class AlertaStock(namedtuple("AlertaStock", "tipo fecha producto umbral")):
+    """Aviso del vigilante de stock: tipo es 'bajo' (la cantidad llegó al
+    umbral) o 'repuesto' (volvió a superarlo); la fecha en segundos Unix."""
+    __slots__ = ()
+
+_nueva_tupla = tuple.__new__
+
+def fabrica_producto(cursor, fila):
+    """row_factory de sqlite3 que construye un Producto por cada fila.
+    El nombre de la categoría se interna: todas las filas de una misma
+    categoría comparten un único objeto str.
+    Args: cursor (sqlite3.Cursor): El cursor de la consulta. fila (tuple): La fila leída.
+    Returns: Producto
+    """
+    return _nueva_tupla(Producto, (fila[0], fila[1], fila[2], fila[3], fila[4], sys.intern(fila[5])))
+
+def fabrica_categoria(cursor, fila):
+    """row_factory de sqlite3 que construye una Categoria por cada fila."""
+    return _nueva_tupla(Categoria, fila)
+
+def fabrica_deposito(cursor, fila):
+    """row_factory de sqlite3 que construye un Deposito por cada fila."""
+    return _nueva_tupla(Deposito, fila)
+
+def fabrica_movimiento(cursor, fila):
+    """row_factory de sqlite3 que construye un Movimiento por cada fila."""
+    return _nueva_tupla(Movimiento, fila)
+
+class LoteProductos:
+    """Contenedor de productos organizado por columnas.
+    Cada producto ocupa alrededor de la mitad que una lista de tuplas: los
+    campos numéricos se guardan en arrays de enteros de 64 bits y la
+    categoría como un índice a la lista de nombres distintos. Al indexarlo
+    o recorrerlo entrega objetos Producto, creados en el momento.
+    """
+    __slots__ = ("ids", "nombres", "descripciones", "cantidades", "precios",
+                 "indices_categoria", "categorias", "_posiciones_categoria")
+
+    def __init__(self, filas=()):
+        self.ids = array("q")
+        self.nombres = []
+        self.descripciones = []
+        self.cantidades = array("q")
+        self.precios = array("q")
+        self.indices_categoria = array("I")
+        self.categorias = []
+        self._posiciones_categoria = {}
+        self.extender(filas)
+
+    def extender(self, filas):
+        """Agrega filas con el formato (id, nombre, descripcion, cantidad, precio, nombre_categoria).
+        Args: filas (iterable): Tuplas o Productos.
+        Returns: no tiene
+        """
+        posiciones = self._posiciones_categoria
+        for id_prod, nombre, descripcion, cantidad, precio, categoria in filas:
+            posicion = posiciones.get(categoria)
+            if posicion is None:
+                posicion = posiciones[categoria] = len(self.categorias)
+                self.categorias.append(categoria)
+            self.ids.append(id_prod)
+            self.nombres.append(nombre)
+            self.descripciones.append(descripcion)
+            self.cantidades.append(cantidad)
+            self.precios.append(precio)
+            self.indices_categoria.append(posicion)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        return Producto(self.ids[indice], self.nombres[indice], self.descripciones[indice],
+                        self.cantidades[indice], self.precios[indice],
+                        self.categorias[self.indices_categoria[indice]])
+
+    def __iter__(self):
+        categorias = self.categorias
+        for id_prod, nombre, descripcion, cantidad, precio, posicion in zip(
+                self.ids, self.nombres, self.descripciones, self.cantidades,
+                self.precios, self.indices_categoria):
+            yield _nueva_tupla(Producto, (id_prod, nombre, descripcion, cantidad, precio, categorias[posicion]))
+
+    def __repr__(self):
+        return f"<LoteProductos: {len(self)} productos>"
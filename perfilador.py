@@ -0,0 +1,202 @@
+# perfilador.py
+"""
+Módulo de instrumentación opcional de la capa de datos. 🩺
+Al activarlo, envuelve cada función pública de database.py para registrar
+cuántas veces se llama, un histograma de latencias y la cantidad de filas
+que retorna. Además instala en cada conexión un callback de trazas, que
+captura las sentencias SQL ejecutadas, y un callback de progreso, que
+cuenta las instrucciones de la máquina virtual de SQLite por función.
+El resumen se imprime (o se guarda en JSON) al salir del programa.
+"""
+import atexit
+import functools
+import inspect
+import json
+import re
+import sys
+import threading
+import time
+import database as db
+import modelos
+
+# Límites superiores (en milisegundos) de cada casillero del histograma.
+LIMITES_HISTOGRAMA_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, float("inf"))
+PASOS_PROGRESO = 1000
+
+_estadisticas = {}
+_sentencias = {}
+_lock = threading.Lock()
+_local = threading.local()
+_activo = False
+
+def _nueva_estadistica():
+    """Crea el registro vacío de una función instrumentada."""
+    return {
+        "llamadas": 0,
+        "errores": 0,
+        "total_ms": 0.0,
+        "max_ms": 0.0,
+        "filas": 0,
+        "pasos_vm": 0,
+        "histograma": [0] * len(LIMITES_HISTOGRAMA_MS),
+    }
+
+def _contar_filas(resultado):
+    """Estima la cantidad de filas de un resultado de database.py.
+    Args: resultado: Lo que retornó la función.
+    Returns: int o None si el resultado no representa filas (ej: un conteo).
+    """
+    if resultado is None:
+        return 0
+    if isinstance(resultado, (list, modelos.LoteProductos)):
+        return len(resultado)
+    if isinstance(resultado, tuple):
+        # Las funciones de paginación retornan (filas, hay_mas).
+        if resultado and isinstance(resultado[0], list):
+            return len(resultado[0])
+        return 1
+    return None
+
+def _funcion_actual():
+    """Retorna el nombre de la función instrumentada en curso en este hilo."""
+    pila = getattr(_local, "pila", None)
+    return pila[-1] if pila else "(fuera de database.py)"
+
+def _registrar(nombre, milisegundos, filas, error):
+    """Acumula una llamada en las estadísticas de la función."""
+    with _lock:
+        estadistica = _estadisticas.setdefault(nombre, _nueva_estadistica())
+        estadistica["llamadas"] += 1
+        estadistica["errores"] += int(error)
+        estadistica["total_ms"] += milisegundos
+        estadistica["max_ms"] = max(estadistica["max_ms"], milisegundos)
+        if filas:
+            estadistica["filas"] += filas
+        for indice, limite in enumerate(LIMITES_HISTOGRAMA_MS):
+            if milisegundos <= limite:
+                estadistica["histograma"][indice] += 1
+                break
+
+def _instrumentar(nombre, funcion):
+    """Retorna una versión de la función que registra sus métricas.
+    Los generadores se envuelven para contar las filas a medida que se consumen.
+    """
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        pila = _local.__dict__.setdefault("pila", [])
+        pila.append(nombre)
+        inicio = time.perf_counter()
+        error = False
+        filas = None
+        try:
+            resultado = funcion(*args, **kwargs)
+            if inspect.isgenerator(resultado):
+                return _envolver_generador(nombre, resultado)
+            filas = _contar_filas(resultado)
+            return resultado
+        except Exception:
+            error = True
+            raise
+        finally:
+            pila.pop()
+            _registrar(nombre, (time.perf_counter() - inicio) * 1000, filas, error)
+
+    envoltura.__perfilada__ = True
+    return envoltura
+
+def _envolver_generador(nombre, generador):
+    """Cuenta las filas que produce un generador de database.py."""
+    filas = 0
+    inicio = time.perf_counter()
+    try:
+        for fila in generador:
+            filas += 1
+            yield fila
+    finally:
+        _registrar(nombre + " (consumo)", (time.perf_counter() - inicio) * 1000, filas, False)
+
+def _normalizar_sql(sql):
+    """Colapsa los espacios de una sentencia para agruparla en el resumen."""
+    return re.sub(r"\s+", " ", sql).strip()
+
+def _traza(sql):
+    """Callback de trazas de sqlite3: cuenta cada sentencia por función."""
+    clave = (_funcion_actual(), _normalizar_sql(sql))
+    with _lock:
+        _sentencias[clave] = _sentencias.get(clave, 0) + 1
+
+def _progreso():
+    """Callback de progreso de sqlite3: acumula pasos de la VM por función."""
+    nombre = _funcion_actual()
+    with _lock:
+        estadistica = _estadisticas.setdefault(nombre, _nueva_estadistica())
+        estadistica["pasos_vm"] += PASOS_PROGRESO
+    return 0
+
+def _configurar_conexion(conn):
+    """Instala los callbacks de trazas y de progreso en una conexión."""
+    conn.set_trace_callback(_traza)
+    conn.set_progress_handler(_progreso, PASOS_PROGRESO)
+
+def activar(salida=None):
+    """Activa la instrumentación de database.py para el resto del proceso.
+    Args: salida (str): Ruta de un archivo JSON donde guardar el resumen al
+    salir, o None para imprimirlo en la salida de errores.
+    Returns: no tiene
+    """
+    global _activo
+    if _activo:
+        return
+    _activo = True
+    for nombre, funcion in list(vars(db).items()):
+        if (nombre.startswith("_") or not inspect.isfunction(funcion)
+                or funcion.__module__ != db.__name__ or getattr(funcion, "__perfilada__", False)):
+            continue
+        setattr(db, nombre, _instrumentar(nombre, funcion))
+    db.registrar_configurador_conexion(_configurar_conexion)
+    atexit.register(lambda: volcar_resumen(salida))
+
+def obtener_resumen():
+    """Arma el resumen de todo lo registrado hasta el momento.
+    Returns: Diccionario con 'funciones' (métricas por función, ordenadas por
+    tiempo total) y 'sentencias' (SQL ejecutado por función y cantidad de veces).
+    """
+    with _lock:
+        funciones = []
+        for nombre, estadistica in _estadisticas.items():
+            llamadas = estadistica["llamadas"]
+            funciones.append({
+                "funcion": nombre,
+                **estadistica,
+                "promedio_ms": estadistica["total_ms"] / llamadas if llamadas else 0.0,
+                "histograma": dict(zip((f"<={limite}ms" for limite in LIMITES_HISTOGRAMA_MS),
+                                       estadistica["histograma"])),
+            })
+        sentencias = [{"funcion": funcion, "sql": sql, "veces": veces}
+                      for (funcion, sql), veces in _sentencias.items()]
+    funciones.sort(key=lambda f: f["total_ms"], reverse=True)
+    sentencias.sort(key=lambda s: s["veces"], reverse=True)
+    return {"funciones": funciones, "sentencias": sentencias}
+
+def volcar_resumen(salida=None):
+    """Imprime el resumen en la salida de errores o lo guarda como JSON.
+    Args: salida (str): Ruta del archivo JSON, o None para imprimir.
+    Returns: no tiene
+    """
+    resumen = obtener_resumen()
+    if salida:
+        with open(salida, "w", encoding="utf-8") as archivo:
+            json.dump(resumen, archivo, indent=2, ensure_ascii=False)
+        return
+
+    print("\n--- Perfil de la capa de datos ---", file=sys.stderr)
+    print(f"{'Función':<42}{'Llamadas':>9}{'Total ms':>11}{'Prom ms':>10}{'Máx ms':>10}{'Filas':>9}{'Pasos VM':>11}",
+          file=sys.stderr)
+    for funcion in resumen["funciones"]:
+        print(f"{funcion['funcion']:<42}{funcion['llamadas']:>9}{funcion['total_ms']:>11.2f}"
+              f"{funcion['promedio_ms']:>10.3f}{funcion['max_ms']:>10.3f}{funcion['filas']:>9}"
+              f"{funcion['pasos_vm']:>11}", file=sys.stderr)
+
+    print("\n--- Sentencias SQL más frecuentes ---", file=sys.stderr)
+    for sentencia in resumen["sentencias"][:20]:
+        print(f"{sentencia['veces']:>7}  [{sentencia['funcion']}] {sentencia['sql'][:100]}", file=sys.stderr)
@@ -8,10 +8,41 @@ import ui
 import sqlite3
 import database as db
 import ui
+import importador
+import exportador
+import indice_nombres
+
+def _elegir_categoria_por_nombre(texto):
+    """Busca la categoría más parecida a un texto y pide confirmarla.
+    Args: texto (str): El nombre, completo o no, con posibles errores de tipeo.
+    Returns: El ID de la categoría confirmada, o None.
+    """
+    sugerencias = indice_nombres.sugerir_categorias(texto, limite=1)
+    if not sugerencias:
+        ui.mostrar_mensaje_error(f"No hay categorías parecidas a '{texto}'.")
+        return None
+    if ui.obtener_input(f"¿Usar la categoría '{sugerencias[0].nombre}'? (s/n): ").lower() == 's':
+        return sugerencias[0].id
+    return None
+
+def _mostrar_sugerencias_productos(texto):
+    """Muestra los productos cuyo nombre se parece a un texto.
+    Args: texto (str): El nombre, completo o no, con posibles errores de tipeo.
+    Returns: bool: True si se encontró alguno.
+    """
+    productos = [db.obtener_producto_por_id_db(sugerencia.id)
+                 for sugerencia in indice_nombres.sugerir_productos(texto)]
+    productos = [producto for producto in productos if producto is not None]
+    if not productos:
+        ui.mostrar_mensaje_error(f"No se encontraron productos con un nombre parecido a '{texto}'.")
+        return False
+    ui.mostrar_lista_productos(productos)
+    return True
 
 def agregar_nuevo_producto():
     """Orquesta la adición de un nuevo producto.
-    Muestra un menú de categorías y permite al usuario seleccionar una o crear una nueva.
+    Muestra un menú de categorías y permite al usuario seleccionar una (por
+    número o escribiendo su nombre, aunque sea incompleto) o crear una nueva.
     Valida que el nombre, descripción, cantidad y precio sean correctos.
     Si la categoría no existe, permite crearla. 
     Args: no tiene
@@ -27,12 +58,18 @@ def agregar_nuevo_producto():
     opcion_crear_nueva = len(categorias) + 1
 
     while True: # Bucle para seleccionar o crear categoría
+        entrada = ui.obtener_input("Seleccione una opción (o escriba el nombre de la categoría): ")
+        if entrada and not entrada.isdigit():
+            categoria_id = _elegir_categoria_por_nombre(entrada)
+            if categoria_id is not None:
+                break
+            continue
         try:
-            opcion_elegida = int(ui.obtener_input("Seleccione una opción: "))
+            opcion_elegida = int(entrada)
             
             if 1 <= opcion_elegida <= len(categorias):
                 # El usuario eligió una categoría existente
-                categoria_id = categorias[opcion_elegida - 1][0]
+                categoria_id = categorias[opcion_elegida - 1].id
                 break
             elif opcion_elegida == opcion_crear_nueva:
                 # El usuario eligió crear una nueva categoría
@@ -96,29 +133,58 @@ def agregar_nuevo_producto():
 
 
  
+def seleccionar_producto(accion):
+    """Pide al usuario el ID de un producto hasta que ingrese uno existente.
+    Cada ID se valida con una búsqueda por clave primaria, sin cargar el
+    catálogo: el costo no depende de la cantidad de productos. El listado
+    solo se muestra si el usuario lo pide con 'L'; si escribe parte de un
+    nombre, se muestran los productos parecidos para que elija el ID.
+    Args: accion (str): Lo que se hará con el producto, ej: 'modificar'.
+    Returns: int: El ID elegido, o None si el usuario canceló con 'S'.
+    """
+    while True:
+        entrada = ui.obtener_input(f"Ingrese el ID o el nombre del producto a {accion} "
+                                   "('L' para ver el listado, 'S' para salir): ")
+        if entrada.upper() == 'S':
+            ui.mostrar_mensaje_info("Operación cancelada.")
+            return None
+        if entrada.upper() == 'L':
+            ui.mostrar_lista_productos_paginada(db.obtener_pagina_productos_db)
+            continue
+        try:
+            id_prod = int(entrada)
+        except ValueError:
+            if entrada:
+                _mostrar_sugerencias_productos(entrada)
+            else:
+                ui.mostrar_mensaje_error("Debe ingresar un ID o un nombre.")
+            continue
+        producto = db.obtener_producto_por_id_db(id_prod)
+        if producto is None:
+            ui.mostrar_mensaje_error("ID de producto no válido.")
+            continue
+        ui.mostrar_lista_productos([producto])
+        return id_prod
+
 def modificar_un_producto():
     """Orquesta la modificación de un producto con validaciones.
-    Muestra una lista de productos y permite al usuario seleccionar uno por ID.
-    Valida que el ID sea correcto y permite modificar nombre, descripción,
+    Permite al usuario seleccionar un producto por ID (ver seleccionar_producto)
+    y luego modificar nombre, descripción,
     cantidad, precio o categoría. Si la categoría no existe, permite crearla.   
+    La cantidad puede fijarse (ej: '12', tras un conteo) o variarse (ej: '-3'
+    por una venta, '+10' por una compra); la variación se aplica con un
+    UPDATE condicional, sin pisar las ventas que otros registren al mismo tiempo.
+    Todos los cambios elegidos se guardan juntos al finalizar.
     Args: no tiene
     Returns: no tiene
     """
-    productos = db.obtener_productos_db()
-    if not ui.mostrar_lista_productos(productos):
+    id_prod = seleccionar_producto("modificar")
+    if id_prod is None:
         return
 
-    while True: # Bucle para seleccionar el producto a modificar
-        try:
-            id_prod_str = ui.obtener_input("Ingrese el ID del producto a modificar: ")
-            id_prod = int(id_prod_str)
-            if id_prod in [p[0] for p in productos]:
-                break
-            else:
-                ui.mostrar_mensaje_error("ID de producto no válido.")
-        except ValueError:
-            ui.mostrar_mensaje_error("Debe ingresar un ID numérico.")
-
+    # Los cambios se acumulan y se guardan juntos, con una sola sentencia, al finalizar.
+    cambios = {}
+    variacion_stock = 0
     while True: # Bucle para seleccionar el campo a modificar
         ui.mostrar_menu_modificar_producto()
         opcion = ui.obtener_input("Seleccione una opción: ")
@@ -127,36 +193,42 @@ def modificar_un_producto():
             while True:
                 nuevo_nombre = ui.obtener_input("Ingrese el nuevo nombre: ")
                 if nuevo_nombre:
-                    db.modificar_producto_db(id_prod, 'nombre', nuevo_nombre)
-                    ui.mostrar_mensaje_exito("Nombre actualizado.")
+                    cambios['nombre'] = nuevo_nombre
+                    ui.mostrar_mensaje_info("Nombre registrado.")
                     break
                 ui.mostrar_mensaje_error("El nombre no puede estar vacío.")
         elif opcion == '2':
             while True:
                 nueva_desc = ui.obtener_input("Ingrese la nueva descripción: ")
                 if nueva_desc:
-                    db.modificar_producto_db(id_prod, 'descripcion', nueva_desc)
-                    ui.mostrar_mensaje_exito("Descripción actualizada.")
+                    cambios['descripcion'] = nueva_desc
+                    ui.mostrar_mensaje_info("Descripción registrada.")
                     break
                 ui.mostrar_mensaje_error("La descripción no puede estar vacía.")
         elif opcion == '3':
             while True:
+                entrada = ui.obtener_input("Ingrese la nueva cantidad, o '+N'/'-N' para sumar o descontar unidades: ")
                 try:
-                    nueva_cant = int(ui.obtener_input("Ingrese la nueva cantidad: "))
-                    if nueva_cant >= 0:
-                        db.modificar_producto_db(id_prod, 'cantidad', nueva_cant)
-                        ui.mostrar_mensaje_exito("Cantidad actualizada.")
-                        break
-                    ui.mostrar_mensaje_error("La cantidad no puede ser negativa.")
+                    valor = int(entrada)
                 except ValueError:
                     ui.mostrar_mensaje_error("Debe ingresar un número entero.")
+                    continue
+                if entrada[0] in '+-':
+                    variacion_stock = valor
+                    cambios.pop('cantidad', None)
+                    ui.mostrar_mensaje_info("Variación de stock registrada.")
+                    break
+                cambios['cantidad'] = valor
+                variacion_stock = 0
+                ui.mostrar_mensaje_info("Cantidad registrada.")
+                break
         elif opcion == '4':
             while True:
                 try:
                     nuevo_precio = int(ui.obtener_input("Ingrese el nuevo precio: "))
                     if nuevo_precio >= 0:
-                        db.modificar_producto_db(id_prod, 'precio', nuevo_precio)
-                        ui.mostrar_mensaje_exito("Precio actualizado.")
+                        cambios['precio'] = nuevo_precio
+                        ui.mostrar_mensaje_info("Precio registrado.")
                         break
                     ui.mostrar_mensaje_error("El precio no puede ser negativo.")
                 except ValueError:
@@ -170,9 +242,9 @@ def modificar_un_producto():
                 try:
                     num_cat = int(ui.obtener_input("Seleccione el número: "))
                     if 1 <= num_cat <= len(categorias):
-                        nueva_cat_id = categorias[num_cat - 1][0]
-                        db.modificar_producto_db(id_prod, 'categoria_id', nueva_cat_id)
-                        ui.mostrar_mensaje_exito("Categoría actualizada.")
+                        nueva_cat_id = categorias[num_cat - 1].id
+                        cambios['categoria_id'] = nueva_cat_id
+                        ui.mostrar_mensaje_info("Categoría registrada.")
                         break
                     # Lógica para crear categoría al modificar  
                     elif num_cat == opcion_crear:
@@ -180,8 +252,8 @@ def modificar_un_producto():
                             nombre_cat = ui.obtener_input("Ingrese el nombre de la nueva categoría: ")
                             if nombre_cat:
                                 nueva_cat_id = db.agregar_categoria_db(nombre_cat)
-                                db.modificar_producto_db(id_prod, 'categoria_id', nueva_cat_id)
-                                ui.mostrar_mensaje_exito("Categoría creada y producto actualizado.")
+                                cambios['categoria_id'] = nueva_cat_id
+                                ui.mostrar_mensaje_exito("Categoría creada.")
                                 break
                             else:
                                 ui.mostrar_mensaje_error("El nombre no puede estar vacío.")
@@ -195,51 +267,60 @@ def modificar_un_producto():
                 break
 
         elif opcion == '6':
-            ui.mostrar_mensaje_info("Modificación finalizada.")
             break
         else:
             ui.mostrar_mensaje_error("Opción inválida.")
 
+    if cambios or variacion_stock:
+        try:
+            with db.transaccion():
+                if variacion_stock < 0:
+                    db.descontar_stock_db(id_prod, -variacion_stock)
+                elif variacion_stock > 0:
+                    db.registrar_movimientos_db([(id_prod, variacion_stock, db.MOTIVO_COMPRA)])
+                db.modificar_producto_campos_db(id_prod, cambios)
+        except ValueError as error:
+            # db.StockInsuficienteError (no alcanza el stock para el descuento)
+            # o el ValueError de registrar_movimientos_db si, por ejemplo,
+            # otro usuario eliminó el producto mientras se editaba.
+            ui.mostrar_mensaje_error(f"{error}. No se guardó ningún cambio.")
+            return
+        ui.mostrar_mensaje_exito("Producto actualizado.")
+    else:
+        ui.mostrar_mensaje_info("Modificación finalizada.")
+
 
 def eliminar_un_producto():
     """Orquesta la eliminación de un producto por ID.
-    Muestra una lista de productos y permite al usuario seleccionar uno por ID.
-    Valida que el ID sea correcto y elimina el producto.
+    Permite al usuario seleccionar un producto por ID (ver seleccionar_producto)
+    y lo elimina.
     Si la eliminación es exitosa, muestra un mensaje de éxito.  
     Args: no tiene
     Returns: no tiene"""
-    productos = db.obtener_productos_db()
-    if not ui.mostrar_lista_productos(productos):
+    id_prod = seleccionar_producto("eliminar")
+    if id_prod is None:
         return
-    while True:
-        id_prod_str = ui.obtener_input("Ingrese el ID del producto a eliminar (o 'S' para salir): ")
-        if id_prod_str.upper() == 'S':
-            ui.mostrar_mensaje_info("Operación cancelada.")
-            return
-        try:
-            id_prod = int(id_prod_str)
-            if id_prod in [p[0] for p in productos]:
-                db.eliminar_producto_db(id_prod)
-                ui.mostrar_mensaje_exito("Producto eliminado.")
-                return
-            else:
-                ui.mostrar_mensaje_error("ID de producto no válido.")
-        except ValueError:
-            ui.mostrar_mensaje_error("Entrada no válida.")
+    db.eliminar_producto_db(id_prod)
+    ui.mostrar_mensaje_exito("Producto eliminado.")
 
 def buscar_un_producto():
-    """Orquesta la búsqueda de un producto por su ID.
-    Permite al usuario ingresar un ID y muestra los detalles del producto si existe.
-    Si el ID no es válido o el producto no se encuentra, muestra un mensaje de error.
+    """Orquesta la búsqueda de un producto por su ID o por su nombre.
+    Si se ingresa un número, muestra el producto con ese ID. Si se ingresa
+    texto, muestra los productos de nombre más parecido, aunque el texto
+    esté incompleto o tenga errores de tipeo (ver indice_nombres).
+    Si no se encuentra nada, muestra un mensaje de error.
     Args: no tiene
     Returns: no tiene
     """
-    try:
-        id_buscado = int(ui.obtener_input("Ingrese el ID del producto a buscar: "))
-    except ValueError:
-        ui.mostrar_mensaje_error("Debe ingresar un ID numérico.")
+    entrada = ui.obtener_input("Ingrese el ID o el nombre del producto a buscar: ")
+    if not entrada:
+        ui.mostrar_mensaje_error("Debe ingresar un ID o un nombre.")
+        return
+    if not entrada.isdigit():
+        _mostrar_sugerencias_productos(entrada)
         return
 
+    id_buscado = int(entrada)
     producto_encontrado = db.obtener_producto_por_id_db(id_buscado)
 
     if producto_encontrado:
@@ -248,9 +329,158 @@ def buscar_un_producto():
     else:
         ui.mostrar_mensaje_error(f"No se encontró ningún producto con el ID {id_buscado}.")
 
+def buscar_productos_por_texto():
+    """Orquesta la búsqueda de productos por nombre o descripción.
+    Permite al usuario ingresar una o más palabras (se buscan como prefijo)
+    y muestra los productos que las contienen, ordenados por relevancia.
+    Args: no tiene
+    Returns: no tiene
+    """
+    texto = ui.obtener_input("Ingrese el texto a buscar: ")
+    if not texto:
+        ui.mostrar_mensaje_error("El texto no puede estar vacío.")
+        return
+
+    resultados = db.buscar_productos_texto_db(texto)
+    if resultados:
+        ui.mostrar_mensaje_exito(f"Se encontraron {len(resultados)} productos:")
+        ui.mostrar_lista_productos(resultados)
+    else:
+        ui.mostrar_mensaje_error(f"No se encontraron productos para '{texto}'.")
+
+def ajustar_precios_por_categoria():
+    """Orquesta el ajuste porcentual de precios de toda una categoría.
+    Muestra las categorías, pide el ID y el porcentaje (positivo para subir,
+    negativo para bajar) y aplica el cambio a todos sus productos a la vez.
+    Args: no tiene
+    Returns: no tiene
+    """
+    categorias = db.obtener_categorias_db()
+    if not ui.mostrar_lista_categorias(categorias):
+        return
+    ids_validos = {id_cat for id_cat, _ in categorias}
+
+    while True:
+        try:
+            id_cat = int(ui.obtener_input("Ingrese el ID de la categoría: "))
+            if id_cat in ids_validos:
+                break
+            ui.mostrar_mensaje_error("ID de categoría no válido.")
+        except ValueError:
+            ui.mostrar_mensaje_error("Debe ingresar un ID numérico.")
+
+    while True:
+        try:
+            porcentaje = float(ui.obtener_input("Ingrese el porcentaje de ajuste (ej: 10 o -5): "))
+            if porcentaje >= -100:
+                break
+            ui.mostrar_mensaje_error("El porcentaje no puede ser menor a -100.")
+        except ValueError:
+            ui.mostrar_mensaje_error("Debe ingresar un número.")
+
+    modificados = db.ajustar_precios_categoria_db(id_cat, porcentaje)
+    ui.mostrar_mensaje_exito(f"Precio actualizado en {modificados} productos.")
+
+def actualizar_cantidades_por_lote():
+    """Orquesta la actualización de stock de varios productos a la vez.
+    Pide pares 'ID cantidad', uno por línea, hasta recibir una línea vacía,
+    y los guarda todos juntos en una sola transacción.
+    Args: no tiene
+    Returns: no tiene
+    """
+    ui.mostrar_mensaje_info("Ingrese 'ID cantidad' por línea. Deje la línea vacía para terminar.")
+    pares = []
+    while True:
+        linea = ui.obtener_input("> ")
+        if not linea:
+            break
+        try:
+            id_prod, cantidad = (int(valor) for valor in linea.split())
+        except ValueError:
+            ui.mostrar_mensaje_error("Formato inválido. Use: ID cantidad")
+            continue
+        if cantidad < 0:
+            ui.mostrar_mensaje_error("La cantidad no puede ser negativa.")
+            continue
+        pares.append((id_prod, cantidad))
+
+    if not pares:
+        ui.mostrar_mensaje_info("No se ingresaron cambios.")
+        return
+
+    modificados = db.actualizar_cantidades_db(pares)
+    ui.mostrar_mensaje_exito(f"Cantidad actualizada en {modificados} productos.")
+    if modificados < len(pares):
+        ui.mostrar_mensaje_error(f"{len(pares) - modificados} IDs no corresponden a productos existentes.")
+
+def pedir_movimientos_de_stock():
+    """Pide líneas 'ID cantidad motivo' (cantidad positiva para una entrada,
+    negativa para una salida) hasta recibir una línea vacía.
+    Args: no tiene
+    Returns: Lista de tuplas (id_prod, delta, motivo); vacía si no se ingresó ninguna.
+    """
+    ui.mostrar_mensaje_info("Ingrese 'ID cantidad motivo' por línea (ej: '7 -3 Venta'). Deje la línea vacía para terminar.")
+    movimientos = []
+    while True:
+        linea = ui.obtener_input("> ")
+        if not linea:
+            break
+        partes = linea.split(maxsplit=2)
+        try:
+            id_prod, delta = int(partes[0]), int(partes[1])
+            motivo = partes[2]
+        except (ValueError, IndexError):
+            ui.mostrar_mensaje_error("Formato inválido. Use: ID cantidad motivo")
+            continue
+        if delta == 0:
+            ui.mostrar_mensaje_error("La cantidad no puede ser cero.")
+            continue
+        movimientos.append((id_prod, delta, motivo))
+    if not movimientos:
+        ui.mostrar_mensaje_info("No se ingresaron movimientos.")
+    return movimientos
+
+def registrar_movimientos_de_stock():
+    """Orquesta el registro de entradas y salidas de stock de varios productos.
+    Pide los movimientos (ver pedir_movimientos_de_stock) y los registra
+    todos juntos en el libro de movimientos.
+    Args: no tiene
+    Returns: no tiene
+    """
+    movimientos = pedir_movimientos_de_stock()
+    if not movimientos:
+        return
+
+    try:
+        registrados = db.registrar_movimientos_db(movimientos)
+    except ValueError as error:
+        ui.mostrar_mensaje_error(f"{error}. No se registró ningún movimiento.")
+        return
+    ui.mostrar_mensaje_exito(f"Se registraron {registrados} movimientos de stock.")
+
+def actualizacion_masiva():
+    """Muestra el submenú de actualización masiva y maneja las opciones.
+    Args: no tiene
+    Returns: no tiene
+    """
+    while True:
+        ui.mostrar_menu_actualizacion_masiva()
+        opcion = ui.obtener_input("Seleccione una opción: ")
+        if opcion == '1':
+            ajustar_precios_por_categoria()
+        elif opcion == '2':
+            actualizar_cantidades_por_lote()
+        elif opcion == '3':
+            registrar_movimientos_de_stock()
+        elif opcion == '4':
+            break
+        else:
+            ui.mostrar_mensaje_error("Opción inválida.")
+
 def gestionar_productos():
     """Muestra el menú de gestión de productos y maneja las opciones.
-    Permite al usuario agregar, modificar, eliminar, buscar o listar productos.
+    Permite al usuario agregar, modificar, eliminar, buscar (por ID o por
+    texto), listar, importar o exportar productos o actualizarlos en masa.
     Args: no tiene
     Returns: no tiene
     """
@@ -262,12 +492,20 @@ def gestionar_productos():
         elif opcion == '2':
             modificar_un_producto()
         elif opcion == '3':
-            ui.mostrar_lista_productos(db.obtener_productos_db())
+            ui.mostrar_lista_productos_paginada(db.obtener_pagina_productos_db)
         elif opcion == '4':
             buscar_un_producto()
         elif opcion == '5':
             eliminar_un_producto()
         elif opcion == '6':
+            importador.importar_desde_archivo()
+        elif opcion == '7':
+            buscar_productos_por_texto()
+        elif opcion == '8':
+            actualizacion_masiva()
+        elif opcion == '9':
+            exportador.exportar_a_archivo()
+        elif opcion == '10':
             break
         else:
             ui.mostrar_mensaje_error(" Opción inválida.")
\ No newline at end of file
@@ -0,0 +1,389 @@
+# servidor.py
+"""
+Módulo del servicio HTTP/JSON del inventario. 🌐
+Expone los productos, las categorías y el reporte de stock bajo como
+endpoints JSON, para que varias terminales consulten una única base sin
+abrir el archivo cada una. Usa solo la biblioteca estándar: las peticiones
+se atienden en un grupo acotado de hilos, cada uno con su propia conexión
+del pool de database.py.
+
+Las respuestas GET llevan un ETag derivado de database.version_datos_db():
+si el cliente envía If-None-Match con el mismo valor y nadie escribió en la
+base desde entonces, se responde 304 sin consultar ni serializar nada.
+
+Endpoints:
+    GET    /categorias
+    GET    /productos?tamano=N&cursor=C      (paginado por nombre)
+    GET    /productos/<id>
+    POST   /productos                        (JSON con nombre, descripcion, cantidad, precio, categoria)
+    PATCH  /productos/<id>                   (JSON con los campos a modificar)
+    DELETE /productos/<id>
+    GET    /buscar?q=TEXTO&limite=N
+    GET    /stock-bajo?limite=N&tamano=N&cursor=C
+"""
+import argparse
+import base64
+import json
+import secrets
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+import database as db
+
+HILOS_POR_DEFECTO = 8
+MAX_TAMANO_PAGINA = 500
+MAX_CUERPO_BYTES = 1024 * 1024
+TIMEOUT_CONEXION_S = 5
+# Rango de INTEGER en SQLite: un entero de Python fuera de él hace que
+# sqlite3 levante OverflowError al pasarlo como parámetro.
+MIN_ENTERO_SQLITE = -2 ** 63
+MAX_ENTERO_SQLITE = 2 ** 63 - 1
+
+class ErrorDePeticion(Exception):
+    """Error que se responde al cliente con el estado HTTP indicado."""
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+def _producto_a_dict(fila):
+    """Convierte un modelos.Producto en un diccionario con nombres de campo."""
+    return fila._asdict()
+
+def _codificar_cursor(clave):
+    """Convierte la clave de la última fila de una página en un cursor opaco."""
+    return base64.urlsafe_b64encode(json.dumps(list(clave)).encode("utf-8")).decode("ascii")
+
+def _es_entero_sqlite(valor):
+    """Indica si un valor es un int (no bool) que entra en un INTEGER de SQLite."""
+    return type(valor) is int and MIN_ENTERO_SQLITE <= valor <= MAX_ENTERO_SQLITE
+
+def _valor_de_clave_valido(valor, tipo):
+    """Indica si un valor del cursor es del tipo de su columna de orden (y entra en un entero de SQLite)."""
+    if tipo is int:
+        return _es_entero_sqlite(valor)
+    return type(valor) is tipo
+
+def _decodificar_cursor(cursor, tipos):
+    """Recupera la clave de paginación de un cursor recibido del cliente.
+    Args: cursor (str): El cursor opaco. tipos (tuple): El tipo de cada
+    columna de orden, ej: (str, int) para (nombre, id).
+    Returns: La clave como tupla.
+    """
+    try:
+        clave = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except ValueError:
+        raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, "Cursor inválido.") from None
+    if (not isinstance(clave, list) or len(clave) != len(tipos)
+            or not all(_valor_de_clave_valido(valor, tipo) for valor, tipo in zip(clave, tipos))):
+        raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, "Cursor inválido.")
+    return tuple(clave)
+
+def _parametro_entero(parametros, nombre, defecto, minimo, maximo=None):
+    """Lee un parámetro entero de la query string y valida su rango.
+    Sin `maximo`, el límite es el mayor entero de SQLite."""
+    valores = parametros.get(nombre)
+    if not valores:
+        if defecto is None:
+            raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, f"Falta el parámetro '{nombre}'.")
+        return defecto
+    try:
+        valor = int(valores[0])
+    except ValueError:
+        raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, f"'{nombre}' debe ser un número entero.") from None
+    if valor < minimo or valor > (MAX_ENTERO_SQLITE if maximo is None else maximo):
+        rango = (f"entre {minimo} y {maximo}" if maximo is not None
+                 else f"un entero de 64 bits mayor o igual a {minimo}")
+        raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, f"'{nombre}' debe ser {rango}.")
+    return valor
+
+def _campo_entero(datos, campo, minimo):
+    """Valida un campo entero del cuerpo JSON."""
+    valor = datos[campo]
+    if not _es_entero_sqlite(valor) or valor < minimo:
+        raise ErrorDePeticion(HTTPStatus.BAD_REQUEST,
+                              f"'{campo}' debe ser un entero de 64 bits mayor o igual a {minimo}.")
+    return valor
+
+def _campo_texto(datos, campo):
+    """Valida un campo de texto no vacío del cuerpo JSON."""
+    valor = datos[campo]
+    if not isinstance(valor, str) or not valor.strip():
+        raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, f"'{campo}' debe ser un texto no vacío.")
+    return valor.strip()
+
+def _resolver_categoria(valor):
+    """Obtiene el ID de una categoría a partir de su ID o de su nombre."""
+    # bool es subclase de int: sin este control, true sería la categoría 1.
+    if type(valor) not in (int, str):
+        raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, "'categoria' debe ser un ID entero o un nombre.")
+    for id_cat, nombre in db.obtener_categorias_db():
+        if valor == id_cat or valor == nombre:
+            return id_cat
+    raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, f"La categoría '{valor}' no existe.")
+
+def _validar_producto(datos, parcial):
+    """Valida el cuerpo de un POST o PATCH de producto.
+    Args:
+    datos (dict): El JSON recibido.
+    parcial (bool): True para PATCH (todos los campos son opcionales).
+    Returns: Diccionario de columnas listo para database.py.
+    """
+    if not isinstance(datos, dict):
+        raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, "El cuerpo debe ser un objeto JSON.")
+    obligatorios = ("nombre", "descripcion", "cantidad", "precio", "categoria")
+    desconocidos = set(datos) - set(obligatorios)
+    if desconocidos:
+        raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, f"Campos desconocidos: {', '.join(sorted(desconocidos))}.")
+    if not parcial:
+        faltantes = [campo for campo in obligatorios if campo not in datos]
+        if faltantes:
+            raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, f"Faltan campos: {', '.join(faltantes)}.")
+    if not datos:
+        raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, "Debe indicar al menos un campo a modificar.")
+
+    columnas = {}
+    for campo in ("nombre", "descripcion"):
+        if campo in datos:
+            columnas[campo] = _campo_texto(datos, campo)
+    if "cantidad" in datos:
+        columnas["cantidad"] = _campo_entero(datos, "cantidad", 0 if parcial else 1)
+    if "precio" in datos:
+        columnas["precio"] = _campo_entero(datos, "precio", 0)
+    if "categoria" in datos:
+        columnas["categoria_id"] = _resolver_categoria(datos["categoria"])
+    return columnas
+
+def _pagina(filas, hay_mas, clave_de, nombre):
+    """Arma la respuesta de un listado paginado con el cursor de la página siguiente."""
+    siguiente = _codificar_cursor(clave_de(filas[-1])) if hay_mas else None
+    return {nombre: [_producto_a_dict(fila) for fila in filas], "siguiente": siguiente}
+
+def _listar_productos(parametros):
+    """GET /productos: una página del catálogo ordenada por nombre."""
+    tamano = _parametro_entero(parametros, "tamano", db.TAMANO_PAGINA, 1, MAX_TAMANO_PAGINA)
+    cursor = parametros.get("cursor")
+    clave = _decodificar_cursor(cursor[0], (str, int)) if cursor else None
+    filas, hay_mas = db.obtener_pagina_productos_db(clave, tamano)
+    return _pagina(filas, hay_mas, lambda fila: (fila.nombre, fila.id), "productos")
+
+def _stock_bajo(parametros):
+    """GET /stock-bajo: una página del reporte ordenada por cantidad."""
+    limite = _parametro_entero(parametros, "limite", None, 0)
+    tamano = _parametro_entero(parametros, "tamano", db.TAMANO_PAGINA, 1, MAX_TAMANO_PAGINA)
+    cursor = parametros.get("cursor")
+    clave = _decodificar_cursor(cursor[0], (int, int)) if cursor else None
+    filas, hay_mas = db.obtener_pagina_productos_por_stock_db(limite, clave, tamano)
+    return {"limite": limite, **_pagina(filas, hay_mas, lambda fila: (fila.cantidad, fila.id), "productos")}
+
+def _buscar(parametros):
+    """GET /buscar: búsqueda de texto completo por relevancia."""
+    texto = (parametros.get("q") or [""])[0]
+    limite = _parametro_entero(parametros, "limite", db.TAMANO_PAGINA, 1, MAX_TAMANO_PAGINA)
+    return {"productos": [_producto_a_dict(fila) for fila in db.buscar_productos_texto_db(texto, limite)]}
+
+def _categorias(parametros):
+    """GET /categorias: todas las categorías."""
+    return {"categorias": [{"id": id_cat, "nombre": nombre} for id_cat, nombre in db.obtener_categorias_db()]}
+
+def _obtener_producto(id_prod):
+    """Retorna el producto o responde 404 si no existe."""
+    fila = db.obtener_producto_por_id_db(id_prod)
+    if fila is None:
+        raise ErrorDePeticion(HTTPStatus.NOT_FOUND, f"No se encontró ningún producto con el ID {id_prod}.")
+    return _producto_a_dict(fila)
+
+RUTAS_LISTADO = {
+    "/productos": _listar_productos,
+    "/categorias": _categorias,
+    "/buscar": _buscar,
+    "/stock-bajo": _stock_bajo,
+}
+
+class _ManejadorInventario(BaseHTTPRequestHandler):
+    """Atiende las peticiones HTTP y las traduce a llamadas de database.py."""
+    protocol_version = "HTTP/1.1"
+    server_version = "Inventario/1.0"
+    timeout = TIMEOUT_CONEXION_S
+    # Cabeceras y cuerpo se escriben por separado: sin esto, Nagle y el ACK
+    # diferido del cliente suman ~40 ms a cada respuesta keep-alive.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.registrar:
+            super().log_message(format, *args)
+
+    def _responder(self, estado, cuerpo=None, etag=None):
+        """Envía una respuesta JSON (o vacía, para 304)."""
+        datos = b"" if cuerpo is None else json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(estado)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        if estado != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        if estado != HTTPStatus.NOT_MODIFIED:
+            self.wfile.write(datos)
+
+    def _leer_json(self):
+        """Lee y decodifica el cuerpo JSON de la petición."""
+        try:
+            longitud = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, "Content-Length inválido.") from None
+        if longitud < 0:
+            # rfile.read(-1) esperaría hasta que el cliente cierre la conexión.
+            self.close_connection = True
+            raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, "Content-Length inválido.")
+        if longitud > MAX_CUERPO_BYTES:
+            self.close_connection = True
+            raise ErrorDePeticion(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "El cuerpo es demasiado grande.")
+        self._cuerpo_leido = True
+        try:
+            return json.loads(self.rfile.read(longitud) or b"null")
+        except ValueError:
+            raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, "El cuerpo no es un JSON válido.") from None
+
+    def _id_de_ruta(self, ruta):
+        """Extrae el ID de /productos/<id>, o None si la ruta no tiene esa forma."""
+        prefijo, _, resto = ruta.rpartition("/")
+        if prefijo != "/productos":
+            return None
+        try:
+            id_prod = int(resto)
+        except ValueError:
+            raise ErrorDePeticion(HTTPStatus.NOT_FOUND, f"Ruta desconocida: {ruta}") from None
+        if not _es_entero_sqlite(id_prod):
+            raise ErrorDePeticion(HTTPStatus.BAD_REQUEST, f"ID de producto fuera de rango: {resto}")
+        return id_prod
+
+    def _atender(self, metodo):
+        """Resuelve la ruta, ejecuta la operación y responde, traduciendo los errores."""
+        self._cuerpo_leido = False
+        try:
+            partes = urlsplit(self.path)
+            ruta = partes.path.rstrip("/") or "/"
+            if metodo == "GET":
+                self._atender_get(ruta, parse_qs(partes.query))
+                return
+            id_prod = self._id_de_ruta(ruta)
+            if metodo == "POST" and ruta == "/productos":
+                columnas = _validar_producto(self._leer_json(), parcial=False)
+                nuevo_id = db.agregar_producto_db(columnas["nombre"], columnas["descripcion"], columnas["cantidad"],
+                                                  columnas["precio"], columnas["categoria_id"])
+                self._responder(HTTPStatus.CREATED, _obtener_producto(nuevo_id))
+            elif metodo == "PATCH" and id_prod is not None:
+                columnas = _validar_producto(self._leer_json(), parcial=True)
+                _obtener_producto(id_prod)
+                db.modificar_producto_campos_db(id_prod, columnas)
+                self._responder(HTTPStatus.OK, _obtener_producto(id_prod))
+            elif metodo == "DELETE" and id_prod is not None:
+                _obtener_producto(id_prod)
+                db.eliminar_producto_db(id_prod)
+                self._responder(HTTPStatus.OK, {"id": id_prod})
+            else:
+                raise ErrorDePeticion(HTTPStatus.METHOD_NOT_ALLOWED, f"{metodo} no está permitido en {ruta}.")
+        except ErrorDePeticion as error:
+            if not self._cuerpo_leido and self.headers.get("Content-Length", "0") != "0":
+                # El cuerpo quedó sin leer en el socket: no se puede reutilizar la conexión.
+                self.close_connection = True
+            self._responder(error.estado, {"error": str(error)})
+        except sqlite3.IntegrityError as error:
+            self._responder(HTTPStatus.CONFLICT, {"error": f"Restricción de la base de datos: {error}"})
+        except sqlite3.OperationalError as error:
+            self._responder(HTTPStatus.SERVICE_UNAVAILABLE, {"error": f"Base de datos no disponible: {error}"})
+
+    def _atender_get(self, ruta, parametros):
+        """Responde un GET, o 304 si el ETag del cliente sigue vigente.
+        La versión se lee antes de consultar: si alguien escribe en el medio,
+        la respuesta queda marcada con una versión vieja y el cliente la
+        vuelve a pedir en la próxima consulta, nunca al revés.
+        """
+        id_prod = self._id_de_ruta(ruta)
+        if id_prod is None and ruta not in RUTAS_LISTADO:
+            raise ErrorDePeticion(HTTPStatus.NOT_FOUND, f"Ruta desconocida: {ruta}")
+        etag = f'"{self.server.token}-{db.version_datos_db()}"'
+        recibidos = [valor.strip() for valor in self.headers.get("If-None-Match", "").split(",")]
+        if etag in recibidos or "*" in recibidos:
+            self._responder(HTTPStatus.NOT_MODIFIED, etag=etag)
+            return
+        if id_prod is not None:
+            cuerpo = _obtener_producto(id_prod)
+        else:
+            cuerpo = RUTAS_LISTADO[ruta](parametros)
+        self._responder(HTTPStatus.OK, cuerpo, etag=etag)
+
+    def do_GET(self):
+        self._atender("GET")
+
+    def do_POST(self):
+        self._atender("POST")
+
+    def do_PATCH(self):
+        self._atender("PATCH")
+
+    def do_PUT(self):
+        self._atender("PUT")
+
+    def do_DELETE(self):
+        self._atender("DELETE")
+
+class ServidorInventario(HTTPServer):
+    """Servidor HTTP que atiende cada conexión en un grupo acotado de hilos.
+    A diferencia de ThreadingHTTPServer, que crea un hilo (y por lo tanto
+    una conexión SQLite) por petición, reutiliza siempre los mismos hilos.
+    """
+    def __init__(self, direccion, hilos=HILOS_POR_DEFECTO, registrar=True):
+        super().__init__(direccion, _ManejadorInventario)
+        self.registrar = registrar
+        # Distingue los ETag de cada arranque: data_version se reinicia.
+        self.token = secrets.token_hex(4)
+        self._hilos = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="http")
+
+    def process_request(self, request, client_address):
+        self._hilos.submit(self._atender_conexion, request, client_address)
+
+    def _atender_conexion(self, request, client_address):
+        """Atiende todas las peticiones de una conexión y la cierra."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._hilos.shutdown(wait=True)
+        db.cerrar_conexiones()
+
+def servir(host="127.0.0.1", puerto=8000, hilos=HILOS_POR_DEFECTO):
+    """Inicializa la base y atiende peticiones hasta que se interrumpa con Ctrl+C.
+    Args:
+    host (str): Dirección donde escuchar.
+    puerto (int): Puerto TCP.
+    hilos (int): Cantidad máxima de conexiones atendidas a la vez.
+    Returns: no tiene
+    """
+    db.inicializar_db()
+    servidor = ServidorInventario((host, puerto), hilos)
+    print(f"Sirviendo el inventario en http://{host}:{servidor.server_address[1]}/ (Ctrl+C para salir)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON del inventario.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--hilos", type=int, default=HILOS_POR_DEFECTO)
+    argumentos = parser.parse_args()
+    servir(argumentos.host, argumentos.puerto, argumentos.hilos)
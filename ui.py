@@ -4,35 +4,148 @@
 Responsable de toda la interacción visual con el usuario en la consola.
 Maneja la impresión de menús, listas, mensajes y la captura de datos,
 utilizando la librería 'colorama' para mejorar la experiencia.
+
+Las tablas se arman completas en memoria y se escriben con una sola
+llamada: los anchos de columna salen de los datos, los textos largos se
+recortan, y si la tabla no entra en la terminal se muestra con un
+paginador ($PAGER o 'less'). Con configurar_salida (o la variable de
+entorno NO_COLOR) se desactivan los colores y el paginador.
 """
+import itertools
+import os
+import sys
+from datetime import datetime
 from colorama import Fore, Style, Back
 
+ANCHO_NOMBRE = 30
+ANCHO_DESCRIPCION = 40
+ANCHO_CATEGORIA = 20
+PAGINADOR_POR_DEFECTO = "less -R -F -X"
+
+_usar_color = "NO_COLOR" not in os.environ
+_usar_paginador = True
+
+def configurar_salida(color=True, paginador=True):
+    """Elige cómo se escriben las tablas.
+    Args:
+    color (bool): False para escribir texto plano, sin códigos de color (más rápido).
+    paginador (bool): False para no usar nunca el paginador.
+    Returns: no tiene
+    """
+    global _usar_color, _usar_paginador
+    _usar_color = color and "NO_COLOR" not in os.environ
+    _usar_paginador = paginador
+
+def _color(*codigos):
+    """Retorna los códigos de colorama indicados, o nada si los colores están desactivados."""
+    return "".join(codigos) if _usar_color else ""
+
+def _recortar(texto, ancho):
+    """Recorta el texto a `ancho` caracteres, marcando el corte con '…'."""
+    return texto if len(texto) <= ancho else texto[:ancho - 1] + "…"
+
+def _ancho_de(valores):
+    """Ancho del valor más largo de una columna; los enteros se miden sin convertirlos."""
+    if all(type(valor) is int for valor in valores):
+        return max(len(str(max(valores))), len(str(min(valores))))
+    return max(map(len, map(str, valores)))
+
+def _armar_tabla(titulo, columnas, valores, pie=(), color_titulo=Fore.MAGENTA):
+    """Arma una tabla completa como un único texto.
+    Recibe los datos por columnas: cada columna se mide y se recorta de una
+    vez, y cada renglón se arma con una única cadena de formato.
+
+    Args: titulo (str): El título que encabeza la tabla.
+    columnas (list): Tuplas (encabezado, alineacion, ancho_maximo, color):
+    alineacion es '<' o '>', ancho_maximo es None para no recortar y color
+    son los códigos de colorama de las celdas de esa columna ('' para ninguno).
+    valores (list): Una secuencia de valores por columna, todas del mismo largo.
+    pie (iterable): Filas finales resaltadas, ej: los totales.
+    color_titulo (str): Color del título y de la línea de cierre.
+    Returns: str: La tabla, lista para escribir.
+    """
+    valores = [list(columna) for columna in valores]
+    pie = [[str(valor) for valor in fila] for fila in pie]
+    anchos = []
+    for posicion, (encabezado, _, maximo, _) in enumerate(columnas):
+        ancho = max([len(encabezado), _ancho_de(valores[posicion]) if valores[posicion] else 0]
+                    + [len(fila[posicion]) for fila in pie])
+        if maximo and ancho > maximo:
+            valores[posicion] = [_recortar(texto, maximo) for texto in map(str, valores[posicion])]
+            ancho = maximo
+        anchos.append(ancho)
+
+    fin = _color(Style.RESET_ALL)
+    simple = "  ".join(f"{{:{alineacion}{ancho}}}" for (_, alineacion, _, _), ancho in zip(columnas, anchos))
+    coloreado = "  ".join(f"{_color(color)}{{:{alineacion}{ancho}}}{fin}" if color else f"{{:{alineacion}{ancho}}}"
+                          for (_, alineacion, _, color), ancho in zip(columnas, anchos))
+    amarillo, brillante = _color(Fore.YELLOW), _color(Style.BRIGHT)
+
+    encabezado = f"--- {titulo} ---"
+    lineas = [f"\n{_color(color_titulo)}{encabezado}{fin}",
+              amarillo + simple.format(*(_recortar(columna[0], ancho) for columna, ancho in zip(columnas, anchos))) + fin,
+              amarillo + simple.format(*("-" * ancho for ancho in anchos)) + fin]
+    lineas.extend(itertools.starmap(coloreado.format, zip(*valores)))
+    lineas.extend(brillante + simple.format(*(_recortar(valor, ancho) for valor, ancho in zip(fila, anchos))) + fin
+                  for fila in pie)
+    lineas.append(f"{_color(color_titulo)}{'-' * len(encabezado)}{fin}\n")
+    return "\n".join(lineas) + "\n"
+
+def _mostrar(texto):
+    """Escribe el texto con una sola llamada; si no entra en la terminal, lo pasa por el paginador.
+    Args: texto (str): El texto a mostrar.
+    Returns: no tiene
+    """
+    if _usar_paginador and sys.stdout.isatty() and texto.count("\n") >= os.get_terminal_size().lines - 1:
+        import shlex
+        import subprocess
+        comando = os.environ.get("PAGER") or PAGINADOR_POR_DEFECTO
+        try:
+            proceso = subprocess.Popen(shlex.split(comando), stdin=subprocess.PIPE,
+                                       encoding=sys.stdout.encoding or "utf-8", errors="replace")
+        except OSError:
+            pass  # sin paginador disponible: se escribe directo
+        else:
+            try:
+                proceso.communicate(texto)
+            except (BrokenPipeError, KeyboardInterrupt):
+                proceso.wait()
+            return
+    sys.stdout.write(texto)
+    sys.stdout.flush()
+
 def mostrar_menu_principal():
     """Imprime el menú principal de la aplicación.
     Presenta las opciones disponibles para gestionar productos, categorías,
-    generar reportes de stock o salir del programa.
+    ver los reportes de inventario, gestionar los depósitos o salir del programa.
     Args: no tiene
     Returns: no tiene
     """
     print(Fore.CYAN + "\n====== MENÚ PRINCIPAL ======")
     print("1.📦 Gestionar Productos")
     print("2.📋 Gestionar Categorías")
-    print("3.📊 Generar Reporte de Stock")
-    print("4.🔚 Salir del programa")
+    print("3.📊 Reportes de Inventario")
+    print("4.🏬 Gestionar Depósitos")
+    print("5.🔚 Salir del programa")
     print(Fore.CYAN + "==========================\n")
 
 def mostrar_menu_productos():
     """ Imprime el submenú de gestión de productos.
-    Presenta las opciones para agregar, modificar, eliminar, buscar o listar productos.
+    Presenta las opciones para agregar, modificar, eliminar, buscar (por ID
+    o nombre, o por texto), listar, importar, exportar o actualizar productos en masa.
     Args: no tiene
     Returns: no tiene"""
     print(Fore.CYAN + "\n--- Menú de Productos ---")
     print("1. ✅ Agregar producto")
     print("2. ✏️ Modificar producto")
     print("3. 👁️  Visualizar todos los productos")
-    print("4. 🔍 Buscar producto por ID")
+    print("4. 🔍 Buscar producto por ID o nombre")
     print("5. ❌ Eliminar producto")
-    print("6. 🔙 Volver al menú principal")
+    print("6. 📥 Importar productos desde archivo")
+    print("7. 🔎 Buscar producto por texto")
+    print("8. 🔁 Actualización masiva")
+    print("9. 📤 Exportar productos a archivo")
+    print("10. 🔙 Volver al menú principal")
     print(Fore.CYAN + "-------------------------\n")
 
 def mostrar_menu_categorias():
@@ -64,6 +177,52 @@ def mostrar_menu_modificar_producto():
     print("6. Finalizar modificación")
     print(Fore.CYAN + "----------------------------\n")
 
+def mostrar_menu_reportes():
+    """Imprime el submenú de reportes de inventario.
+    Presenta el reporte de stock bajo, el valor de stock por categoría, los
+    productos de mayor valor, la distribución de precios, el kardex de un
+    producto, su stock a una fecha y los umbrales de reposición.
+    Args: no tiene
+    Returns: no tiene"""
+    print(Fore.CYAN + "\n--- Reportes de Inventario ---")
+    print("1. ⚠️  Stock bajo")
+    print("2. 💰 Valor de stock por categoría")
+    print("3. 🏆 Productos de mayor valor")
+    print("4. 📈 Distribución de precios")
+    print("5. 📒 Kardex de un producto")
+    print("6. 📅 Stock de un producto a una fecha")
+    print("7. 🔔 Umbrales de reposición")
+    print("8. 🔙 Volver al menú principal")
+    print(Fore.CYAN + "------------------------------\n")
+
+def mostrar_menu_depositos():
+    """Imprime el submenú de depósitos.
+    Presenta el alta y el listado de depósitos, el registro de movimientos
+    en un depósito y los reportes de stock bajo por depósito y consolidado.
+    Args: no tiene
+    Returns: no tiene"""
+    print(Fore.CYAN + "\n--- Depósitos ---")
+    print("1. ➕ Agregar depósito")
+    print("2. 📋 Listar depósitos")
+    print("3. 🔁 Registrar entradas y salidas en un depósito")
+    print("4. ⚠️  Stock bajo por depósito")
+    print("5. 🧮 Stock bajo consolidado")
+    print("6. 🔙 Volver al menú principal")
+    print(Fore.CYAN + "-----------------\n")
+
+def mostrar_menu_actualizacion_masiva():
+    """Muestra las opciones de actualización masiva de productos.
+    Presenta el ajuste de precios por categoría, la carga de cantidades por
+    lote y el registro de entradas y salidas de stock.
+    Args: no tiene
+    Returns: no tiene"""
+    print(Fore.CYAN + "\n--- Actualización Masiva ---")
+    print("1. Ajustar precios de una categoría (%)")
+    print("2. Actualizar cantidades por lote")
+    print("3. Registrar entradas y salidas de stock")
+    print("4. Volver")
+    print(Fore.CYAN + "----------------------------\n")
+
 def obtener_input(mensaje_prompt):
     """Obtiene una entrada del usuario con un estilo consistente.
     Utiliza colorama para formatear el mensaje de entrada.
@@ -79,88 +238,262 @@ def mostrar_lista_categorias(categorias):
     """Muestra una lista formateada de categorías.
     Si la lista está vacía, muestra un mensaje informativo.
     Args:
-    categorias: Lista de categorías a mostrar.
-    Cada categoría es una tupla con (id, nombre).
+    categorias: Lista de modelos.Categoria a mostrar.
     Returns:
     un booleano: True si se mostraron categorías, False si la lista estaba vacía.    
-
-
-     
     """
     if not categorias:
         mostrar_mensaje_info(" No hay categorías registradas.")
         return False
-        
-    print(Fore.MAGENTA + "\n--- Categorías Registradas ---")
-    
-     # Imprime el encabezado de la tabla
-    print(f"{Fore.YELLOW}{'ID':<5}{'Nombre':<30}{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}{'-'*5}{'-'*30}{Style.RESET_ALL}")
-    
-    for id_cat, nombre in categorias:
-         
-        print(f"{id_cat:<5}{nombre:<30}")
-        
-    print(Fore.MAGENTA + "----------------------------\n")
+
+    _mostrar(_armar_tabla("Categorías Registradas",
+                          [("ID", "<", None, ""), ("Nombre", "<", None, "")],
+                          zip(*categorias)))
     return True
 
 def mostrar_lista_seleccion_con_opcion_nueva(items, texto_opcion_nueva):
     """Muestra una lista de ítems numerada y añade una opción final.
 
-    Args: items (list): Lista de tuplas con ID y nombre de ítems.
+    Args: items (list): Lista de modelos.Categoria (ID y nombre de cada ítem).
     texto_opcion_nueva (str): Texto para la opción de crear un nuevo ítem.
     Returns: no tiene
     """
     for i, item in enumerate(items):
-        print(f"{Fore.YELLOW}{i + 1}.{Style.RESET_ALL} {item[1]}")
+        print(f"{Fore.YELLOW}{i + 1}.{Style.RESET_ALL} {item.nombre}")
     print(f"{Fore.YELLOW}{len(items) + 1}.{Style.RESET_ALL} {texto_opcion_nueva}")
 
 def mostrar_lista_productos(productos):
     """Muestra una lista formateada de productos con todos sus detalles.
-    Args: productos (list): Lista de tuplas con detalles del producto.
-    Formato de cada tupla: (id, nombre, descripcion, cantidad, precio, nombre_categoria).
+    Los nombres, descripciones y categorías largos se recortan.
+    Args: productos (list): Lista de modelos.Producto.
     Returns: un booleano: True si se mostraron productos, False si la lista estaba vacía.   
     """
     if not productos:
         mostrar_mensaje_info(" No hay productos registrados.")
         return False
-        
-    print(Fore.MAGENTA + "\n--- Productos Registrados ---")
-    
-     #Imprime el encabezado de la tabla
-    print(f"{Fore.YELLOW}{'ID':<5}{'Nombre':<25}{'Descripción':<40}{'Cantidad':<10}{'Precio':<10}{'Categoría':<20}{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}{'-'*5}{'-'*25}{'-'*40}{'-'*10}{'-'*10}{'-'*20}{Style.RESET_ALL}")
-    
-    for id_prod, nombre, desc, cant, precio, cat in productos:
-        # Se ajusta el formato para alinear con el encabezado
-        print(f"{id_prod:<5}{nombre:<25}{desc:<40}{cant:<10}${precio:<9}{cat:<20}")
-        
-    print(Fore.MAGENTA + "---------------------------\n")
+
+    columnas = [("ID", ">", None, ""), ("Nombre", "<", ANCHO_NOMBRE, ""),
+                ("Descripción", "<", ANCHO_DESCRIPCION, ""), ("Cantidad", ">", None, ""),
+                ("Precio", ">", None, ""), ("Categoría", "<", ANCHO_CATEGORIA, "")]
+    ids, nombres, descripciones, cantidades, precios, categorias = zip(*productos)
+    valores = [ids, nombres, descripciones, cantidades, [f"${precio}" for precio in precios], categorias]
+    _mostrar(_armar_tabla("Productos Registrados", columnas, valores))
     return True
 
 def mostrar_reporte_stock(productos, limite):
     """Muestra un reporte formateado de productos con stock bajo.
 
-    Args: productos (list): Lista de tuplas con detalles del producto.
-    Formato de cada tupla: (id, nombre, descripcion, cantidad, precio, nombre_categoria).
+    Args: productos (list): Lista de modelos.Producto.
     limite (int): El límite de cantidad para considerar un producto como "bajo stock".
     Returns: no tiene
     """
     if not productos:
         mostrar_mensaje_info(f"No hay productos con una cantidad igual o inferior a {limite}.")
         return
-        
-    print(Fore.RED + f"\n--- REPORTE: PRODUCTOS CON STOCK BAJO (<= {limite}) ---")
-    
-    # Imprime el  encabezado para el reporte 
-    print(f"{Fore.YELLOW}{'ID':<5}{'Nombre':<25}{'Cantidad':<10}{'Categoría':<20}{Style.RESET_ALL}")
-    print(f"{Fore.YELLOW}{'-'*5}{'-'*25}{'-'*10}{'-'*20}{Style.RESET_ALL}")
-    
-    for id_prod, nombre, desc, cant, precio, cat in productos:
-        
-        print(f"{id_prod:<5}{nombre:<25}{Back.RED}{Style.BRIGHT}{cant:<10}{Style.RESET_ALL}{cat:<20}")
-        
-    print(Fore.RED + "--------------------------------------------------\n")
+
+    columnas = [("ID", ">", None, ""), ("Nombre", "<", ANCHO_NOMBRE, ""),
+                ("Cantidad", ">", None, Back.RED + Style.BRIGHT), ("Categoría", "<", ANCHO_CATEGORIA, "")]
+    ids, nombres, _, cantidades, _, categorias = zip(*productos)
+    _mostrar(_armar_tabla(f"REPORTE: PRODUCTOS CON STOCK BAJO (<= {limite})", columnas,
+                          [ids, nombres, cantidades, categorias],
+                          color_titulo=Fore.RED))
+
+def mostrar_productos_bajo_umbral(filas):
+    """Muestra los productos cuya cantidad no supera su umbral de reposición.
+    Args: filas (list): Lista de modelos.BajoUmbral.
+    Returns: no tiene
+    """
+    if not filas:
+        mostrar_mensaje_info("No hay productos con una cantidad igual o inferior a su umbral.")
+        return
+    columnas = [("ID", ">", None, ""), ("Nombre", "<", ANCHO_NOMBRE, ""),
+                ("Cantidad", ">", None, Back.RED + Style.BRIGHT), ("Umbral", ">", None, ""),
+                ("Categoría", "<", ANCHO_CATEGORIA, "")]
+    productos = [fila.producto for fila in filas]
+    ids, nombres, _, cantidades, _, categorias = zip(*productos)
+    _mostrar(_armar_tabla("PRODUCTOS BAJO SU UMBRAL DE REPOSICIÓN", columnas,
+                          [ids, nombres, cantidades, [fila.umbral for fila in filas], categorias],
+                          color_titulo=Fore.RED))
+
+def mostrar_lista_depositos(depositos, nombre_central):
+    """Muestra los depósitos registrados, con el central primero.
+    Args: depositos (list): Lista de modelos.Deposito.
+    nombre_central (str): Nombre con el que se muestra el depósito central.
+    Returns: no tiene
+    """
+    filas = [("-", nombre_central, "(base principal)")] + [tuple(deposito) for deposito in depositos]
+    _mostrar(_armar_tabla("Depósitos", [("ID", ">", None, ""), ("Nombre", "<", ANCHO_CATEGORIA, ""),
+                                        ("Archivo", "<", None, "")], zip(*filas)))
+
+def mostrar_reporte_stock_consolidado(nombres, filas, limite):
+    """Muestra el stock bajo consolidado: el total de cada producto y el de cada depósito.
+    Args: nombres (list): Nombres de los depósitos, en el orden de las cantidades.
+    filas (list): Lista de modelos.StockConsolidado.
+    limite (int): El límite de stock total del reporte.
+    Returns: no tiene
+    """
+    if not filas:
+        mostrar_mensaje_info(f"No hay productos con un stock total igual o inferior a {limite}.")
+        return
+    columnas = ([("ID", ">", None, ""), ("Nombre", "<", ANCHO_NOMBRE, "")]
+                + [(nombre, ">", ANCHO_CATEGORIA, "") for nombre in nombres]
+                + [("Total", ">", None, Back.RED + Style.BRIGHT)])
+    valores = ((fila.producto.id, fila.producto.nombre, *fila.cantidades, fila.producto.cantidad) for fila in filas)
+    _mostrar(_armar_tabla(f"REPORTE CONSOLIDADO: STOCK TOTAL BAJO (<= {limite})", columnas, zip(*valores),
+                          color_titulo=Fore.RED))
+
+def mostrar_reporte_valor_por_categoria(resumen, totales):
+    """Muestra la cantidad de productos, unidades y valor de stock de cada categoría.
+
+    Args: resumen (list): Lista de modelos.ResumenCategoria.
+    totales (tuple): (productos, unidades, valor) de todo el inventario.
+    Returns: no tiene
+    """
+    if not resumen:
+        mostrar_mensaje_info("No hay categorías registradas.")
+        return
+    productos, unidades, valor = totales
+    columnas = [("Categoría", "<", ANCHO_CATEGORIA, ""), ("Productos", ">", None, ""),
+                ("Unidades", ">", None, ""), ("Valor", ">", None, ""), ("%", ">", None, "")]
+    filas = ((fila.categoria, fila.productos, fila.unidades, f"${fila.valor}",
+              f"{fila.valor * 100 / valor if valor else 0:.1f}%") for fila in resumen)
+    _mostrar(_armar_tabla("Valor de Stock por Categoría", columnas, zip(*filas),
+                          pie=[("Total", productos, unidades, f"${valor}", "")]))
+
+def mostrar_top_productos_valor(productos):
+    """Muestra los productos con mayor valor de stock (cantidad * precio).
+
+    Args: productos (list): Lista de modelos.Producto, de mayor a menor valor.
+    Returns: no tiene
+    """
+    if not productos:
+        mostrar_mensaje_info("No hay productos registrados.")
+        return
+    columnas = [("#", ">", None, ""), ("ID", ">", None, ""), ("Nombre", "<", ANCHO_NOMBRE, ""),
+                ("Cantidad", ">", None, ""), ("Precio", ">", None, ""), ("Valor", ">", None, ""),
+                ("Categoría", "<", ANCHO_CATEGORIA, "")]
+    filas = ((posicion, p.id, p.nombre, p.cantidad, f"${p.precio}", f"${p.cantidad * p.precio}", p.categoria)
+             for posicion, p in enumerate(productos, start=1))
+    _mostrar(_armar_tabla(f"Los {len(productos)} Productos de Mayor Valor", columnas, zip(*filas)))
+
+def mostrar_distribucion_precios(rangos):
+    """Muestra cuántos productos hay en cada rango de precios, con una barra proporcional.
+
+    Args: rangos (list): Lista de modelos.RangoPrecio.
+    Returns: no tiene
+    """
+    if not rangos:
+        mostrar_mensaje_info("No hay productos registrados.")
+        return
+    mayor = max(rango.productos for rango in rangos)
+    total = sum(rango.productos for rango in rangos)
+    columnas = [("Rango", "<", None, ""), ("Productos", ">", None, ""), ("%", ">", None, ""),
+                ("", "<", None, Fore.GREEN)]
+    filas = ((f"${rango.desde} - ${rango.hasta}", rango.productos, f"{rango.productos * 100 / total:.1f}%",
+              "█" * max(1, round(rango.productos * 30 / mayor))) for rango in rangos)
+    _mostrar(_armar_tabla("Distribución de Precios", columnas, zip(*filas)))
+
+def mostrar_kardex(producto, movimientos):
+    """Muestra los movimientos de stock de un producto con el saldo después de cada uno.
+
+    Args: producto (modelos.Producto): El producto consultado.
+    movimientos (list): Lista de modelos.Movimiento, del más antiguo al más reciente.
+    Returns: no tiene
+    """
+    if not movimientos:
+        mostrar_mensaje_info(f"El producto '{producto.nombre}' no tiene movimientos de stock.")
+        return
+    columnas = [("Fecha", "<", None, ""), ("Motivo", "<", ANCHO_NOMBRE, ""), ("Entrada", ">", None, ""),
+                ("Salida", ">", None, ""), ("Saldo", ">", None, "")]
+    filas = ((datetime.fromtimestamp(m.fecha).strftime("%Y-%m-%d %H:%M"), m.motivo,
+              m.delta if m.delta > 0 else "", -m.delta if m.delta < 0 else "", m.saldo)
+             for m in movimientos)
+    _mostrar(_armar_tabla(f"Kardex: {producto.nombre} (ID {producto.id})", columnas, zip(*filas)))
+
+def _navegar_paginas(obtener_pagina, clave_de, mostrar_pagina):
+    """Muestra resultados paginados con navegación siguiente/anterior.
+    Si todo entra en una sola página, la muestra sin pedir navegación.
+
+    Args: obtener_pagina (callable): Recibe (clave, anterior=...) y retorna
+    (filas, hay_mas), como las funciones obtener_pagina_*_db.
+    clave_de (callable): Retorna la clave de orden de una fila.
+    mostrar_pagina (callable): Imprime una lista de filas.
+    Returns: un booleano: True si había filas para mostrar, False si no.
+    """
+    filas, hay_siguiente = obtener_pagina(None, anterior=False)
+    if not filas:
+        mostrar_pagina(filas)
+        return False
+
+    pagina = 1
+    while True:
+        mostrar_pagina(filas)
+        if pagina == 1 and not hay_siguiente:
+            return True
+
+        opciones = []
+        if hay_siguiente:
+            opciones.append("[S]iguiente")
+        if pagina > 1:
+            opciones.append("[A]nterior")
+        opciones.append("[V]olver")
+        print(f"{Fore.YELLOW}Página {pagina}{Style.RESET_ALL}")
+        opcion = obtener_input(", ".join(opciones) + ": ").upper()
+
+        if opcion == 'S' and hay_siguiente:
+            filas, hay_siguiente = obtener_pagina(clave_de(filas[-1]), anterior=False)
+            pagina += 1
+        elif opcion == 'A' and pagina > 1:
+            filas, _ = obtener_pagina(clave_de(filas[0]), anterior=True)
+            hay_siguiente = True
+            pagina -= 1
+        elif opcion == 'V':
+            return True
+        else:
+            mostrar_mensaje_error("Opción inválida.")
+
+def mostrar_lista_productos_paginada(obtener_pagina):
+    """Muestra el listado de productos de a una página, ordenado por nombre.
+
+    Args: obtener_pagina (callable): Recibe (clave, anterior=...) y retorna
+    (filas, hay_mas); ej: database.obtener_pagina_productos_db.
+    Returns: un booleano: True si se mostraron productos, False si no hay.
+    """
+    return _navegar_paginas(obtener_pagina, lambda fila: (fila.nombre, fila.id), mostrar_lista_productos)
+
+def mostrar_reporte_stock_paginado(obtener_pagina, limite):
+    """Muestra el reporte de stock bajo de a una página, ordenado por cantidad.
+
+    Args: obtener_pagina (callable): Recibe (clave, anterior=...) y retorna
+    (filas, hay_mas); ej: database.obtener_pagina_productos_por_stock_db con el límite fijado.
+    limite (int): El límite de cantidad usado en el reporte.
+    Returns: no tiene
+    """
+    _navegar_paginas(obtener_pagina, lambda fila: (fila.cantidad, fila.id),
+                     lambda filas: mostrar_reporte_stock(filas, limite))
+
+def mostrar_resumen_importacion(resumen):
+    """Muestra el resultado de una importación masiva de productos.
+
+    Args: resumen (dict): El diccionario retornado por importador.importar_productos.
+    Returns: no tiene
+    """
+    print(Fore.MAGENTA + "\n--- Resumen de la Importación ---")
+    print(f"{'Productos insertados:':<25}{resumen['insertados']}")
+    print(f"{'Filas rechazadas:':<25}{resumen['rechazados']}")
+    print(f"{'Tiempo:':<25}{resumen['segundos']:.2f} s ({resumen['filas_por_segundo']:.0f} filas/s)")
+    if resumen["categorias_creadas"]:
+        print(f"{'Categorías creadas:':<25}{', '.join(resumen['categorias_creadas'])}")
+
+    if resumen["detalle_rechazos"]:
+        print(f"\n{Fore.YELLOW}{'Línea':<8}{'Motivo':<60}{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}{'-'*8}{'-'*60}{Style.RESET_ALL}")
+        for linea, motivo in resumen["detalle_rechazos"]:
+            print(f"{linea:<8}{motivo:<60}")
+        ocultos = resumen["rechazados"] - len(resumen["detalle_rechazos"])
+        if ocultos > 0:
+            print(f"... y {ocultos} filas rechazadas más.")
+    print(Fore.MAGENTA + "--------------------------------\n")
 
 def mostrar_mensaje_exito(mensaje):
     """Muestra un mensaje de éxito con formato.
@@ -0,0 +1,209 @@
+# vigilante_stock.py
+"""
+Módulo del vigilante de stock bajo. 🔔
+Revisa en segundo plano si algún producto llegó a su umbral de reposición
+(ver database.fijar_umbral_producto_db y fijar_umbral_categoria_db) y avisa
+con una función propia o escribiendo en un archivo JSON Lines.
+
+Mientras nadie escribe, cada revisión es una sola lectura de PRAGMA
+data_version (database.version_datos_db). Cuando la base cambió, vuelve a
+evaluar solo los productos que figuran en el registro de cambios desde la
+revisión anterior; recalcula todo únicamente al arrancar, cuando cambió
+algún umbral o una categoría, o si su cursor quedó vencido. Vigila el
+stock del depósito central (productos.cantidad).
+"""
+import json
+import sys
+import threading
+import time
+import database as db
+import modelos
+
+INTERVALO_POR_DEFECTO_S = 1.0
+
+def alerta_a_dict(alerta):
+    """Convierte un modelos.AlertaStock en un diccionario apto para JSON."""
+    return {"tipo": alerta.tipo, "fecha": alerta.fecha, "umbral": alerta.umbral,
+            "producto": alerta.producto._asdict()}
+
+class VigilanteStock:
+    """Vigila los productos con stock bajo y avisa cuando entran o salen de esa situación.
+    Args:
+    al_alertar (callable): Recibe cada modelos.AlertaStock; puede ser None.
+    archivo (str): Archivo JSON Lines donde agregar cada alerta ('-' para la
+    salida estándar); puede ser None.
+    intervalo_s (float): Segundos entre revisiones en segundo plano.
+    umbral_por_defecto (int): Umbral de los productos sin umbral propio ni
+    de su categoría; None para no vigilarlos.
+    alertar_existentes (bool): Si es True, la primera revisión avisa de los
+    productos que ya estaban bajo su umbral.
+    """
+
+    def __init__(self, al_alertar=None, archivo=None, intervalo_s=INTERVALO_POR_DEFECTO_S,
+                 umbral_por_defecto=None, alertar_existentes=True):
+        self.al_alertar = al_alertar
+        self.archivo = archivo
+        self.intervalo_s = intervalo_s
+        self.umbral_por_defecto = umbral_por_defecto
+        self.alertar_existentes = alertar_existentes
+        self.bajo_umbral = {}  # id -> modelos.BajoUmbral
+        self._version_datos = None
+        self._version_umbrales = None
+        self._cursor = None
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def revisar(self):
+        """Hace una revisión y emite las alertas que correspondan.
+        El estado (versión de datos, cursor y versión de umbrales) se guarda
+        solo si la revisión termina bien: si falla, por ejemplo con la base
+        bloqueada, la próxima revisión vuelve a procesar los mismos cambios.
+        Args: no tiene
+        Returns: Lista de modelos.AlertaStock emitidas (vacía si nada cambió).
+        """
+        version = db.version_datos_db()
+        if version == self._version_datos:
+            return []
+        # La versión se toma antes de leer: lo que se escriba durante la
+        # revisión vuelve a cambiarla y se procesa en la siguiente.
+        umbrales = db.version_umbrales_db()
+        if self._cursor is None or umbrales != self._version_umbrales:
+            alertas = self._recalcular_todo(umbrales)
+        else:
+            alertas = self._revisar_cambios(umbrales)
+        self._version_datos = version
+        return self._emitir(alertas)
+
+    def _revisar_cambios(self, version_umbrales):
+        """Vuelve a evaluar los productos del registro de cambios posteriores al cursor."""
+        ids = set()
+        cursor = self._cursor
+        try:
+            while True:
+                cambios, siguiente = db.obtener_cambios_db(cursor, limite=5000)
+                if not cambios:
+                    break
+                if any(cambio.tabla == "categorias" for cambio in cambios):
+                    return self._recalcular_todo(version_umbrales)
+                ids.update(cambio.fila_id for cambio in cambios)
+                cursor = siguiente
+        except db.CursorVencidoError:
+            return self._recalcular_todo(version_umbrales)
+        if not ids:
+            return []
+        actuales = {fila.producto.id: fila for fila in db.productos_bajo_umbral_db(self.umbral_por_defecto, ids)}
+        alertas = self._comparar(ids, actuales)
+        self._cursor = cursor
+        return alertas
+
+    def _recalcular_todo(self, version_umbrales):
+        """Evalúa todos los productos y retorna las alertas respecto del estado anterior."""
+        primera = self._cursor is None
+        cursor = db.ultima_secuencia_cambios_db()
+        actuales = {fila.producto.id: fila for fila in db.productos_bajo_umbral_db(self.umbral_por_defecto)}
+        alertas = self._comparar(set(self.bajo_umbral) | set(actuales), actuales)
+        self._cursor = cursor
+        self._version_umbrales = version_umbrales
+        if primera and not self.alertar_existentes:
+            return []
+        return alertas
+
+    def _comparar(self, ids, actuales):
+        """Actualiza bajo_umbral para `ids` y retorna las alertas de los que cambiaron de situación.
+        Los productos eliminados salen del conjunto sin alerta. bajo_umbral se
+        actualiza al final, después de todas las lecturas.
+        """
+        fecha = int(time.time())
+        alertas = []
+        for id_prod in sorted(ids):
+            antes = self.bajo_umbral.get(id_prod)
+            ahora = actuales.get(id_prod)
+            if ahora is not None and antes is None:
+                alertas.append(modelos.AlertaStock("bajo", fecha, ahora.producto, ahora.umbral))
+            elif ahora is None and antes is not None:
+                producto = db.obtener_producto_por_id_db(id_prod)
+                if producto is not None:
+                    alertas.append(modelos.AlertaStock("repuesto", fecha, producto, antes.umbral))
+        for id_prod in ids:
+            if id_prod in actuales:
+                self.bajo_umbral[id_prod] = actuales[id_prod]
+            else:
+                self.bajo_umbral.pop(id_prod, None)
+        return alertas
+
+    def _emitir(self, alertas):
+        """Entrega las alertas a al_alertar y al archivo. Retorna las mismas alertas."""
+        if not alertas:
+            return alertas
+        if self.archivo is not None:
+            lineas = "".join(json.dumps(alerta_a_dict(alerta), ensure_ascii=False) + "\n" for alerta in alertas)
+            if self.archivo == "-":
+                sys.stdout.write(lineas)
+                sys.stdout.flush()
+            else:
+                with open(self.archivo, "a", encoding="utf-8") as salida:
+                    salida.write(lineas)
+        if self.al_alertar is not None:
+            for alerta in alertas:
+                self.al_alertar(alerta)
+        return alertas
+
+    def ejecutar(self):
+        """Revisa cada intervalo_s segundos hasta que se llame a detener().
+        Un error en una revisión se informa por stderr y no corta la vigilancia.
+        Args: no tiene
+        Returns: no tiene
+        """
+        while True:
+            try:
+                self.revisar()
+            except Exception as error:
+                print(f"vigilante_stock: error al revisar: {error}", file=sys.stderr)
+            if self._detener.wait(self.intervalo_s):
+                return
+
+    def iniciar(self):
+        """Arranca la vigilancia en un hilo en segundo plano.
+        Args: no tiene
+        Returns: no tiene
+        """
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self.ejecutar, name="vigilante-stock", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Detiene el hilo de vigilancia y espera a que termine.
+        Args: no tiene
+        Returns: no tiene
+        """
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Avisa cuando un producto llega a su umbral de reposición.")
+    parser.add_argument("--archivo", default="-",
+                        help="Archivo JSON Lines donde agregar las alertas ('-' para la salida estándar).")
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_POR_DEFECTO_S, metavar="SEGUNDOS",
+                        help="Segundos entre revisiones.")
+    parser.add_argument("--umbral-por-defecto", type=int, metavar="CANTIDAD",
+                        help="Umbral de los productos sin umbral propio ni de su categoría.")
+    parser.add_argument("--solo-nuevas", action="store_true",
+                        help="No avisa de los productos que ya estaban bajo su umbral al arrancar.")
+    argumentos = parser.parse_args()
+
+    db.inicializar_db()
+    vigilante = VigilanteStock(archivo=argumentos.archivo, intervalo_s=argumentos.intervalo,
+                               umbral_por_defecto=argumentos.umbral_por_defecto,
+                               alertar_existentes=not argumentos.solo_nuevas)
+    try:
+        vigilante.ejecutar()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db.cerrar_conexiones()